@@ -1,39 +1,79 @@
-import pandas as pd
-from textblob import TextBlob
-from langdetect import detect
-from googletrans import Translator
-import spacy
+if __name__ == "__main__":
+    # `python Code.py ...` runs the command line in cli.py, which imports this file as Code,
+    # so the dashboard and the service share the module the settings were applied to
+    import sys
+    from cli import main
+    sys.exit(main())
+
+import numpy as np
 import warnings
-import tkinter as tk
-from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import textwrap
-import time
+import os
+import json
+import hashlib
 import re
-from collections import defaultdict
-from datetime import datetime
+from collections import Counter, defaultdict
+from itertools import accumulate
+from datetime import date, datetime
+from concurrent.futures import ProcessPoolExecutor
+from importlib import metadata
+from translation import TranslationCache, cache_dir_from_env, make_backend, translate_many
+from ingest import RequesterIndex, build_id_index, iter_feedback_chunks, read_feedback_file, read_id_index, requester_id_string
+from result_store import ResultStore, result_key
+from profiling import Profiler
+from accumulators import GroupSums
+from details import FeedbackDetails
+from keyword_matcher import KeywordMatcher, load_category_keywords
+from period_store import PeriodStore, file_content_hash
+from language import LanguageDetector
+from embedding_store import EmbeddingStore
+from french import FRENCH_SPACY_MODEL, FrenchScorer, fit_line, load_calibration, load_lexicon
+from static_vectors import StaticVectors, export_static_vectors
+from similarity import cosine_similarity_matrix
 
 #pip install pandas textblob googletrans langdetect spacy matplotlib seaborn openpyxl xlrd python-dotenv tqdm && python -m spacy download en_core_web_md
+#Offline French scoring (--french native): python -m spacy download fr_core_news_md
 #(Windows10/11)pip install pywin32==306        # Required for some Excel operations
 
 # Suppress warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
-# Load spaCy model
-nlp = spacy.load("en_core_web_md")
-translator = Translator()
-
-# Modern color scheme
-COLORS = {
-    "background": "#f5f5f5",
-    "primary": "#6200ee",
-    "primary_light": "#9e47ff",
-    "secondary": "#03dac6",
-    "text": "#333333",
-    "card": "#ffffff",
-    "border": "#e0e0e0"
-}
+# Stage timers and cache hit rates; FEEDBACK_PROFILE=1 enables them by default
+profiler = Profiler(enabled=os.environ.get("FEEDBACK_PROFILE") == "1")
+
+# spaCy model, loaded on first use by get_nlp()
+SPACY_MODEL = "en_core_web_md"
+_nlp = None
+_category_vectors = None
+
+# "pipeline" scores texts with the full spaCy model; "vectors" only memory-maps the model's
+# static vector table and tokenizes texts itself. FEEDBACK_MODEL_MODE sets the default.
+MODEL_MODES = ("pipeline", "vectors")
+MODEL_MODE = os.environ.get("FEEDBACK_MODEL_MODE", "pipeline")
+_static_vectors = None
+
+translation_backend = make_backend(os.environ.get("FEEDBACK_TRANSLATION_BACKEND", "google"))
+
+# Set by set_text_scorer when a long-running service scores texts for several clients
+_text_scorer = None
+
+# Worker processes for NLP scoring; smaller inputs are always scored serially
+ANALYSIS_WORKERS = 1
+PARALLEL_MIN_ROWS = 2000
+
+# Rows scored between progress updates on the serial path
+PROGRESS_CHUNK_ROWS = 500
+
+# Rows held in memory at a time by the streaming (low-memory) readers
+STREAM_CHUNK_ROWS = 5000
+
+# Bulk translation: concurrent requests, retries and optional requests/second cap
+TRANSLATION_WORKERS = 8
+TRANSLATION_RETRIES = 3
+TRANSLATION_RATE_LIMIT = None
+
+# Texts per nlp.pipe batch; the parser and NER are not needed for document vectors
+SPACY_BATCH_SIZE = 256
+SPACY_DISABLED_PIPES = ["parser", "ner"]
 
 # Define categories
 categories = [
@@ -43,13 +83,27 @@ categories = [
     "Quality Risk and Management"
 ]
 
-# Refined category keywords based on real feedback
-category_keywords = {
-    "Business Skills": ["business", "market", "sales", "strategy", "client", "revenue", "opportunity", "crm", "gtm"],
-    "Technical Skills": ["technical", "software", "engineering", "tools", "systems", "code", "development", "data", "technology"],
-    "Leadership": ["lead", "team", "mentor", "manage", "vision", "delegate", "inspire", "guide", "encadrer", "équipe"],
-    "Quality Risk and Management": ["quality", "risk", "compliance", "process", "control", "governance", "standards"]
+# Refined category keywords based on real feedback (FEEDBACK_KEYWORDS_FILE overrides the file)
+KEYWORDS_FILE = os.environ.get("FEEDBACK_KEYWORDS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "keywords.json"))
+category_keywords = load_category_keywords(KEYWORDS_FILE)
+
+# French texts are either translated ("translate") or scored offline in French ("native");
+# FEEDBACK_FRENCH_MODE sets the default, set_french_mode changes it for a run
+FRENCH_MODES = ("translate", "native")
+FRENCH_MODE = os.environ.get("FEEDBACK_FRENCH_MODE", "translate")
+FRENCH_KEYWORDS_FILE = os.environ.get("FEEDBACK_FRENCH_KEYWORDS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "keywords_fr.json"))
+FRENCH_LEXICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "french_lexicon.json")
+# Category names as compared with French text vectors
+FRENCH_CATEGORY_LABELS = {
+    "Business Skills": "compétences commerciales",
+    "Technical Skills": "compétences techniques",
+    "Leadership": "leadership",
+    "Quality Risk and Management": "qualité, risques et gestion",
 }
+_french_scorer = None
+_keyword_matcher = None
+# Joins a row's comment and response in native French mode, so score_texts can tell the fields apart
+FIELD_SEPARATOR = "\x1f"
 
 # Feedback response scores
 feedback_response_scores = {
@@ -65,558 +119,1124 @@ feedback_response_scores = {
     "Leadership skills": 3
 }
 
-# Translation cache
-translation_cache = {}
+# Canned responses are never sent to langdetect, which misreads short labels
+KNOWN_RESPONSE_LANGUAGES = {response: 'en' for response in feedback_response_scores}
+KNOWN_RESPONSE_LANGUAGES["Non observe"] = 'fr'
+language_detector = LanguageDetector(KNOWN_RESPONSE_LANGUAGES)
+
+# Persistent translation and language-detection cache (FEEDBACK_CACHE_DIR)
+# Languages come from the detector's rules, so entries written under other rules are not reused
+translation_cache = TranslationCache(version=LanguageDetector.VERSION)
+
+# Memoized per-text results; set FEEDBACK_RESULT_SPILL=1 to spill evicted entries to disk
+RESULT_STORE_SIZE = 100_000
+result_store = ResultStore(
+    max_items=RESULT_STORE_SIZE,
+    spill_dir=cache_dir_from_env() if os.environ.get("FEEDBACK_RESULT_SPILL") == "1" else None
+)
+
+# Per-period aggregates for trend charts, keyed by each workbook's content hash
+period_store = PeriodStore(os.path.join(cache_dir_from_env(), "periods.sqlite3"))
+
+profiler.register_cache("translations", translation_cache.stats)
+profiler.register_cache("results", result_store.stats)
+
+# Fitted by calibrate_french_scoring; without it French scores are used as they are
+FRENCH_CALIBRATION_FILE = os.path.join(cache_dir_from_env(), "french_calibration.json")
+
+# Everything a memoized result depends on; changing any of it invalidates the store
+def _model_version(model=SPACY_MODEL):
+    try:
+        return f"{model}-{metadata.version(model)}"
+    except metadata.PackageNotFoundError:
+        return model
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def _analysis_version():
+    inputs = {
+        "model": _model_version(),
+        "translation_backend": type(translation_backend).__name__,
+        "categories": categories,
+        "category_keywords": category_keywords,
+        "keyword_matcher": KeywordMatcher.VERSION,
+        "language_rules": LanguageDetector.VERSION,
+        # Cosine similarities computed per row in float64 (see cosine_similarity_matrix)
+        "similarity": 2,
+    }
+    if MODEL_MODE == "vectors":
+        inputs["static_vectors"] = StaticVectors.VERSION
+    if FRENCH_MODE == "native":
+        inputs["french"] = {
+            "model": _model_version(FRENCH_SPACY_MODEL),
+            "scorer": FrenchScorer.VERSION,
+            "labels": FRENCH_CATEGORY_LABELS,
+            "keywords": _read_json(FRENCH_KEYWORDS_FILE),
+            "lexicon": _read_json(FRENCH_LEXICON_FILE),
+            "calibration": _read_json(FRENCH_CALIBRATION_FILE),
+        }
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+
+ANALYSIS_VERSION = _analysis_version()
+
+def set_french_mode(mode):
+    """Translate French texts ("translate") or score them offline in French ("native") from now on."""
+    global FRENCH_MODE, ANALYSIS_VERSION
+    if mode not in FRENCH_MODES:
+        raise ValueError(f"Unknown French mode: {mode}")
+    FRENCH_MODE = mode
+    # Worker processes read the mode from the environment
+    os.environ["FEEDBACK_FRENCH_MODE"] = mode
+    ANALYSIS_VERSION = _analysis_version()
+
+def set_model_mode(mode):
+    """Score with the full spaCy pipeline ("pipeline") or its static vectors only ("vectors") from now on."""
+    global MODEL_MODE, ANALYSIS_VERSION, _category_vectors, _keyword_matcher
+    if mode not in MODEL_MODES:
+        raise ValueError(f"Unknown model mode: {mode}")
+    if mode != MODEL_MODE:
+        _category_vectors = None
+        _keyword_matcher = None
+    MODEL_MODE = mode
+    # Worker processes read the mode from the environment
+    os.environ["FEEDBACK_MODEL_MODE"] = mode
+    ANALYSIS_VERSION = _analysis_version()
+
+# Document vectors and tokens of every embedded text; vectors of different models do not mix
+EMBEDDING_VERSION = hashlib.sha1(_model_version().encode("utf-8")).hexdigest()[:16]
+embedding_store = EmbeddingStore(os.path.join(cache_dir_from_env(), "embeddings", EMBEDDING_VERSION))
+
+# Texts embedded per spaCy batch and progress update when filling the embedding store
+EMBEDDING_CHUNK_TEXTS = 1000
+
+# The model's static vector table, exported once for the vectors-only mode
+STATIC_VECTORS_DIR = os.path.join(cache_dir_from_env(), "static_vectors", EMBEDDING_VERSION)
+
+def get_nlp():
+    """Load the spaCy model on first use, without the parser and NER nothing here uses."""
+    global _nlp
+    if _nlp is None:
+        with profiler.stage("model loading"):
+            import spacy
+            _nlp = spacy.load(SPACY_MODEL, exclude=SPACY_DISABLED_PIPES)
+    return _nlp
+
+def get_static_vectors():
+    """The model's static vectors, exported from the full model on the very first use."""
+    global _static_vectors
+    if _static_vectors is None:
+        with profiler.stage("model loading"):
+            if not StaticVectors.exists(STATIC_VECTORS_DIR):
+                print(f"Exporting the static vectors of {SPACY_MODEL} (first run only)...")
+                export_static_vectors(get_nlp(), STATIC_VECTORS_DIR)
+            _static_vectors = StaticVectors(STATIC_VECTORS_DIR)
+    return _static_vectors
+
+def get_category_vectors():
+    """Category vectors, computed once and reused for every text."""
+    global _category_vectors
+    if _category_vectors is None:
+        if MODEL_MODE == "vectors":
+            _category_vectors, _ = get_static_vectors().embed(categories)
+        else:
+            nlp = get_nlp()
+            _category_vectors = np.array([nlp(category).vector for category in categories], dtype=np.float32)
+    return _category_vectors
+
+def get_keyword_matcher():
+    """Keyword matcher compiled once from category_keywords."""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        if MODEL_MODE == "vectors":
+            _keyword_matcher = KeywordMatcher.for_tokens(category_keywords, StaticVectors.doc_tokens)
+        else:
+            _keyword_matcher = KeywordMatcher(get_nlp(), category_keywords)
+    return _keyword_matcher
+
+def get_french_scorer():
+    """French model, keywords, lexicon and calibration, loaded on first use."""
+    global _french_scorer
+    if _french_scorer is None:
+        with profiler.stage("model loading"):
+            import spacy
+            nlp = spacy.load(FRENCH_SPACY_MODEL, exclude=SPACY_DISABLED_PIPES)
+        _french_scorer = FrenchScorer(
+            nlp,
+            FRENCH_CATEGORY_LABELS,
+            load_category_keywords(FRENCH_KEYWORDS_FILE),
+            load_lexicon(FRENCH_LEXICON_FILE),
+            load_calibration(FRENCH_CALIBRATION_FILE, categories),
+        )
+    return _french_scorer
 
-def normalize_text(text):
-    if not isinstance(text, str):
-        return ""
-    return re.sub(r'[^\w\s]', '', text.lower())
+def detect_and_translate(text):
+    """Detect the language of a text and translate it to English if it is French."""
+    lang = language_detector.detect(text)
+    if lang == 'fr':
+        return lang, translation_backend.translate(text, src='fr', dest='en')
+    return lang, None
 
 def translate_text(text):
     """Translate French text to English with safety checks."""
     if not isinstance(text, str) or text.strip() == "":
         return text
-    if text in translation_cache:
-        return translation_cache[text]
-    
+    cached = translation_cache.get(text)
+    # French texts detected for native scoring are cached without a translation
+    if cached is not None and (cached[0] != 'fr' or cached[1] is not None):
+        lang, translation = cached
+        return translation if lang == 'fr' else text.strip()
+
     try:
-        lang = detect(text.strip())
-        if lang == 'fr':
-            result = translator.translate(text.strip(), src='fr', dest='en').text
-            translation_cache[text] = result
-            return result
-        else:
-            return text.strip()
+        lang, translation = detect_and_translate(text.strip())
+        translation_cache.put(text, lang, translation)
+        return translation if lang == 'fr' else text.strip()
     except Exception as e:
         print(f"Translation error: {e}")
         return text.strip()
 
-def classify_text(text):
-    """Hybrid scoring using both spaCy similarity and keyword frequency."""
-    if not text.strip():
-        return {cat: 0 for cat in categories}
-    
-    # Keyword-based score
-    words = text.lower().split()
-    word_count = len(words)
-
-    keyword_scores = {}
-    for category, keywords in category_keywords.items():
-        count = sum(1 for word in words if word in keywords)
-        score = count / word_count if word_count > 0 else 0
-        keyword_scores[category] = score
-    
-    # SpaCy similarity score
-    doc = nlp(text)
-    spacy_scores = {category: doc.similarity(nlp(category)) for category in categories}
+def detect_languages(texts):
+    """{text: language code} of the non-empty texts, each detected once and kept in translation_cache.
+
+    New texts are cached untranslated; pretranslate adds the French translations.
+    """
+    unique = list(dict.fromkeys(t for t in texts if isinstance(t, str) and t.strip()))
+    languages = {text: lang for text, (lang, _) in translation_cache.get_many(unique).items()}
+
+    with profiler.stage("language detection"):
+        by_langdetect = language_detector.decided_by_langdetect
+        detected = language_detector.detect_many([text for text in unique if text not in languages])
+    profiler.count("texts detected", len(detected))
+    profiler.count("texts detected by langdetect", language_detector.decided_by_langdetect - by_langdetect)
+    translation_cache.put_many((text, lang, None) for text, lang in detected.items())
+    languages.update(detected)
+    return languages
+
+def pretranslate(texts, progress=None):
+    """Bulk translation stage: translate every French text without a cached translation concurrently.
+
+    progress(texts_done, texts_total, "translating") may raise to stop.
+    Returns the number of texts translated.
+    """
+    languages = detect_languages(texts)
+    french = [text for text, lang in languages.items() if lang == 'fr']
+    cached = translation_cache.get_many(french)
+    french = [text for text in french if cached.get(text, (None, None))[1] is None]
+
+    with profiler.stage("translation"):
+        translations = translate_many(
+            [text.strip() for text in french],
+            translation_backend,
+            max_workers=TRANSLATION_WORKERS,
+            retries=TRANSLATION_RETRIES,
+            rate_limit=TRANSLATION_RATE_LIMIT,
+            progress=(lambda done, total: progress(done, total, "translating")) if progress else None,
+        )
+    profiler.count("texts translated", len(translations))
+    # Texts whose translation failed stay cached untranslated and are tried again next time
+    translation_cache.put_many(
+        (text, 'fr', translations[text.strip()]) for text in french if text.strip() in translations
+    )
+    return len(translations)
+
+def warm_translation_cache(file_paths):
+    """Detect and translate every comment and response of the given workbooks ahead of time."""
+    texts = []
+    for file_path in file_paths:
+        df = read_feedback_file(file_path)
+        for col in ('Comments', 'Feedback Responses'):
+            if col in df.columns:
+                texts.extend(df[col].dropna().astype(str).tolist())
+    return pretranslate(texts)
+
+def classify_texts(texts, batch_size=SPACY_BATCH_SIZE):
+    """Hybrid scoring of many texts with a single spaCy pass per text."""
+    results = [{cat: 0 for cat in categories} for _ in texts]
+    keys = {i: result_key(ANALYSIS_VERSION, "classify", text) for i, text in enumerate(texts) if text.strip()}
+    cached = result_store.get_many(list(keys.values()))
+    indices = []
+    for i, key in keys.items():
+        if key in cached:
+            results[i] = cached[key]
+        else:
+            indices.append(i)
+    if not indices:
+        return results
+
+    # SpaCy similarity scores for all texts at once; keyword matches reuse the same docs
+    category_vectors = get_category_vectors()
+    matcher = get_keyword_matcher()
+    keyword_columns = [matcher.categories.index(c) if c in matcher.categories else None for c in categories]
+    keyword_counts = np.zeros((len(indices), len(matcher.categories)), dtype=np.int64)
+    word_counts = np.zeros(len(indices), dtype=np.int64)
+    with profiler.stage("spaCy similarity"):
+        doc_vectors = np.zeros((len(indices), category_vectors.shape[1]), dtype=np.float32)
+        if MODEL_MODE == "vectors":
+            static_vectors = get_static_vectors()
+            for start in range(0, len(indices), batch_size):
+                batch = indices[start:start + batch_size]
+                doc_vectors[start:start + len(batch)], batch_tokens = static_vectors.embed([texts[i] for i in batch])
+                with profiler.stage("keyword scoring"):
+                    for row, tokens in enumerate(batch_tokens, start):
+                        keyword_counts[row], word_counts[row] = matcher.token_counts(tokens)
+        else:
+            docs = get_nlp().pipe((texts[i] for i in indices), batch_size=batch_size, disable=SPACY_DISABLED_PIPES)
+            for row, doc in enumerate(docs):
+                doc_vectors[row] = doc.vector
+                with profiler.stage("keyword scoring"):
+                    keyword_counts[row], word_counts[row] = matcher.counts(doc)
+        spacy_scores = cosine_similarity_matrix(doc_vectors, category_vectors)
+    profiler.count("texts classified", len(indices))
 
     # Combined hybrid score
-    return {
-        category: 0.5 * spacy_scores[category] + 0.5 * keyword_scores[category]
-        for category in categories
-    }
+    for row, i in enumerate(indices):
+        words = int(word_counts[row])
+        results[i] = {
+            category: 0.5 * float(spacy_scores[row, j])
+            + 0.5 * (int(keyword_counts[row, col]) / words if col is not None and words > 0 else 0)
+            for j, (category, col) in enumerate(zip(categories, keyword_columns))
+        }
+    result_store.put_many((keys[i], results[i]) for i in indices)
+    return results
 
+def classify_text(text):
+    """Hybrid scoring using both spaCy similarity and keyword frequency."""
+    return classify_texts([text])[0]
+
+# Feedback response keys, tried longest first so "Partially met expectations"
+# is not counted as "Met expectations"
+RESPONSE_KEYS = list(feedback_response_scores)
+RESPONSE_SCORES = np.array([feedback_response_scores[key] for key in RESPONSE_KEYS], dtype=np.float64)
+_response_index = {key.lower(): i for i, key in enumerate(RESPONSE_KEYS)}
+_response_pattern = re.compile(
+    "|".join(re.escape(key) for key in sorted(RESPONSE_KEYS, key=len, reverse=True)),
+    re.IGNORECASE
+)
+
+def _match_response(response):
+    if not isinstance(response, str):
+        return -1
+    match = _response_pattern.search(response)
+    return _response_index[match.group(0).lower()] if match else -1
+
+def match_feedback_responses(responses):
+    """Categorical of the feedback response key found in each response (NaN when none).
+
+    Responses repeat heavily, so the regex only runs once per distinct value.
+    """
+    import pandas as pd
+    codes, uniques = pd.factorize(pd.Series(responses, dtype=object))
+    unique_matches = np.array([_match_response(value) for value in uniques], dtype=np.int64)
+    matches = np.full(len(codes), -1, dtype=np.int64)
+    valid = codes >= 0
+    matches[valid] = unique_matches[codes[valid]]
+    return pd.Categorical.from_codes(matches, categories=RESPONSE_KEYS)
+
+def response_score_column(responses):
+    """Score of each response as floats, NaN where no feedback response matched."""
+    codes = match_feedback_responses(responses).codes
+    return np.where(codes >= 0, RESPONSE_SCORES[codes], np.nan)
+
+@profiler.timed("response scoring")
 def count_and_score_feedback_responses(responses):
     """Count how many times each feedback response appears."""
-    response_counts = {response: 0 for response in feedback_response_scores}
-    total_score = 0
-    total_responses = 0
+    codes = match_feedback_responses(responses).codes
+    codes = codes[codes >= 0]
+    counts = np.bincount(codes, minlength=len(RESPONSE_KEYS))
+    response_counts = {key: int(count) for key, count in zip(RESPONSE_KEYS, counts)}
 
-    for response in responses:
-        if not isinstance(response, str) or not response.strip():
-            continue
-        for key in response_counts:
-            if key.lower() in response.lower():
-                response_counts[key] += 1
-                total_score += feedback_response_scores[key]
-                total_responses += 1
-                break
-
-    avg_score = total_score / total_responses if total_responses > 0 else 0
+    avg_score = float(RESPONSE_SCORES[codes].mean()) if len(codes) > 0 else 0
     return response_counts, avg_score
 
-def process_feedback(feedback_id, comments, responses, questions, ranks):
-    """Aggregate and analyze feedback data with rank-based weighting."""
+class AnalysisCancelled(Exception):
+    """Raised from a progress callback to stop a running analysis."""
+
+class MissingColumnsError(ValueError):
+    """The selected workbooks lack the comment or response column."""
+
+def row_texts(comments, responses, native=None, progress=None):
+    """Translated comment and response text of every row ("" for rows without text).
+
+    In native French mode nothing is translated and the fields are joined by
+    FIELD_SEPARATOR; score_texts scores each language in its own model.
+    native overrides the mode (the embedding store always holds English texts).
+    progress is passed to pretranslate.
+    """
+    if native is None:
+        native = FRENCH_MODE == "native"
+    # Translate all unique French texts up front
+    if not native:
+        pretranslate(list(comments) + list(responses), progress)
+    prepare = (lambda text: text.strip()) if native else translate_text
+    texts = []
+    with profiler.stage("translation lookup"):
+        for comment, response in zip(comments, responses):
+            full_text = ""
+            if isinstance(comment, str) and comment.strip():
+                full_text += prepare(comment)
+            if isinstance(response, str) and response.strip():
+                full_text += (FIELD_SEPARATOR if native else " ") + prepare(response)
+            texts.append(full_text)
+    return texts
+
+def score_english_texts(texts):
+    """(TextBlob sentiment, category scores) of non-empty texts, scored as English."""
+    from textblob import TextBlob
+    all_scores = classify_texts(texts)
+    with profiler.stage("TextBlob sentiment"):
+        return [(TextBlob(text).sentiment.polarity, scores) for text, scores in zip(texts, all_scores)]
+
+def score_texts(texts):
+    """(sentiment, category scores) for every text, None for empty texts.
+
+    In native French mode the language of each field (see row_texts) is
+    detected. A row whose comment and response differ in language gets the
+    word-weighted mean of the fields scored apart, each in its own language.
+    """
+    results = [None] * len(texts)
+    if FRENCH_MODE != "native":
+        indices = [i for i, text in enumerate(texts) if text.strip()]
+        for i, result in zip(indices, score_english_texts([texts[i] for i in indices])):
+            results[i] = result
+        return results
+
+    fields = [[field.strip() for field in text.split(FIELD_SEPARATOR) if field.strip()] for text in texts]
+    languages = detect_languages([field for row in fields for field in row])
+    # (row, text, words) of everything to score, by language
+    pieces = {'en': [], 'fr': []}
+    for i, row in enumerate(fields):
+        row_languages = {'fr' if languages[field] == 'fr' else 'en' for field in row}
+        if len(row_languages) == 1:
+            pieces[row_languages.pop()].append((i, " ".join(row), 1))
+        else:
+            profiler.count("mixed-language rows")
+            for field in row:
+                pieces['fr' if languages[field] == 'fr' else 'en'].append((i, field, len(field.split())))
+
+    # (words, result) of each row's pieces, English first
+    parts = [[] for _ in texts]
+    for (i, _, words), result in zip(pieces['en'], score_english_texts([text for _, text, _ in pieces['en']])):
+        parts[i].append((words, result))
+    if pieces['fr']:
+        with profiler.stage("French scoring"):
+            french_results = get_french_scorer().score_texts([text for _, text, _ in pieces['fr']])
+        for (i, _, words), result in zip(pieces['fr'], french_results):
+            parts[i].append((words, result))
+        profiler.count("texts scored in French", len(pieces['fr']))
+
+    for i, row_parts in enumerate(parts):
+        if len(row_parts) == 1:
+            results[i] = row_parts[0][1]
+        elif row_parts:
+            total = sum(words for words, _ in row_parts)
+            results[i] = (
+                sum(words * sentiment for words, (sentiment, _) in row_parts) / total,
+                {category: sum(words * scores.get(category, 0) for words, (_, scores) in row_parts) / total
+                 for category in categories},
+            )
+    return results
+
+def _init_worker():
+    """Process-pool initializer: load the NLP models once per worker."""
+    from textblob import TextBlob
+    get_category_vectors()
+    get_keyword_matcher()
+    if FRENCH_MODE == "native":
+        get_french_scorer()
+    TextBlob("warm up").sentiment
+
+def set_text_scorer(scorer):
+    """Route score_texts_parallel through scorer(texts), e.g. the analysis service's micro-batcher.
+
+    None restores local scoring.
+    """
+    global _text_scorer
+    _text_scorer = scorer
+
+def score_texts_parallel(texts, workers=None, progress=None):
+    """score_texts sharded across worker processes.
+
+    Texts are split into contiguous shards and the results are concatenated
+    in their original order, so they are identical to the serial path.
+    progress(done, total) is called after each shard.
+    """
+    if _text_scorer is not None:
+        results = _text_scorer(texts)
+        if progress:
+            progress(len(results), len(texts))
+        return results
+
+    workers = ANALYSIS_WORKERS if workers is None else workers
+    if workers <= 1 or len(texts) < PARALLEL_MIN_ROWS:
+        results = []
+        shard_size = PROGRESS_CHUNK_ROWS if progress else max(len(texts), 1)
+        for start in range(0, len(texts), shard_size):
+            results.extend(score_texts(texts[start:start + shard_size]))
+            if progress:
+                progress(len(results), len(texts))
+        return results
+
+    shard_size = -(-len(texts) // (workers * 4))
+    shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+    results = []
+    if MODEL_MODE == "vectors":
+        # Export the vector table once here rather than in every worker
+        get_static_vectors()
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    futures = [pool.submit(score_texts, shard) for shard in shards]
+    try:
+        with profiler.stage(f"scoring ({workers} worker processes)"):
+            for future in futures:
+                results.extend(future.result())
+                if progress:
+                    progress(len(results), len(texts))
+    finally:
+        # Drop queued shards when the progress callback cancels the run
+        for future in futures:
+            future.cancel()
+        pool.shutdown()
+    return results
+
+def analyze_rows(comments, responses, workers=None, progress=None):
+    """Translated text and (sentiment, category scores) of every row.
+
+    Results are memoized per (comment, response) pair in result_store, so rows
+    that were already analyzed are neither translated nor scored again.
+    progress(rows_done, total_rows) may raise AnalysisCancelled to stop; while
+    French texts are translated it is called as progress(texts_done,
+    texts_total, "translating") instead.
+    """
+    with profiler.stage("result store lookup"):
+        keys = [result_key(ANALYSIS_VERSION, "row", comment, response) for comment, response in zip(comments, responses)]
+        cached = result_store.get_many(keys)
+
+    # Analyze each missing (comment, response) pair once
+    missing = {}
+    for i, key in enumerate(keys):
+        if key not in cached and key not in missing:
+            missing[key] = i
+
+    # Report progress in rows, counting every duplicate of a scored pair as done
+    rows_per_key = Counter(keys)
+    rows_done = list(accumulate(rows_per_key[key] for key in missing))
+    cached_rows = len(keys) - (rows_done[-1] if rows_done else 0)
+    if progress:
+        progress(cached_rows, len(keys))
+
+    def score_progress(done, total):
+        progress(cached_rows + rows_done[done - 1], len(keys))
+
+    if missing:
+        new_texts = row_texts(
+            [comments[i] for i in missing.values()], [responses[i] for i in missing.values()], progress=progress
+        )
+        new_scores = score_texts_parallel(new_texts, workers, score_progress if progress else None)
+        new_entries = {}
+        for key, text, row_score in zip(missing, new_texts, new_scores):
+            sentiment, scores = row_score if row_score is not None else (None, None)
+            new_entries[key] = [text, sentiment, scores]
+        result_store.put_many(new_entries.items())
+        cached.update(new_entries)
+
+    texts = []
+    row_scores = []
+    for key in keys:
+        text, sentiment, scores = cached[key]
+        texts.append(text)
+        row_scores.append(None if scores is None else (sentiment, scores))
+    return texts, row_scores
+
+def score_matrix(row_scores):
+    """Positions of the scored rows and their [sentiment, category scores...] as a matrix."""
+    valid = np.array([i for i, row_score in enumerate(row_scores) if row_score is not None], dtype=np.int64)
+    values = np.array(
+        [[row_scores[i][0]] + [row_scores[i][1][category] for category in categories] for i in valid],
+        dtype=np.float64
+    ).reshape(len(valid), len(categories) + 1)
+    return valid, values
+
+def group_summary(sums, count):
+    """Averages of one group's [sentiment, category scores...] sums."""
+    avg_category_scores = dict(zip(categories, (sums[1:] / count).tolist()))
+    return {
+        "avg_sentiment": float(sums[0] / count),
+        "avg_category_scores": avg_category_scores,
+        "highest_category": max(avg_category_scores, key=avg_category_scores.get),
+    }
+
+@profiler.timed("aggregation")
+def aggregate_scores(row_scores, questions, ranks, keep_rows=False):
+    """Sum sentiment and category scores overall, per question and per rank, in row order.
+
+    question_analysis and rank_analysis are GroupSums whose columns are the
+    sentiment followed by the categories; with keep_rows they also keep the
+    row positions of each group.
+    """
+    valid, values = score_matrix(row_scores)
+    summary = {"weighted_count": len(valid)}
+    if len(valid) == 0:
+        return summary
+
+    overall = GroupSums(values.shape[1])
+    overall.add(np.zeros(len(valid), dtype=np.int64), values)
+    question_analysis = GroupSums(values.shape[1], keep_rows)
+    question_analysis.add(np.asarray(questions, dtype=object)[valid], values, valid)
+    rank_analysis = GroupSums(values.shape[1], keep_rows)
+    rank_analysis.add(np.asarray(ranks, dtype=object)[valid], values, valid)
+
+    sums = overall.sums[0]
+    summary.update({
+        "sentiment_sum": float(sums[0]),
+        "category_sums": dict(zip(categories, sums[1:].tolist())),
+        **group_summary(sums, len(valid)),
+        "question_analysis": question_analysis,
+        "rank_analysis": rank_analysis,
+    })
+    return summary
+
+def summarize_feedback(comments, responses, questions, ranks, workers=None, progress=None):
+    """Score every row and return the aggregated results.
+
+    The averages and per-question/per-rank analysis are only present when
+    weighted_count is non-zero.
+    """
     # Count and score feedback responses
     response_counts, avg_score = count_and_score_feedback_responses(responses)
-    
+
+    _, row_scores = analyze_rows(list(comments), list(responses), workers, progress)
+    summary = aggregate_scores(row_scores, questions, ranks)
+    summary.update({"response_counts": response_counts, "avg_score": avg_score})
+    return summary
+
+def process_feedback(feedback_id, comments, responses, questions, ranks, progress=None):
+    """Aggregate and analyze feedback data with rank-based weighting."""
+    summary = summarize_feedback(comments, responses, questions, ranks, progress=progress)
+
     # Prepare response analysis text
     response_text = "Feedback Response Analysis:\n"
-    for response, count in response_counts.items():
+    for response, count in summary["response_counts"].items():
         response_text += f"{response}: {count} (Score: {feedback_response_scores[response]})\n"
-    response_text += f"\nAverage Feedback Score: {avg_score:.2f}/5.00\n"
+    response_text += f"\nAverage Feedback Score: {summary['avg_score']:.2f}/5.00\n"
     response_text += "-"*40 + "\n"
 
-    total_sentiment = 0
-    category_scores = {category: 0 for category in categories}
-    question_analysis = {}
-    rank_analysis = {}
-    weighted_count = 0
-
-    # Process comments and responses
-    for comment, response, question, rank in zip(comments, responses, questions, ranks):
-        full_text = ""
-        if isinstance(comment, str) and comment.strip():
-            full_text += translate_text(comment)
-        if isinstance(response, str) and response.strip():
-            full_text += " " + translate_text(response)
-
-        if not full_text.strip():
-            continue
-
-        sentiment = TextBlob(full_text).sentiment.polarity
-        scores = classify_text(full_text)
-
-        for cat in scores:
-            category_scores[cat] += scores[cat]
-        total_sentiment += sentiment
-        weighted_count += 1
-
-        # Analyze by question
-        if question not in question_analysis:
-            question_analysis[question] = {
-                "texts": [],
-                "sentiment": 0,
-                "category_scores": {category: 0 for category in categories},
-                "weighted_count": 0
-            }
-        question_analysis[question]["texts"].append(full_text)
-        question_analysis[question]["sentiment"] += sentiment
-        for cat in scores:
-            question_analysis[question]["category_scores"][cat] += scores[cat]
-        question_analysis[question]["weighted_count"] += 1
-
-        # Analyze by rank
-        if rank not in rank_analysis:
-            rank_analysis[rank] = {
-                "texts": [],
-                "sentiment": 0,
-                "category_scores": {category: 0 for category in categories},
-                "weighted_count": 0
-            }
-        rank_analysis[rank]["texts"].append(full_text)
-        rank_analysis[rank]["sentiment"] += sentiment
-        for cat in scores:
-            rank_analysis[rank]["category_scores"][cat] += scores[cat]
-        rank_analysis[rank]["weighted_count"] += 1
-
-    if weighted_count == 0:
+    if summary["weighted_count"] == 0:
         return "No valid feedback found.", None, None, None, None
 
-    # Average scores
-    avg_sentiment = total_sentiment / weighted_count
-    avg_category_scores = {cat: score / weighted_count for cat, score in category_scores.items()}
-    highest_category = max(avg_category_scores, key=avg_category_scores.get)
-
     # Build main output
     main_text = response_text
     main_text += "Main Analysis:\n"
-    main_text += f"Average Sentiment: {avg_sentiment:.2f}\n"
+    main_text += f"Average Sentiment: {summary['avg_sentiment']:.2f}\n"
     main_text += "Category Similarity Scores:\n"
-    for category, score in avg_category_scores.items():
+    for category, score in summary["avg_category_scores"].items():
         main_text += f"  {category}: {score:.2f}\n"
-    main_text += f"Most Relevant Category: {highest_category}\n"
+    main_text += f"Most Relevant Category: {summary['highest_category']}\n"
     main_text += "-"*40 + "\n"
 
-    # Detailed breakdown
-    detailed_text = f"Detailed Breakdown for ID: {feedback_id}\n"
-    for comment, response, rank in zip(comments, responses, ranks):
-        if comment.strip() or response.strip():
-            detailed_text += f"[Rank: {rank}]\n"
-            if comment.strip():
-                detailed_text += f"Comment: {comment}\n"
-            if response.strip():
-                detailed_text += f"Response: {response}\n"
-            detailed_text += "---\n"
-
-    return main_text, detailed_text, avg_category_scores, question_analysis, rank_analysis
-
-def show_chart_window(similarity_scores):
-    chart_window = tk.Toplevel()
-    chart_window.title("Feedback Analysis Charts")
-    chart_window.geometry("1000x600")
-    chart_window.configure(bg=COLORS['background'])
-
-    chart_frame = tk.Frame(chart_window, bg=COLORS['card'], bd=2, relief='groove')
-    chart_frame.pack(fill='both', expand=True, padx=20, pady=20)
-
-    if similarity_scores:
-        try:
-            plt.style.use('seaborn')
-        except:
-            plt.style.use('default')
-
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 6))
-        categories_list = ["\n".join(textwrap.wrap(cat, width=10)) for cat in categories]
-        scores = [similarity_scores.get(category, 0) for category in categories]
-
-        bars = ax1.bar(categories_list, scores, color=COLORS['primary_light'])
-        ax1.set_facecolor(COLORS['card'])
-        fig.patch.set_facecolor(COLORS['card'])
-        ax1.spines['top'].set_visible(False)
-        ax1.spines['right'].set_visible(False)
-        ax1.set_xlabel("Categories", fontsize=10)
-        ax1.set_ylabel("Similarity Score", fontsize=10)
-        ax1.set_title("Category Similarity Scores", fontsize=12, pad=20)
-        ax1.set_ylim(0, 1)
-
-        wedges, texts, autotexts = ax2.pie(
-            scores, labels=categories_list, autopct='%1.1f%%',
-            startangle=90, colors=[COLORS['primary'], COLORS['secondary'], '#ffab91', '#ce93d8'],
-            textprops={'fontsize': 8}
+    # Detailed breakdown, formatted a page at a time by the viewer
+    details = FeedbackDetails(feedback_id, comments, responses, questions, ranks)
+
+    return (main_text, details, summary["avg_category_scores"],
+            summary["question_analysis"], summary["rank_analysis"])
+
+@profiler.timed("read workbooks")
+def load_feedback_data(file_paths, progress=None):
+    """Read and combine workbooks, returning (df, comment_col, response_col).
+
+    The column names are None when the workbooks lack the comment or response column.
+    progress(files_done, files_total, "reading") is called before each file and may raise to stop.
+    """
+    import pandas as pd
+    frames = []
+    for done, file_path in enumerate(file_paths):
+        if progress:
+            progress(done, len(file_paths), "reading")
+        frames.append(read_feedback_file(file_path))
+    df = pd.concat(frames, ignore_index=True)
+    return prepare_feedback_frame(df)
+
+def prepare_feedback_frame(df):
+    """Fill missing values of the analyzed columns, returning (df, comment_col, response_col)."""
+    # Identify columns (the ingestion layer maps header variants to these names)
+    comment_col = 'Comments' if 'Comments' in df.columns else None
+    response_col = 'Feedback Responses' if 'Feedback Responses' in df.columns else None
+
+    if not comment_col or not response_col:
+        return df, None, None
+
+    df[comment_col] = df[comment_col].fillna("")
+    df[response_col] = df[response_col].fillna("")
+    df['Feedback Dimensions & Questions'] = df['Feedback Dimensions & Questions'].fillna("")
+    df['Rank feedback provider'] = df['Rank feedback provider'].fillna("Unknown")
+    return df, comment_col, response_col
+
+@profiler.timed("ID index")
+def load_id_index(file_paths):
+    """RequesterIndex over the workbooks, matching load_feedback_data's row order."""
+    return RequesterIndex([(file_path, read_id_index(file_path)) for file_path in file_paths])
+
+def select_requester_rows(df, index, feedback_ids):
+    """Rows of the given requester IDs, in their original order."""
+    positions = [index.rows(feedback_id) for feedback_id in feedback_ids]
+    return df.iloc[np.unique(np.concatenate(positions))] if positions else df.iloc[:0]
+
+def analyze_all_ids(df, comment_col, response_col, workers=None, progress=None):
+    """Analyze every Feedback Requester User ID in one pass, one results row per ID."""
+    import pandas as pd
+    # Translate and score the whole workbook at once, then aggregate per ID
+    _, row_scores = analyze_rows(df[comment_col].tolist(), df[response_col].tolist(), workers, progress)
+
+    # Response scores for the whole workbook at once
+    with profiler.stage("response scoring"):
+        avg_scores = (
+            pd.Series(response_score_column(df[response_col]), index=df.index)
+            .groupby(df['Feedback Requester User ID'], sort=True).mean()
+            .fillna(0)
         )
-        ax2.set_title("Score Distribution", fontsize=12, pad=20)
-
-        plt.tight_layout()
-
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-    else:
-        tk.Label(chart_frame, text="No data available to display chart.",
-                 bg=COLORS['card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(pady=20)
 
-def show_improvement_chart(file_paths, feedback_id):
-    """Show a chart comparing skill improvement across multiple files."""
-    if len(file_paths) < 2:
-        messagebox.showwarning("Improvement Analysis", "Please select at least 2 files to compare improvement.")
-        return
-
-    try:
-        # Process each file and store results
-        all_results = []
-        
-        for file_path in file_paths:
-            df = pd.read_excel(file_path)
-            
-            # Try to extract date from filename or use file modification time
-            try:
-                # Try to get date from filename (format: YYYY-MM-DD or similar)
-                date_str = re.search(r'(\d{4}-\d{2}-\d{2})', file_path).group(1)
-                file_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-            except:
-                # Fallback to file modification date
-                file_date = datetime.fromtimestamp(os.path.getmtime(file_path)).date()
-            
-            # Identify columns
-            comment_col = 'Comments ' if 'Comments ' in df.columns else 'Comments' if 'Comments' in df.columns else None
-            response_col = 'Feedback Responses' if 'Feedback Responses' in df.columns else 'Feedback Response' if 'Feedback Response' in df.columns else None
-            
+    # Per-ID sums for the whole workbook at once
+    with profiler.stage("aggregation"):
+        valid, values = score_matrix(row_scores)
+        requesters = GroupSums(values.shape[1])
+        requesters.add(df['Feedback Requester User ID'].to_numpy()[valid], values)
+        row_counts = df.groupby('Feedback Requester User ID', sort=True).size()
+
+    records = []
+    for feedback_id, rows in row_counts.items():
+        group = requesters.get(feedback_id)
+        summary = group_summary(*group) if group else {}
+        records.append(requester_record(feedback_id, rows, summary, float(avg_scores[feedback_id])))
+
+    return pd.DataFrame(records)
+
+def requester_record(feedback_id, rows, summary, avg_score):
+    """One row of the results table."""
+    record = {
+        'Feedback Requester User ID': feedback_id,
+        'Rows': rows,
+        'Average Sentiment': summary.get('avg_sentiment'),
+    }
+    for category in categories:
+        record[category] = summary.get('avg_category_scores', {}).get(category)
+    record['Average Feedback Score'] = avg_score
+    record['Most Relevant Category'] = summary.get('highest_category')
+    return record
+
+def stream_feedback_data(file_paths, feedback_ids=None, chunk_rows=STREAM_CHUNK_ROWS, progress=None):
+    """Yield (chunk, comment_col, response_col) for the rows of the given files, chunk by chunk.
+
+    Only the needed columns are read, and with feedback_ids only those
+    requesters' rows are kept, so memory stays bounded by chunk_rows
+    whatever the size of the files. progress(files_done, files_total, "reading")
+    is called before every chunk and may raise to stop.
+    """
+    import pandas as pd
+    keys = None if feedback_ids is None else {requester_id_string(i) for i in feedback_ids}
+    for done, file_path in enumerate(file_paths):
+        for chunk in iter_feedback_chunks(file_path, chunk_rows):
+            if progress:
+                progress(done, len(file_paths), "reading")
+            chunk, comment_col, response_col = prepare_feedback_frame(chunk)
             if not comment_col or not response_col:
-                continue
-                
-            df[comment_col] = df[comment_col].fillna("")
-            df[response_col] = df[response_col].fillna("")
-            df['Feedback Dimensions & Questions'] = df['Feedback Dimensions & Questions'].fillna("")
-            df['Rank feedback provider'] = df['Rank feedback provider'].fillna("Unknown")
-
-            # Filter by feedback ID
-            result = df[df['Feedback Requester User ID'].astype(str) == str(feedback_id)]
-            
-            if not result.empty:
-                comments = result[comment_col].tolist()
-                responses = result[response_col].tolist()
-                questions = result['Feedback Dimensions & Questions'].tolist()
-                ranks = result['Rank feedback provider'].tolist()
-                
-                _, _, similarity_scores, _, _ = process_feedback(
-                    feedback_id, comments, responses, questions, ranks
-                )
-                
-                if similarity_scores:
-                    all_results.append({
-                        'date': file_date,
-                        'scores': similarity_scores
-                    })
-        
-        # Sort by date
-        all_results.sort(key=lambda x: x['date'])
-        
-        if len(all_results) < 2:
-            messagebox.showwarning("Improvement Analysis", "Not enough data points to show improvement.")
-            return
-            
-        # Create improvement chart
-        chart_window = tk.Toplevel()
-        chart_window.title(f"Skill Improvement Analysis for ID: {feedback_id}")
-        chart_window.geometry("1200x700")
-        chart_window.configure(bg=COLORS['background'])
-
-        chart_frame = tk.Frame(chart_window, bg=COLORS['card'], bd=2, relief='groove')
-        chart_frame.pack(fill='both', expand=True, padx=20, pady=20)
-        
+                raise MissingColumnsError(f"Required columns not found in {os.path.basename(file_path)}")
+            if keys is not None:
+                ids = chunk['Feedback Requester User ID'].map(lambda v: None if pd.isna(v) else requester_id_string(v))
+                chunk = chunk[ids.isin(keys)]
+            if len(chunk):
+                yield chunk, comment_col, response_col
+
+@profiler.timed("read workbooks")
+def stream_requester_rows(file_paths, feedback_ids, chunk_rows=STREAM_CHUNK_ROWS, progress=None):
+    """Rows of the given requester IDs, filtered while streaming; (df, comment_col, response_col)."""
+    import pandas as pd
+    chunks = [chunk for chunk, _, _ in stream_feedback_data(file_paths, feedback_ids, chunk_rows, progress)]
+    if not chunks:
+        return pd.DataFrame(columns=['Feedback Requester User ID']), 'Comments', 'Feedback Responses'
+    return pd.concat(chunks, ignore_index=True), 'Comments', 'Feedback Responses'
+
+def analyze_all_ids_streaming(file_paths, feedback_ids=None, workers=None, progress=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """analyze_all_ids over files read chunk by chunk, keeping running sums per ID.
+
+    Memory grows with the number of requester IDs, not with the number of rows.
+    """
+    import pandas as pd
+    row_counts = GroupSums(0)
+    requesters = GroupSums(len(categories) + 1)
+    response_sums = GroupSums(1)
+    rows_done = 0
+    float_ids = False
+    for chunk, comment_col, response_col in stream_feedback_data(file_paths, feedback_ids, chunk_rows):
+        def chunk_progress(done, total, stage=None):
+            if stage:
+                progress(done, total, stage)
+            else:
+                progress(rows_done + done, rows_done + total)
+
+        _, row_scores = analyze_rows(
+            chunk[comment_col].tolist(), chunk[response_col].tolist(),
+            workers, chunk_progress if progress else None
+        )
+        with profiler.stage("response scoring"):
+            response_scores = response_score_column(chunk[response_col])
+
+        # Each chunk parses its IDs on its own (1 in one, "1" in the next), so they are
+        # summed by their canonical string; interned codes keep the sums in row order
+        with profiler.stage("aggregation"):
+            id_column = chunk['Feedback Requester User ID']
+            float_ids = float_ids or pd.api.types.is_float_dtype(id_column)
+            ids = id_column.map(lambda value: None if pd.isna(value) else requester_id_string(value)).to_numpy(dtype=object)
+            row_counts.add(ids, np.zeros((len(ids), 0)))
+            valid, values = score_matrix(row_scores)
+            requesters.add(ids[valid], values)
+            matched = ~np.isnan(response_scores)
+            response_sums.add(ids[matched], response_scores[matched])
+        rows_done += len(chunk)
+
+    # Type and order the IDs as the whole file would: numbers if every ID is one, else text
+    keys = pd.Series(row_counts.keys, dtype=object)
+    numeric_ids = pd.to_numeric(keys, errors="coerce")
+    if numeric_ids.notna().all():
+        feedback_ids = numeric_ids.astype(np.float64) if float_ids else numeric_ids
+    else:
+        feedback_ids = keys
+    records = []
+    for key, feedback_id in sorted(zip(keys, feedback_ids), key=lambda pair: pair[1]):
+        group = requesters.get(key)
+        summary = group_summary(*group) if group else {}
+        response = response_sums.get(key)
+        avg_score = float(response[0][0] / response[1]) if response else 0.0
+        records.append(requester_record(feedback_id, row_counts.get(key)[1], summary, avg_score))
+    return pd.DataFrame(records)
+
+def filename_date(path):
+    """YYYY-MM-DD date found in a file name, or None."""
+    match = re.search(r'(\d{4}-\d{2}-\d{2})', os.path.basename(path))
+    if match:
         try:
-            plt.style.use('seaborn')
-        except:
-            plt.style.use('default')
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        # Prepare data for plotting
-        dates = [r['date'] for r in all_results]
-        date_labels = [d.strftime('%Y-%m-%d') for d in dates]
-        
-        # Plot each category
-        for category in categories:
-            scores = [r['scores'].get(category, 0) for r in all_results]
-            ax.plot(date_labels, scores, marker='o', label=category, linewidth=2)
-        
-        ax.set_facecolor(COLORS['card'])
-        fig.patch.set_facecolor(COLORS['card'])
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.set_xlabel("Feedback Date", fontsize=10)
-        ax.set_ylabel("Skill Score", fontsize=10)
-        ax.set_title(f"Skill Improvement Over Time for ID: {feedback_id}", fontsize=12, pad=20)
-        ax.set_ylim(0, 1)
-        ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
-        ax.grid(True, linestyle='--', alpha=0.6)
-        
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-
-        canvas = FigureCanvasTkAgg(fig, master=chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
-        
-        # Add improvement percentages
-        info_frame = tk.Frame(chart_window, bg=COLORS['background'])
-        info_frame.pack(fill='x', padx=20, pady=(0, 20))
-        
-        # Calculate improvement percentages
-        first_scores = all_results[0]['scores']
-        last_scores = all_results[-1]['scores']
-        
-        improvement_text = "Improvement Percentage:\n"
-        for category in categories:
-            initial = first_scores.get(category, 0.01)  # Avoid division by zero
-            final = last_scores.get(category, 0)
-            improvement = ((final - initial) / initial) * 100
-            improvement_text += f"{category}: {improvement:+.1f}%\n"
-        
-        tk.Label(info_frame, text=improvement_text, bg=COLORS['background'], 
-                fg=COLORS['text'], font=('Segoe UI', 10), justify='left').pack(side='left')
-        
-    except Exception as e:
-        messagebox.showerror("Error", f"Failed to create improvement chart: {str(e)}")
-
-def analyze_feedback():
-    start_time = time.time()
-
-    # Show loading status
-    processing_time_label.config(text="Processing feedback... Please wait.")
-    root.update_idletasks()
-
-    # Ask user to select one or more files
-    file_paths = filedialog.askopenfilenames(
-        title="Select Excel File(s)",
-        filetypes=[("Excel Files", "*.xlsx")]
-    )
-
-    if not file_paths:
-        messagebox.showwarning("File Error", "No file(s) selected.")
-        processing_time_label.config(text="Ready")
-        return
-
-    feedback_id = id_entry.get().strip()
-    if not feedback_id:
-        messagebox.showwarning("Input Error", "Please provide a Feedback ID.")
-        processing_time_label.config(text="Ready")
-        return
-
-    if not feedback_id.isdigit():
-        messagebox.showwarning("Input Error", "Feedback ID must be a number.")
-        processing_time_label.config(text="Ready")
-        return
-
-    feedback_id = int(feedback_id)
+            return datetime.strptime(match.group(1), "%Y-%m-%d").date().isoformat()
+        except ValueError:
+            pass
+    return None
+
+def period_date(path, df=None):
+    """Date of an evaluation period, as YYYY-MM-DD.
+
+    Taken from a date in the file name, else the latest 'Form Completed On
+    Date' in the data, else the file's modification time.
+    """
+    import pandas as pd
+    if filename_date(path):
+        return filename_date(path)
+    if df is not None and 'Form Completed On Date' in df.columns:
+        completed = pd.to_datetime(df['Form Completed On Date'], errors='coerce').max()
+        if not pd.isna(completed):
+            return completed.date().isoformat()
+    return datetime.fromtimestamp(os.path.getmtime(path)).date().isoformat()
+
+def ingest_period(path, file_hash=None, workers=None, progress=None):
+    """Analyze every requester of a workbook into period_store, unless already stored.
+
+    Periods are keyed by the file's content hash and ANALYSIS_VERSION, so a
+    renamed or copied workbook is not analyzed again. Returns the content hash.
+    """
+    import pandas as pd
+    file_hash = file_hash or file_content_hash(path)
+    if period_store.period(file_hash, ANALYSIS_VERSION) is not None:
+        profiler.count("periods reused")
+        return file_hash
+
+    df, comment_col, response_col = load_feedback_data([path], progress)
+    aggregates = []
+    if comment_col and response_col:
+        _, row_scores = analyze_rows(df[comment_col].tolist(), df[response_col].tolist(), workers, progress)
+        with profiler.stage("period aggregation"):
+            valid, values = score_matrix(row_scores)
+            ids = df['Feedback Requester User ID'].to_numpy()
+            known = pd.notna(ids[valid])
+            valid, values = valid[known], values[known]
+            for kind, column in (("all", None), ("question", 'Feedback Dimensions & Questions'),
+                                 ("rank", 'Rank feedback provider')):
+                groups = GroupSums(values.shape[1])
+                groups.add(ids[valid] if column is None else (ids[valid], df[column].to_numpy()[valid]), values)
+                for key, sums, count in groups.items():
+                    feedback_id, group_key = (key, "") if column is None else key
+                    aggregates.append((requester_id_string(feedback_id), kind, group_key, float(sums[0]),
+                                       count, dict(zip(categories, sums[1:].tolist()))))
+
+    # Workbooks without the needed columns are stored empty so they are not read again
+    period_store.save_period(file_hash, ANALYSIS_VERSION, os.path.abspath(path), period_date(path, df), aggregates)
+    profiler.count("periods analyzed")
+    return file_hash
+
+def load_periods(file_paths, workers=None, progress=None):
+    """Ingest the workbooks into period_store; [(path, file_hash, date)] of the distinct periods.
+
+    Only workbooks missing from period_store are analyzed; byte-identical
+    workbooks count as one period.
+    """
+    periods = []
+    seen = set()
+    for path in file_paths:
+        file_hash = file_content_hash(path)
+        if file_hash in seen:
+            profiler.count("duplicate periods skipped")
+            continue
+        seen.add(file_hash)
+        ingest_period(path, file_hash, workers, progress)
+
+        # A date in this file's name wins over the one stored with its content
+        day = filename_date(path) or period_store.period(file_hash, ANALYSIS_VERSION)["period_date"]
+        periods.append((path, file_hash, date.fromisoformat(day)))
+    return periods
+
+def requester_series(periods, feedback_id):
+    """Average category scores of one requester in each of load_periods' periods, oldest first.
+
+    Returns a list of dicts with date, path, sentiment and scores.
+    """
+    series = []
+    for path, file_hash, day in periods:
+        aggregates = period_store.requester_aggregates(file_hash, ANALYSIS_VERSION, requester_id_string(feedback_id))
+        if "" not in aggregates:
+            continue
+        sentiment_sum, count, category_sums = aggregates[""]
+        series.append({
+            "date": day,
+            "path": path,
+            "sentiment": sentiment_sum / count,
+            "scores": {category: category_sums.get(category, 0) / count for category in categories},
+        })
+
+    series.sort(key=lambda point: point["date"])
+    return series
+
+def improvement_series(file_paths, feedback_id, workers=None, progress=None):
+    """Average category scores of one requester per evaluation period, oldest first."""
+    return requester_series(load_periods(file_paths, workers, progress), feedback_id)
+
+def export_chart_pack(file_paths, out_dir, ids=None, fmt="png", workers=None, progress=None):
+    """Write category and improvement charts for every requester ID (or the given IDs) to out_dir.
+
+    Improvement charts need at least two distinct periods among the files.
+    Returns the number of image files written.
+    """
+    import pandas as pd
+    from charts import write_chart_pack
+
+    workers = workers or ANALYSIS_WORKERS
+    results = analyze_files(file_paths, ids, workers, progress)
+    periods = load_periods(file_paths, workers, progress) if len(file_paths) >= 2 else []
+
+    jobs = []
+    with profiler.stage("chart series"):
+        for record in results.to_dict('records'):
+            feedback_id = record['Feedback Requester User ID']
+            scores = None
+            if record['Most Relevant Category'] is not None and not pd.isna(record['Most Relevant Category']):
+                scores = {category: record[category] for category in categories}
+            series = requester_series(periods, feedback_id) if len(periods) >= 2 else None
+            jobs.append((requester_id_string(feedback_id), scores, series))
+
+    with profiler.stage("chart rendering"):
+        return write_chart_pack(jobs, categories, out_dir, fmt, workers=workers, progress=progress)
+
+def embed_texts(texts, batch_size=SPACY_BATCH_SIZE):
+    """(vector, sentiment, words, tokens) of every text from one spaCy pass, as stored by embedding_store."""
+    from textblob import TextBlob
+    embedded = []
+    docs = get_nlp().pipe(texts, batch_size=batch_size, disable=SPACY_DISABLED_PIPES)
+    for text, doc in zip(texts, docs):
+        tokens = KeywordMatcher.doc_tokens(doc)
+        words = sum(1 for _, _, is_word in tokens if is_word)
+        embedded.append((doc.vector, TextBlob(text).sentiment.polarity, words, tokens))
+    return embedded
+
+@profiler.timed("embedding index")
+def index_embeddings(file_paths, progress=None):
+    """Add files not yet in the embedding store and return their content hashes.
+
+    Files are recognized by content, and only texts that were never
+    embedded before go through spaCy. progress(texts_done, texts_total) is
+    called per chunk of new texts of each file.
+    """
+    import pandas as pd
+    file_hashes = []
+    for path in file_paths:
+        file_hash = file_content_hash(path)
+        file_hashes.append(file_hash)
+        if embedding_store.has_file(file_hash):
+            continue
 
-    try:
-        dfs = []
-        for file_path in file_paths:
-            df = pd.read_excel(file_path)
-            dfs.append(df)
-
-        df_combined = pd.concat(dfs, ignore_index=True)
-
-        # Identify columns
-        comment_col = 'Comments ' if 'Comments ' in df_combined.columns else 'Comments' if 'Comments' in df_combined.columns else None
-        response_col = 'Feedback Responses' if 'Feedback Responses' in df_combined.columns else 'Feedback Response' if 'Feedback Response' in df_combined.columns else None
-
-        if not comment_col or not response_col:
-            messagebox.showwarning("Column Error", "Required columns not found in Excel file(s)")
-            processing_time_label.config(text="Ready")
-            return
-
-        df_combined[comment_col] = df_combined[comment_col].fillna("")
-        df_combined[response_col] = df_combined[response_col].fillna("")
-        df_combined['Feedback Dimensions & Questions'] = df_combined['Feedback Dimensions & Questions'].fillna("")
-        df_combined['Rank feedback provider'] = df_combined['Rank feedback provider'].fillna("Unknown")
-
-        # Filter by feedback ID
-        result = df_combined[df_combined['Feedback Requester User ID'].astype(str) == str(feedback_id)]
-
-        if result.empty:
-            main_text = f"No feedback found for ID: {feedback_id}"
-            detailed_text = ""
-            similarity_scores = None
+        df, comment_col, response_col = prepare_feedback_frame(read_feedback_file(path))
+        if comment_col and response_col:
+            texts = row_texts(df[comment_col].tolist(), df[response_col].tolist(), native=False)
         else:
-            comments = result[comment_col].tolist()
-            responses = result[response_col].tolist()
-            questions = result['Feedback Dimensions & Questions'].tolist()
-            ranks = result['Rank feedback provider'].tolist()
-
-            main_text, detailed_text, similarity_scores, _, _ = process_feedback(
-                feedback_id, comments, responses, questions, ranks
-            )
-
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred: {str(e)}")
-        processing_time_label.config(text="Ready")
-        return
-
-    elapsed_time = time.time() - start_time
-    main_text += f"\nProcessing Time: {elapsed_time:.2f} sec"
-    main_text += f"\nFiles Processed: {len(file_paths)}"
-
-    # Update GUI
-    main_score_text_widget.delete(1.0, tk.END)
-    detailed_text_widget.delete(1.0, tk.END)
-    main_score_text_widget.insert(tk.END, main_text)
-    detailed_text_widget.insert(tk.END, detailed_text)
-
-    # Update charts
-    for widget in chart_card.winfo_children():
-        widget.destroy()
-
-    if similarity_scores:
-        chart_button = ModernButton(chart_card, text="View Full-Screen Chart", command=lambda: show_chart_window(similarity_scores))
-        chart_button.pack(pady=10)
-        
-        # Add improvement analysis button if multiple files selected
-        if len(file_paths) >= 2:
-            improvement_btn = ModernButton(
-                chart_card, 
-                text="View Skill Improvement Over Time", 
-                command=lambda: show_improvement_chart(file_paths, feedback_id)
-            )
-            improvement_btn.pack(pady=10)
+            texts = [""] * len(df)
+        keys = [result_key(EMBEDDING_VERSION, "embedding", text) if text.strip() else None for text in texts]
+        positions = embedding_store.positions([key for key in keys if key])
+        new = list({key: text for key, text in zip(keys, texts) if key and key not in positions}.items())
+        profiler.count("texts embedded", len(new))
+        for start in range(0, len(new), EMBEDDING_CHUNK_TEXTS):
+            chunk = new[start:start + EMBEDDING_CHUNK_TEXTS]
+            embedded = embed_texts([text for _, text in chunk])
+            positions.update(embedding_store.add_texts(
+                (key, text, *values) for (key, text), values in zip(chunk, embedded)
+            ))
+            if progress:
+                progress(start + len(chunk), len(new))
+
+        if 'Feedback Requester User ID' in df.columns:
+            requester_ids = [None if pd.isna(value) else requester_id_string(value)
+                             for value in df['Feedback Requester User ID']]
+        else:
+            requester_ids = [None] * len(df)
+        embedding_store.add_file(file_hash, path, requester_ids, [positions.get(key, -1) for key in keys])
+    return file_hashes
+
+def rescore_files(file_paths, taxonomy=None, progress=None):
+    """Results table of the files scored against a taxonomy ({category: [keywords]}) from stored embeddings.
+
+    Only the category vectors and keyword matches are computed anew; the
+    texts' vectors, tokens and sentiment come from embedding_store, so a
+    taxonomy change needs no spaCy pass over the texts. The table has the
+    columns of analyze_files without Average Feedback Score.
+    """
+    import pandas as pd
+    if taxonomy is None:
+        taxonomy = {category: category_keywords.get(category, []) for category in categories}
+    taxonomy_categories = list(taxonomy)
+
+    file_rows = [embedding_store.file_rows(file_hash) for file_hash in index_embeddings(file_paths, progress)]
+    ids = np.concatenate([requester_ids for requester_ids, _ in file_rows]) if file_rows else np.array([], dtype=object)
+    positions = np.concatenate([rows for _, rows in file_rows]) if file_rows else np.array([], dtype=np.int64)
+    scored = np.flatnonzero(positions >= 0)
+    unique_positions, inverse = np.unique(positions[scored], return_inverse=True)
+
+    with profiler.stage("rescoring"):
+        nlp = get_nlp()
+        category_vectors = np.array([nlp(category).vector for category in taxonomy_categories], dtype=np.float32)
+        similarities = cosine_similarity_matrix(embedding_store.vectors()[unique_positions], category_vectors)
+        matcher = KeywordMatcher(nlp, taxonomy)
+        keyword_shares = np.zeros(similarities.shape)
+        for row, tokens in enumerate(embedding_store.tokens(unique_positions)):
+            counts, words = matcher.token_counts(tokens)
+            if words > 0:
+                keyword_shares[row] = counts / words
+        scores = 0.5 * similarities + 0.5 * keyword_shares
+        values = np.column_stack([embedding_store.sentiments(unique_positions), scores])[inverse]
+
+        requesters = GroupSums(values.shape[1])
+        requesters.add(ids[scored], values)
+
+    records = []
+    for feedback_id, rows in pd.Series(ids, dtype=object).dropna().value_counts(sort=False).items():
+        record = {'Feedback Requester User ID': feedback_id, 'Rows': int(rows), 'Average Sentiment': None}
+        record.update(dict.fromkeys(taxonomy_categories))
+        record['Most Relevant Category'] = None
+        group = requesters.get(feedback_id)
+        if group:
+            sums, count = group
+            averages = dict(zip(taxonomy_categories, (sums[1:] / count).tolist()))
+            record.update(averages)
+            record['Average Sentiment'] = float(sums[0] / count)
+            record['Most Relevant Category'] = max(averages, key=averages.get)
+        records.append(record)
+
+    results = pd.DataFrame(records, columns=['Feedback Requester User ID', 'Rows', 'Average Sentiment',
+                                             *taxonomy_categories, 'Most Relevant Category'])
+    # Order and type the IDs like analyze_files
+    numeric_ids = pd.to_numeric(results['Feedback Requester User ID'], errors="coerce")
+    if numeric_ids.notna().all():
+        results['Feedback Requester User ID'] = numeric_ids
+    return results.sort_values('Feedback Requester User ID', kind="stable").reset_index(drop=True)
+
+def similar_comments(text, file_paths=None, top=10):
+    """[{'similarity', 'text', 'ids'}] of the stored texts closest to text, best first.
+
+    The search covers the rows of file_paths (indexed first if needed), or
+    every file in the store. ids lists the requesters whose rows in any
+    stored file have that text.
+    """
+    positions = None
+    if file_paths:
+        hashes = index_embeddings(file_paths)
+        positions = np.unique(np.concatenate([embedding_store.file_rows(file_hash)[1] for file_hash in hashes]))
+        positions = positions[positions >= 0]
+    query = get_nlp()(translate_text(text), disable=SPACY_DISABLED_PIPES)
+    matches = embedding_store.nearest(query.vector, top, positions)
+    found = [position for position, _ in matches]
+    texts = embedding_store.texts(found)
+    ids = embedding_store.requester_ids(found)
+    return [
+        {"similarity": similarity, "text": match_text, "ids": ids[position]}
+        for (position, similarity), match_text in zip(matches, texts)
+    ]
+
+def calibrate_french_scoring(file_paths):
+    """Fit the native French scores to the translated path on the files' French texts.
+
+    Each French text is scored both ways: translated and scored in English,
+    and scored in French. A least-squares line per score maps the French
+    scores onto the English ones. The fitted lines go to
+    FRENCH_CALIBRATION_FILE. Translation is needed once, here; native
+    scoring stays offline afterwards. Returns the number of texts used.
+    """
+    global _french_scorer, ANALYSIS_VERSION
+    texts = []
+    for file_path in file_paths:
+        df = read_feedback_file(file_path)
+        for col in ('Comments', 'Feedback Responses'):
+            if col in df.columns:
+                texts.extend(text.strip() for text in df[col].dropna().astype(str) if text.strip())
+    texts = list(dict.fromkeys(texts))
+    languages = language_detector.detect_many(texts)
+    french = [text for text in texts if languages[text] == 'fr']
+
+    pretranslate(french)
+    cached = translation_cache.get_many(french)
+    pairs = [(text, cached[text][1]) for text in french if text in cached and cached[text][1]]
+    if not pairs:
+        raise ValueError("No translated French texts to calibrate with")
+
+    _french_scorer = None
+    french_scores = get_french_scorer().raw_scores([text for text, _ in pairs])
+    english_scores = score_english_texts([translation for _, translation in pairs])
+    calibration = {
+        "texts": len(pairs),
+        "sentiment": fit_line([s for s, _ in french_scores], [s for s, _ in english_scores]),
+        "categories": {
+            category: fit_line([scores[j] for _, scores in french_scores], [scores[category] for _, scores in english_scores])
+            for j, category in enumerate(categories)
+        },
+    }
+    os.makedirs(os.path.dirname(FRENCH_CALIBRATION_FILE), exist_ok=True)
+    with open(FRENCH_CALIBRATION_FILE, "w", encoding="utf-8") as f:
+        json.dump(calibration, f, indent=2)
+    _french_scorer = None
+    ANALYSIS_VERSION = _analysis_version()
+    return len(pairs)
+
+def write_results(results, out_path):
+    """Write a results table to Parquet or CSV depending on the file extension."""
+    if out_path.lower().endswith('.parquet'):
+        results.to_parquet(out_path, index=False)
     else:
-        tk.Label(chart_card, text="No chart data available.", bg=COLORS['card'], fg=COLORS['text']).pack()
-
-    processing_time_label.config(text=f"Processed {len(file_paths)} file(s) | Processing Time: {elapsed_time:.2f} sec | Ready")
-
-def create_modern_gui():
-    global root
-    root = tk.Tk()
-    root.title("Feedback Analysis Dashboard")
-    root.geometry("1400x800")
-    root.configure(bg=COLORS['background'])
-
-    global id_entry, main_score_text_widget, detailed_text_widget, chart_card, processing_time_label
-
-    # Header
-    header = tk.Frame(root, bg=COLORS['primary'], height=60)
-    header.pack(fill='x')
-    title_font = ("Segoe UI", 16, "bold")
-    tk.Label(header, text="Feedback Analysis Dashboard", bg=COLORS['primary'], fg='white', font=title_font).pack(side='left', padx=20)
-
-    # Input panel
-    input_card = tk.Frame(root, bg=COLORS['card'], padx=20, pady=15, highlightbackground=COLORS['border'], highlightthickness=1)
-    input_card.pack(fill='x', padx=20, pady=20)
-
-    id_frame = tk.Frame(input_card, bg=COLORS['card'])
-    id_frame.pack(side='left', padx=10, fill='x', expand=True)
-    tk.Label(id_frame, text="Feedback ID:", bg=COLORS['card'], fg=COLORS['text']).pack(side='left', padx=5)
-    id_entry = tk.Entry(id_frame, width=20, font=('Segoe UI', 10), relief='flat', highlightthickness=1)
-    id_entry.pack(side='left', padx=5, fill='x', expand=True)
-
-    analyze_btn = ModernButton(input_card, text="Select Files and Analyze", command=analyze_feedback)
-    analyze_btn.pack(side='right', padx=10)
-
-    results_card = tk.Frame(root, bg=COLORS['background'])
-    results_card.pack(fill='both', expand=True, padx=20, pady=(0, 20))
-
-    summary_card = tk.Frame(results_card, bg=COLORS['card'], padx=10, pady=10, highlightbackground=COLORS['border'], highlightthickness=1)
-    summary_card.pack(side='left', fill='both', expand=True, padx=(0, 10))
-    tk.Label(summary_card, text="Summary", bg=COLORS['card'], fg=COLORS['primary'], font=("Segoe UI", 12, "bold")).pack(anchor='w')
-    main_score_text_widget = tk.Text(summary_card, wrap='word', bg=COLORS['card'], fg=COLORS['text'], font=("Segoe UI", 10))
-    main_score_text_widget.pack(fill='both', expand=True)
-
-    detailed_card = tk.Frame(results_card, bg=COLORS['card'], padx=10, pady=10, highlightbackground=COLORS['border'], highlightthickness=1)
-    detailed_card.pack(side='right', fill='both', expand=True, padx=(10, 0))
-    tk.Label(detailed_card, text="Detailed Feedback", bg=COLORS['card'], fg=COLORS['primary'], font=("Segoe UI", 12, "bold")).pack(anchor='w')
-    detailed_text_widget = tk.Text(detailed_card, wrap='word', bg=COLORS['card'], fg=COLORS['text'], font=("Segoe UI", 10))
-    detailed_text_widget.pack(fill='both', expand=True)
-
-    chart_card = tk.Frame(root, bg=COLORS['card'], padx=10, pady=10, highlightbackground=COLORS['border'], highlightthickness=1)
-    chart_card.pack(fill='x', padx=20, pady=(0, 20))
-
-    status_bar = tk.Frame(root, bg=COLORS['primary'], height=30)
-    status_bar.pack(side='bottom', fill='x')
-    processing_time_label = tk.Label(status_bar, text="Ready", bg=COLORS['primary'], fg='white', font=("Segoe UI", 9))
-    processing_time_label.pack(side='left', padx=10)
-
-    return root
-
-class ModernText(tk.Text):
-    def __init__(self, master=None, **kwargs):
-        super().__init__(master, **kwargs)
-        self.config(
-            bg=COLORS['card'],
-            fg=COLORS['text'],
-            insertbackground=COLORS['primary'],
-            selectbackground=COLORS['primary_light'],
-            relief='flat',
-            padx=10,
-            pady=10,
-            wrap=tk.WORD,
-            font=('Segoe UI', 10)
-        )
-
-class ModernButton(tk.Button):
-    def __init__(self, master=None, **kwargs):
-        super().__init__(master, **kwargs)
-        self.config(
-            bg=COLORS['primary'],
-            fg='white',
-            activebackground=COLORS['primary_light'],
-            activeforeground='white',
-            relief='flat',
-            padx=20,
-            pady=8,
-            font=('Segoe UI', 10, 'bold'),
-            cursor='hand2'
-        )
-        self.bind("<Enter>", lambda e: self.config(bg=COLORS['primary_light']))
-        self.bind("<Leave>", lambda e: self.config(bg=COLORS['primary']))
-
-class ModernEntry(tk.Entry):
-    def __init__(self, master=None, **kwargs):
-        super().__init__(master, **kwargs)
-        self.config(
-            bg='white',
-            fg=COLORS['text'],
-            relief='flat',
-            highlightthickness=1,
-            highlightcolor=COLORS['primary'],
-            highlightbackground=COLORS['border'],
-            insertbackground=COLORS['primary'],
-            font=('Segoe UI', 10),
-            selectbackground=COLORS['primary_light']
-        )
-
-class ModernLabel(tk.Label):
-    def __init__(self, master=None, **kwargs):
-        super().__init__(master, **kwargs)
-        self.config(
-            bg=COLORS['background'],
-            fg=COLORS['text'],
-            font=('Segoe UI', 10)
-        )
-
-if __name__ == "__main__":
-    import os
-    root = create_modern_gui()
-    root.mainloop()
\ No newline at end of file
+        results.to_csv(out_path, index=False)
+
+def analyze_files(file_paths, ids=None, workers=None, progress=None, stream=False):
+    """Library entry point: results table for the given requester IDs (all IDs by default).
+
+    With stream=True the files are read chunk by chunk in bounded memory.
+    progress(done, total, stage=None) reports rows, or files while
+    reading and texts while translating (stage "reading" or "translating").
+    """
+    if stream:
+        return analyze_all_ids_streaming(file_paths, ids, workers, progress)
+    df, comment_col, response_col = load_feedback_data(file_paths, progress)
+    if not comment_col or not response_col:
+        raise MissingColumnsError("Required columns not found in Excel file(s)")
+    if ids is not None:
+        df = select_requester_rows(df, load_id_index(file_paths), ids)
+    return analyze_all_ids(df, comment_col, response_col, workers, progress)
@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class GroupSums:
+    """Running column sums and row counts per group key, held in NumPy arrays.
+
+    Keys are interned to integer codes the first time they are seen, and
+    rows are added in bulk with np.add.at, which applies them in row order,
+    so the sums equal those of a row-by-row loop. A tuple of key arrays
+    groups by their combination. With keep_rows, each group keeps the
+    indices of its rows rather than copies of their data.
+    """
+
+    def __init__(self, width, keep_rows=False, capacity=16):
+        self.keys = []
+        self._codes = {}
+        self.sums = np.zeros((capacity, width))
+        self.counts = np.zeros(capacity, dtype=np.int64)
+        self._rows = [] if keep_rows else None
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _intern(self, keys):
+        import pandas as pd
+        if isinstance(keys, tuple):
+            local_codes, uniques = pd.MultiIndex.from_arrays(keys).factorize()
+        else:
+            local_codes, uniques = pd.factorize(pd.Series(keys, dtype=object))
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, key in enumerate(uniques):
+            code = self._codes.get(key)
+            if code is None:
+                code = self._codes[key] = len(self.keys)
+                self.keys.append(key)
+                if self._rows is not None:
+                    self._rows.append([])
+            mapping[i] = code
+        return local_codes, mapping
+
+    def _grow(self):
+        if len(self.keys) > len(self.counts):
+            capacity = max(len(self.keys), 2 * len(self.counts))
+            sums = np.zeros((capacity, self.sums.shape[1]))
+            sums[:len(self.sums)] = self.sums
+            counts = np.zeros(capacity, dtype=np.int64)
+            counts[:len(self.counts)] = self.counts
+            self.sums, self.counts = sums, counts
+
+    def add(self, keys, values, row_ids=None):
+        """Add each row of values (rows x width) to the group of its key; missing keys are skipped."""
+        local_codes, mapping = self._intern(keys)
+        self._grow()
+        present = local_codes >= 0
+        codes = mapping[local_codes[present]]
+        np.add.at(self.sums, codes, np.asarray(values, dtype=np.float64).reshape(len(local_codes), self.sums.shape[1])[present])
+        np.add.at(self.counts, codes, 1)
+
+        if self._rows is not None:
+            row_ids = np.arange(len(local_codes)) if row_ids is None else np.asarray(row_ids)
+            row_ids = row_ids[present]
+            order = np.argsort(codes, kind="stable")
+            groups, starts = np.unique(codes[order], return_index=True)
+            for code, rows in zip(groups, np.split(row_ids[order], starts[1:])):
+                self._rows[code].append(rows)
+
+    def rows(self, key):
+        """Row indices added for a key (needs keep_rows)."""
+        parts = self._rows[self._codes[key]]
+        return np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+
+    def get(self, key):
+        """(sums, count) of a key, or None if it was never added."""
+        code = self._codes.get(key)
+        if code is None:
+            return None
+        return self.sums[code], int(self.counts[code])
+
+    def items(self):
+        """(key, sums, count) of every group, in order of first appearance."""
+        for code, key in enumerate(self.keys):
+            yield key, self.sums[code], int(self.counts[code])
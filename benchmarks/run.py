@@ -0,0 +1,234 @@
+"""Per-stage benchmarks of the analysis pipeline on synthetic workbooks.
+
+    python benchmarks/run.py --rows 5000 --french 0.4 --ids 200
+    python benchmarks/run.py --save-baseline   # record this run as the baseline
+    python benchmarks/run.py --compare         # flag stages slower than the baseline
+
+Each stage reports throughput, p50/p99 latency per item and the process's
+peak RSS so far. The whole run is repeated --repeats times in fresh
+interpreters (so caches start cold each time) and every stage keeps its
+median run; single runs vary too much to compare against a baseline. Translation uses the offline backend unless --online is
+given, and all caches live in a temporary directory.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def stage_result(stage, items, seconds, latencies=None):
+    latencies = latencies if latencies else [seconds / max(items, 1)]
+    return {
+        "stage": stage,
+        "items": items,
+        "seconds": seconds,
+        "throughput": items / seconds if seconds > 0 else float("inf"),
+        "p50_ms": float(np.percentile(latencies, 50)) * 1000,
+        "p99_ms": float(np.percentile(latencies, 99)) * 1000,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def measure_each(stage, items, func):
+    """Time func on every item separately."""
+    latencies = []
+    start = time.perf_counter()
+    for item in items:
+        item_start = time.perf_counter()
+        func(item)
+        latencies.append(time.perf_counter() - item_start)
+    return stage_result(stage, len(items), time.perf_counter() - start, latencies)
+
+
+def measure_once(stage, items, func):
+    """Time one call of func that handles `items` items."""
+    start = time.perf_counter()
+    func()
+    return stage_result(stage, items, time.perf_counter() - start)
+
+
+def run_benchmarks(rows, french_share, id_count, workdir, workers):
+    from synthetic import generate_feedback, write_workbook
+    import pandas as pd
+    import Code
+    from ingest import read_feedback_file
+
+    path = os.path.join(workdir, "synthetic.xlsx")
+    write_workbook(generate_feedback(rows, french_share, id_count), path)
+    results = []
+
+    results.append(measure_once("read_excel", rows, lambda: pd.read_excel(path)))
+    results.append(measure_once("ingest (cold cache)", rows, lambda: read_feedback_file(path)))
+    results.append(measure_once("ingest (warm cache)", rows, lambda: read_feedback_file(path)))
+
+    df, comment_col, response_col = Code.load_feedback_data([path])
+    comments = df[comment_col].tolist()
+    responses = df[response_col].tolist()
+    questions = df['Feedback Dimensions & Questions'].tolist()
+    ranks = df['Rank feedback provider'].tolist()
+    unique_texts = list(dict.fromkeys(t for t in comments + responses if t.strip()))
+
+    results.append(measure_each("translate_text (cold cache)", unique_texts, Code.translate_text))
+    results.append(measure_each("translate_text (warm cache)", unique_texts, Code.translate_text))
+
+    texts = [t for t in Code.row_texts(comments, responses) if t.strip()]
+    from textblob import TextBlob
+    results.append(measure_each("TextBlob sentiment", texts, lambda t: TextBlob(t).sentiment.polarity))
+
+    Code.get_category_vectors()
+    Code.result_store.clear()
+    results.append(measure_each("classify_text", texts, Code.classify_text))
+    Code.result_store.clear()
+    results.append(measure_once("classify_texts (batched)", len(texts), lambda: Code.classify_texts(texts)))
+
+    Code.result_store.clear()
+    _, row_scores = Code.analyze_rows(comments, responses)
+    results.append(measure_once(
+        "aggregate_scores", rows, lambda: Code.aggregate_scores(row_scores, questions, ranks)
+    ))
+
+    groups = [group for _, group in df.groupby('Feedback Requester User ID')]
+
+    def process_group(group):
+        Code.process_feedback(
+            0, group[comment_col].tolist(), group[response_col].tolist(),
+            group['Feedback Dimensions & Questions'].tolist(), group['Rank feedback provider'].tolist()
+        )
+
+    Code.result_store.clear()
+    results.append(measure_each("process_feedback per ID (cold)", groups, process_group))
+    results.append(measure_each("process_feedback per ID (warm)", groups, process_group))
+
+    Code.result_store.clear()
+    results.append(measure_once(
+        f"analyze_all_ids (workers={workers})", rows,
+        lambda: Code.analyze_all_ids(df, comment_col, response_col, workers)
+    ))
+    return results
+
+
+def run_once(args, workdir):
+    # Must be set before Code creates its caches and translation backend
+    os.environ["FEEDBACK_CACHE_DIR"] = workdir
+    if not args.online:
+        os.environ["FEEDBACK_TRANSLATION_BACKEND"] = "offline"
+    sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+    return run_benchmarks(args.rows, args.french, args.ids, workdir, args.workers)
+
+
+def run_repeated(args, workdir):
+    """Run the benchmarks args.repeats times in fresh interpreters and keep each stage's median run."""
+    command = [sys.executable, os.path.abspath(__file__), "--repeats", "1",
+               "--rows", str(args.rows), "--french", str(args.french),
+               "--ids", str(args.ids), "--workers", str(args.workers)]
+    if args.online:
+        command.append("--online")
+    runs = []
+    for repeat in range(args.repeats):
+        output = os.path.join(workdir, f"run{repeat}.json")
+        subprocess.run(command + ["--json", output], check=True, stdout=subprocess.DEVNULL)
+        with open(output, encoding="utf-8") as f:
+            runs.append(json.load(f)["results"])
+    results = []
+    for stage_runs in zip(*runs):
+        median = statistics.median_low(r["throughput"] for r in stage_runs)
+        results.append(next(r for r in stage_runs if r["throughput"] == median))
+    return results
+
+
+def config_key(args):
+    return f"rows={args.rows},french={args.french},ids={args.ids},workers={args.workers}"
+
+
+def load_baselines():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_results(results, baseline=None, tolerance=0.2):
+    """Print the results table; returns the stages slower than the baseline."""
+    regressions = []
+    header = f"{'stage':<36}{'items':>8}{'items/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'RSS MB':>9}"
+    print(header + ("  vs baseline" if baseline else ""))
+    print("-" * (len(header) + (13 if baseline else 0)))
+    for result in results:
+        rss = f"{result['peak_rss_mb']:.0f}" if result["peak_rss_mb"] is not None else "-"
+        line = (f"{result['stage']:<36}{result['items']:>8}{result['throughput']:>12.1f}"
+                f"{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}{rss:>9}")
+        previous = (baseline or {}).get(result["stage"])
+        if previous:
+            change = result["throughput"] / previous["throughput"] - 1
+            line += f"  {change:+.0%}"
+            if change < -tolerance:
+                line += "  REGRESSION"
+                regressions.append(result["stage"])
+        print(line)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every stage of the feedback analysis pipeline.")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--french", type=float, default=0.4, help="Share of French comments")
+    parser.add_argument("--ids", type=int, default=200, help="Number of distinct requester IDs")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for the batch stage")
+    parser.add_argument("--online", action="store_true", help="Translate with googletrans instead of the offline backend")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Exit with status 1 on regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop before flagging")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs of the whole benchmark; each stage keeps its median")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.repeats > 1:
+            results = run_repeated(args, workdir)
+        else:
+            results = run_once(args, workdir)
+
+    baselines = load_baselines()
+    key = config_key(args)
+    baseline = {r["stage"]: r for r in baselines.get(key, [])}
+    regressions = print_results(results, baseline, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": key, "results": results}, f, indent=2)
+    if args.save_baseline:
+        baselines[key] = results
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2)
+        print(f"\nBaseline saved for {key}")
+    if regressions:
+        print(f"\n{len(regressions)} stage(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        if args.compare:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
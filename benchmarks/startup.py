@@ -0,0 +1,143 @@
+"""Startup-time benchmarks: how long until the dashboard or a scoring worker is ready.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --save-baseline   # record this run as the baseline
+    python benchmarks/startup.py --compare         # exit 1 on regressions or blown budgets
+
+Every stage runs in a fresh interpreter and is timed from process start to
+the moment the stage is ready, so import costs count in full. Each stage is
+repeated and the median reported. The GUI window stage is skipped when no
+display is available. Caches live in a temporary directory; the static
+vectors are exported there once before the stages run.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "startup_baseline.json")
+
+# (stage, environment, code run in the fresh interpreter before it reports ready)
+STAGES = [
+    ("import Code", {}, "import Code"),
+    ("import gui", {}, "import gui"),
+    ("gui window", {}, "import gui\nroot = gui.create_modern_gui()\nroot.update()"),
+    ("worker ready (pipeline)", {"FEEDBACK_MODEL_MODE": "pipeline"}, "import Code\nCode._init_worker()"),
+    ("worker ready (vectors)", {"FEEDBACK_MODEL_MODE": "vectors"}, "import Code\nCode._init_worker()"),
+]
+
+# Seconds a stage may take whatever the baseline says
+BUDGETS = {
+    "gui window": 1.0,
+}
+
+READY = "startup-benchmark-ready"
+
+
+def time_stage(code, env):
+    """Seconds from starting an interpreter until it has run code, or None if code failed."""
+    script = f"import sys\nsys.path.insert(0, {ROOT!r})\n{code}\nprint({READY!r}, flush=True)\n"
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-c", script], cwd=ROOT, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+    ready = None
+    for line in process.stdout:
+        if line.strip() == READY:
+            ready = time.perf_counter() - start
+            break
+    process.communicate()
+    return ready if process.returncode == 0 else None
+
+
+def run_benchmarks(repeats, workdir):
+    base_env = dict(os.environ, FEEDBACK_CACHE_DIR=workdir, FEEDBACK_TRANSLATION_BACKEND="offline")
+    # Export the static vectors before timing, as a first run would have
+    if time_stage("import Code\nCode.get_static_vectors()", base_env) is None:
+        print("Could not export the static vectors; is the spaCy model installed?", file=sys.stderr)
+
+    results = []
+    for stage, env, code in STAGES:
+        times = [time_stage(code, dict(base_env, **env)) for _ in range(repeats)]
+        if None in times:
+            print(f"{stage}: skipped (failed, e.g. no display or model)", file=sys.stderr)
+            continue
+        results.append({
+            "stage": stage,
+            "runs": repeats,
+            "median_s": statistics.median(times),
+            "min_s": min(times),
+            "max_s": max(times),
+        })
+    return results
+
+
+def load_baseline():
+    if not os.path.exists(BASELINE_PATH):
+        return {}
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_results(results, baseline=None, tolerance=0.2):
+    """Print the results table; returns the stages slower than the baseline or over budget."""
+    failures = []
+    header = f"{'stage':<28}{'median s':>10}{'min s':>9}{'max s':>9}{'budget':>8}"
+    print(header + ("  vs baseline" if baseline else ""))
+    print("-" * (len(header) + (13 if baseline else 0)))
+    for result in results:
+        budget = BUDGETS.get(result["stage"])
+        line = (f"{result['stage']:<28}{result['median_s']:>10.3f}{result['min_s']:>9.3f}{result['max_s']:>9.3f}"
+                f"{budget if budget else '-':>8}")
+        previous = (baseline or {}).get(result["stage"])
+        if previous:
+            change = result["median_s"] / previous["median_s"] - 1
+            line += f"  {change:+.0%}"
+            if change > tolerance:
+                line += "  REGRESSION"
+                failures.append(result["stage"])
+        if budget and result["median_s"] > budget:
+            line += "  OVER BUDGET"
+            if result["stage"] not in failures:
+                failures.append(result["stage"])
+        print(line)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the startup time of the dashboard and scoring workers.")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per stage; the median is reported")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--compare", action="store_true", help="Exit with status 1 on regressions or blown budgets")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        results = run_benchmarks(args.repeats, workdir)
+
+    baseline = {r["stage"]: r for r in load_baseline().get("results", [])}
+    failures = print_results(results, baseline, args.tolerance)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print("\nBaseline saved")
+    if failures:
+        print(f"\n{len(failures)} stage(s) regressed or exceeded their budget: {', '.join(failures)}")
+        if args.compare:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
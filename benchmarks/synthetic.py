@@ -0,0 +1,161 @@
+"""Synthetic feedback workbooks with the same schema as the Data_Ey*.xlsx exports.
+
+    python benchmarks/synthetic.py --rows 50000 --french 0.4 --ids 2000 --out synthetic.xlsx
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+COLUMNS = [
+    "Feedback Requester GUI",
+    "Feedback Requester User ID",
+    "SL",
+    "SSL",
+    "Feedback Requester Rank",
+    "Form Start Date",
+    "Form Completed On Date",
+    "Feedback Provider GUI",
+    "Feedback Provider User ID",
+    "Rank feedback provider",
+    "Feedback Provider Feedback Status",
+    "Feedback Dimensions & Questions",
+    "Feedback Responses",
+    "Comments ",
+    "Feedback Requester Geographical Area",
+    "Feedback Requester Geographical Region",
+    "Feedback Requester Management Area",
+    "Feedback Requester Management Region",
+]
+
+# One feedback form: (question, possible responses); None means comment only
+FORM = [
+    ("What strengths does this individual demonstrate?", None),
+    ("What could this individual do to have a greater impact?", None),
+    ("Delivers quality work and manages risks expected in their role.", "rating"),
+    ("Demonstrates the business skills expected in their role.", "rating"),
+    ("Demonstrates the leadership skills and behaviors expected in their role.", "rating"),
+    ("Demonstrates the technical skills expected in their role.", "rating"),
+    ("What is the ONE key area this individual should prioritize to elevate their performance?", "area"),
+]
+RATINGS = [
+    "Significantly exceeded expectations",
+    "Exceeded expectations",
+    "Met expectations",
+    "Partially met expectations",
+    "Did not meet expectations",
+    "Not observed",
+    "Non observé",
+]
+RATING_WEIGHTS = [4, 15, 16, 2, 0.1, 2, 1.3]
+AREAS = ["Business skills", "Technical skills", "Leadership skills and behaviors", "Quality and risk management"]
+RANKS = [
+    "Staff/Assistant", "Senior", "Manager", "Senior Manager", "Director",
+    "Associate Director", "Assistant Director", "Executive Director", "Partner/Principal",
+]
+SERVICE_LINES = [("Assurance", "Audit "), ("Assurance", "ASA"), ("Consulting", "Techno Risk"),
+                 ("Consulting", "Innovation "), ("Tax", "Tax"), ("CBS", "CBS")]
+STATUSES = ["Completed", "Completed", "Completed", "Passive Declined (Incomplete)", "Declined(Incomplete)"]
+
+ENGLISH_PHRASES = [
+    "{name} is a reliable team member who manages client expectations well.",
+    "Strong technical skills on data and software tools, always delivers quality work.",
+    "{name} should take more ownership of the engagement strategy and lead the team.",
+    "Great mentor for junior staff, inspires the team and guides them through complex tasks.",
+    "Needs to improve risk and compliance awareness when reviewing the control process.",
+    "Very good understanding of the business and market opportunities for the client.",
+    "Could delegate more and focus on the overall vision of the project.",
+    "Excellent work on the development of the new reporting systems.",
+]
+FRENCH_PHRASES = [
+    "{name} est un collaborateur autonome qui gère très bien les attentes du client.",
+    "Très bonnes compétences techniques, le travail livré est toujours de qualité.",
+    "{name} pourrait accroître son impact en partageant davantage ses connaissances avec l'équipe.",
+    "Doit encadrer davantage les juniors et prendre plus de responsabilités sur la mission.",
+    "Améliorer la qualité des livrables et la maîtrise des risques sur les processus de contrôle.",
+    "Bonne compréhension des enjeux business et des opportunités commerciales du client.",
+    "Continuer à développer ses compétences en gestion d'équipe et en communication.",
+    "Voir ci-dessus",
+]
+NAMES = ["Alex", "Sam", "Nour", "Yasmine", "Karim", "Lina", "Omar", "Sarah", "Mehdi", "Ines"]
+
+
+def make_comment(rng, french_share):
+    phrases = FRENCH_PHRASES if rng.random() < french_share else ENGLISH_PHRASES
+    count = rng.choice([1, 1, 2, 3])
+    return " ".join(rng.choice(phrases).format(name=rng.choice(NAMES)) for _ in range(count))
+
+
+def generate_feedback(rows, french_share=0.4, id_count=800, comment_share=0.6, seed=0):
+    """DataFrame of about `rows` feedback rows spread over `id_count` requester IDs."""
+    rng = random.Random(seed)
+    requesters = rng.sample(range(2_000_000, 4_000_000), id_count)
+    requester_info = {
+        rid: (rng.choice(SERVICE_LINES), rng.choice(RANKS[:4])) for rid in requesters
+    }
+    start = datetime(2024, 10, 24)
+
+    records = []
+    while len(records) < rows:
+        requester = rng.choice(requesters)
+        (sl, ssl), requester_rank = requester_info[requester]
+        provider = rng.randrange(2_000_000, 4_000_000)
+        provider_rank = rng.choice(RANKS)
+        status = rng.choice(STATUSES)
+        completed = start + timedelta(days=rng.randrange(30, 120))
+        for question, kind in FORM:
+            if kind == "rating":
+                response = rng.choices(RATINGS, RATING_WEIGHTS)[0]
+            elif kind == "area":
+                response = rng.choice(AREAS)
+            else:
+                response = None
+            # Open questions are usually commented, rated ones only sometimes
+            has_comment = rng.random() < (comment_share if kind is None else comment_share * 0.3)
+            records.append({
+                "Feedback Requester GUI": requester,
+                "Feedback Requester User ID": requester,
+                "SL": sl,
+                "SSL": ssl,
+                "Feedback Requester Rank": requester_rank,
+                "Form Start Date": start,
+                "Form Completed On Date": completed,
+                "Feedback Provider GUI": provider,
+                "Feedback Provider User ID": str(provider),
+                "Rank feedback provider": provider_rank,
+                "Feedback Provider Feedback Status": status,
+                "Feedback Dimensions & Questions": question,
+                "Feedback Responses": response,
+                "Comments ": make_comment(rng, french_share) if has_comment else None,
+                "Feedback Requester Geographical Area": "EMEIA (0003)",
+                "Feedback Requester Geographical Region": "Europe West (0023)",
+                "Feedback Requester Management Area": "EMEIA (0003)",
+                "Feedback Requester Management Region": "Europe West (0063)",
+            })
+    return pd.DataFrame(records[:rows], columns=COLUMNS)
+
+
+def write_workbook(df, path):
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic feedback workbook.")
+    parser.add_argument("--rows", type=int, default=15_000)
+    parser.add_argument("--french", type=float, default=0.4, help="Share of French comments")
+    parser.add_argument("--ids", type=int, default=800, help="Number of distinct requester IDs")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="synthetic_feedback.xlsx", help=".xlsx or .csv output path")
+    args = parser.parse_args(argv)
+
+    df = generate_feedback(args.rows, args.french, args.ids, seed=args.seed)
+    write_workbook(df, args.out)
+    print(f"Wrote {len(df)} rows for {df['Feedback Requester User ID'].nunique()} IDs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+import hashlib
+import io
+import json
+import os
+import textwrap
+from collections import OrderedDict
+
+# Modern color scheme
+COLORS = {
+    "background": "#f5f5f5",
+    "primary": "#6200ee",
+    "primary_light": "#9e47ff",
+    "secondary": "#03dac6",
+    "text": "#333333",
+    "card": "#ffffff",
+    "border": "#e0e0e0"
+}
+PIE_COLORS = [COLORS['primary'], COLORS['secondary'], '#ffab91', '#ce93d8']
+
+# Chart style, picked by _styled when matplotlib is first imported
+_chart_style = None
+
+# Rendered images kept in memory, keyed by chart kind, data and format
+CHART_CACHE_SIZE = 64
+
+
+def _styled(build):
+    """Build a figure under the seaborn style without changing the global pyplot style.
+
+    matplotlib is imported here, on the first chart, not when the dashboard starts.
+    """
+    global _chart_style
+    import matplotlib.style
+    if _chart_style is None:
+        # The seaborn style was renamed in matplotlib 3.6
+        _chart_style = next((style for style in ('seaborn', 'seaborn-v0_8') if style in matplotlib.style.available), 'default')
+    with matplotlib.style.context(_chart_style):
+        return build()
+
+
+def _wrap_labels(categories):
+    return ["\n".join(textwrap.wrap(cat, width=10)) for cat in categories]
+
+
+def category_figure(similarity_scores, categories):
+    """Bar and pie charts of one requester's category scores.
+
+    The figure is not registered with pyplot, so it is freed as soon as the
+    caller drops it.
+    """
+    def build():
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(14, 6))
+        ax1, ax2 = fig.subplots(1, 2)
+        labels = _wrap_labels(categories)
+
+        ax1.bar(labels, [0] * len(categories), color=COLORS['primary_light'])
+        ax1.set_facecolor(COLORS['card'])
+        fig.patch.set_facecolor(COLORS['card'])
+        ax1.spines['top'].set_visible(False)
+        ax1.spines['right'].set_visible(False)
+        ax1.set_xlabel("Categories", fontsize=10)
+        ax1.set_ylabel("Similarity Score", fontsize=10)
+        ax1.set_title("Category Similarity Scores", fontsize=12, pad=20)
+        ax1.set_ylim(0, 1)
+
+        update_category_figure(fig, similarity_scores, categories)
+        fig.tight_layout()
+        return fig
+    return _styled(build)
+
+
+def update_category_figure(fig, similarity_scores, categories):
+    """Show another requester's scores in a figure made by category_figure."""
+    ax1, ax2 = fig.axes
+    scores = [similarity_scores.get(category, 0) for category in categories]
+    for bar, score in zip(ax1.patches, scores):
+        bar.set_height(score)
+
+    # Wedges cannot be updated in place; negative similarities cannot be drawn as wedges
+    ax2.clear()
+    if sum(max(score, 0) for score in scores) > 0:
+        ax2.pie(
+            [max(score, 0) for score in scores], labels=_wrap_labels(categories), autopct='%1.1f%%',
+            startangle=90, colors=PIE_COLORS, textprops={'fontsize': 8}
+        )
+    ax2.set_title("Score Distribution", fontsize=12, pad=20)
+
+
+def improvement_figure(series, categories, feedback_id):
+    """Line chart of a requester's category scores per period (see Code.improvement_series)."""
+    def build():
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(12, 6))
+        ax = fig.subplots()
+
+        # Plot each category
+        for category in categories:
+            ax.plot([], [], marker='o', label=category, linewidth=2)
+
+        ax.set_facecolor(COLORS['card'])
+        fig.patch.set_facecolor(COLORS['card'])
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.set_xlabel("Feedback Date", fontsize=10)
+        ax.set_ylabel("Skill Score", fontsize=10)
+        ax.set_title("", fontsize=12, pad=20)
+        ax.legend(loc='upper left', bbox_to_anchor=(1, 1))
+        ax.grid(True, linestyle='--', alpha=0.6)
+        ax.tick_params(axis='x', labelrotation=45)
+
+        update_improvement_figure(fig, series, categories, feedback_id)
+        fig.tight_layout()
+        return fig
+    return _styled(build)
+
+
+def update_improvement_figure(fig, series, categories, feedback_id):
+    """Show another requester's series in a figure made by improvement_figure."""
+    ax = fig.axes[0]
+    positions = list(range(len(series)))
+    for line, category in zip(ax.lines, categories):
+        line.set_data(positions, [point['scores'].get(category, 0) for point in series])
+    ax.set_xticks(positions, [point['date'].strftime('%Y-%m-%d') for point in series])
+    ax.set_xlim(-0.05 * max(len(series) - 1, 1), len(series) - 1 + 0.05 * max(len(series) - 1, 1))
+    ax.set_ylim(0, 1)
+    ax.set_title(f"Skill Improvement Over Time for ID: {feedback_id}", fontsize=12, pad=20)
+
+
+def improvement_text(series, categories):
+    """Improvement percentage of every category from the first period to the last."""
+    first_scores = series[0]['scores']
+    last_scores = series[-1]['scores']
+
+    text = "Improvement Percentage:\n"
+    for category in categories:
+        initial = first_scores.get(category, 0) or 0.01  # Avoid division by zero
+        final = last_scores.get(category, 0)
+        improvement = ((final - initial) / initial) * 100
+        text += f"{category}: {improvement:+.1f}%\n"
+    return text
+
+
+def render_figure(fig, fmt="png", dpi=100):
+    """Render a figure off-screen with the Agg backend and return the image bytes."""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    buffer = io.BytesIO()
+    FigureCanvasAgg(fig)
+    fig.savefig(buffer, format=fmt, dpi=dpi, facecolor=fig.get_facecolor())
+    return buffer.getvalue()
+
+
+class ChartCache:
+    """LRU cache of rendered chart images keyed by the data they show."""
+
+    def __init__(self, max_items=CHART_CACHE_SIZE):
+        self.max_items = max_items
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+
+    @staticmethod
+    def key(kind, data, fmt, dpi):
+        payload = json.dumps([kind, data, fmt, dpi], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def render(self, kind, data, build, fmt="png", dpi=100):
+        """Image bytes of build() for this data, rendered only on a cache miss."""
+        key = self.key(kind, data, fmt, dpi)
+        if key in self._images:
+            self._images.move_to_end(key)
+            self.hits += 1
+            return self._images[key]
+        self.misses += 1
+        image = render_figure(build(), fmt, dpi)
+        self._images[key] = image
+        while len(self._images) > self.max_items:
+            self._images.popitem(last=False)
+        return image
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._images),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+chart_cache = ChartCache()
+
+
+def category_chart(similarity_scores, categories, fmt="png", dpi=100):
+    """Rendered category bar/pie chart."""
+    data = {"scores": similarity_scores, "categories": categories}
+    return chart_cache.render("categories", data, lambda: category_figure(similarity_scores, categories), fmt, dpi)
+
+
+def improvement_chart(series, categories, feedback_id, fmt="png", dpi=100):
+    """Rendered improvement line chart."""
+    data = {"series": [[point['date'], point['scores']] for point in series],
+            "categories": categories, "id": str(feedback_id)}
+    return chart_cache.render(
+        "improvement", data, lambda: improvement_figure(series, categories, feedback_id), fmt, dpi
+    )
+
+
+class ChartRenderer:
+    """Renders charts of many requesters, reusing one figure per chart type.
+
+    Updating the data of an existing figure skips building the axes and the
+    layout again. Not thread-safe: use one renderer per thread or process.
+    """
+
+    def __init__(self, categories, fmt="png", dpi=100):
+        self.categories = categories
+        self.fmt = fmt
+        self.dpi = dpi
+        self._category_fig = None
+        self._improvement_fig = None
+
+    def category_chart(self, similarity_scores):
+        if self._category_fig is None:
+            self._category_fig = category_figure(similarity_scores, self.categories)
+        else:
+            _styled(lambda: update_category_figure(self._category_fig, similarity_scores, self.categories))
+        return render_figure(self._category_fig, self.fmt, self.dpi)
+
+    def improvement_chart(self, series, feedback_id):
+        if self._improvement_fig is None:
+            self._improvement_fig = improvement_figure(series, self.categories, feedback_id)
+        else:
+            _styled(lambda: update_improvement_figure(self._improvement_fig, series, self.categories, feedback_id))
+        return render_figure(self._improvement_fig, self.fmt, self.dpi)
+
+    def close(self):
+        self._category_fig = None
+        self._improvement_fig = None
+
+
+def write_chart(directory, name, image):
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    with open(path, "wb") as f:
+        f.write(image)
+    return path
+
+
+def render_chart_jobs(jobs, categories, out_dir, fmt="png", dpi=100):
+    """Write the charts of (feedback_id, scores, series) jobs; scores or series may be None.
+
+    Returns the number of files written.
+    """
+    renderer = ChartRenderer(categories, fmt, dpi)
+    written = 0
+    try:
+        for feedback_id, scores, series in jobs:
+            if scores:
+                write_chart(out_dir, f"{feedback_id}_categories.{fmt}", renderer.category_chart(scores))
+                written += 1
+            if series and len(series) >= 2:
+                write_chart(out_dir, f"{feedback_id}_improvement.{fmt}", renderer.improvement_chart(series, feedback_id))
+                written += 1
+    finally:
+        renderer.close()
+    return written
+
+
+def write_chart_pack(jobs, categories, out_dir, fmt="png", dpi=100, workers=1, progress=None, shard_size=25):
+    """Render every job's charts, in worker processes when workers > 1.
+
+    progress(jobs_done, total_jobs) is called after each shard and may raise
+    to stop. Returns the number of files written.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    shards = [jobs[start:start + shard_size] for start in range(0, len(jobs), shard_size)]
+    written = 0
+    done = 0
+    if workers <= 1 or len(shards) <= 1:
+        for shard in shards:
+            written += render_chart_jobs(shard, categories, out_dir, fmt, dpi)
+            done += len(shard)
+            if progress:
+                progress(done, len(jobs))
+        return written
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    # Filled one shard at a time, so shards submitted before a failing submit are still cancelled
+    futures = {}
+    try:
+        for shard in shards:
+            futures[pool.submit(render_chart_jobs, shard, categories, out_dir, fmt, dpi)] = len(shard)
+        for future in as_completed(futures):
+            written += future.result()
+            done += futures[future]
+            if progress:
+                progress(done, len(jobs))
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown()
+    return written
@@ -0,0 +1,194 @@
+"""Command-line entry point: the dashboard and the batch tools.
+
+    python cli.py [gui|analyze|charts|rescore|similar|serve|warm-cache|calibrate-french] ...
+
+`python Code.py ...` runs this too. Keeping main() out of Code means the
+dashboard and the service import the one Code module that the settings
+below were applied to.
+"""
+import argparse
+import sys
+import time
+
+from ingest import RequesterIndex, build_id_index
+from keyword_matcher import load_category_keywords
+from Code import (
+    ANALYSIS_WORKERS,
+    FRENCH_CALIBRATION_FILE,
+    FRENCH_MODES,
+    MODEL_MODES,
+    MissingColumnsError,
+    analyze_files,
+    calibrate_french_scoring,
+    export_chart_pack,
+    load_feedback_data,
+    load_id_index,
+    process_feedback,
+    profiler,
+    rescore_files,
+    select_requester_rows,
+    set_french_mode,
+    set_model_mode,
+    similar_comments,
+    stream_requester_rows,
+    translation_cache,
+    warm_translation_cache,
+    write_results,
+)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Feedback analysis dashboard and command-line tools.")
+    subparsers = parser.add_subparsers(dest="command")
+    gui_parser = subparsers.add_parser("gui", help="Open the dashboard (default)")
+    model_help = "Score with the full spaCy pipeline or only its memory-mapped static vectors (default: FEEDBACK_MODEL_MODE or pipeline)"
+    gui_parser.add_argument("--model-mode", choices=MODEL_MODES, help=model_help)
+
+    analyze_parser = subparsers.add_parser("analyze", help="Analyze feedback without the GUI")
+    analyze_parser.add_argument("--files", nargs="+", required=True, help="Feedback workbooks (.xlsx) or CSV exports")
+    analyze_parser.add_argument("--ids", nargs="+", help="Feedback Requester User IDs (default: all)")
+    analyze_parser.add_argument("--out", help="Write the results table to this .csv or .parquet file")
+    analyze_parser.add_argument("--workers", type=int, default=ANALYSIS_WORKERS, help="Worker processes for NLP scoring")
+    analyze_parser.add_argument("--french", choices=FRENCH_MODES, help="Translate French texts or score them offline in French (default: FEEDBACK_FRENCH_MODE or translate)")
+    analyze_parser.add_argument("--model-mode", choices=MODEL_MODES, help=model_help)
+    analyze_parser.add_argument("--stream", action="store_true", help="Read the files in chunks with bounded memory (needs --ids or --out)")
+    analyze_parser.add_argument("--profile", action="store_true", help="Print a per-stage timing breakdown")
+    analyze_parser.add_argument("--profile-out", help="Write stage timings to this .json or .prom (Prometheus) file")
+
+    charts_parser = subparsers.add_parser("charts", help="Export category and improvement charts for every requester ID")
+    charts_parser.add_argument("--files", nargs="+", required=True, help="Feedback workbooks (.xlsx) or CSV exports, one per period")
+    charts_parser.add_argument("--ids", nargs="+", help="Feedback Requester User IDs (default: all)")
+    charts_parser.add_argument("--out-dir", default="charts", help="Directory for the chart images")
+    charts_parser.add_argument("--format", choices=["png", "svg"], default="png", help="Image format")
+    charts_parser.add_argument("--workers", type=int, default=ANALYSIS_WORKERS, help="Worker processes for scoring and rendering")
+    charts_parser.add_argument("--french", choices=FRENCH_MODES, help="Translate French texts or score them offline in French")
+    charts_parser.add_argument("--model-mode", choices=MODEL_MODES, help=model_help)
+
+    calibrate_parser = subparsers.add_parser("calibrate-french", help="Fit offline French scores to the translated path")
+    calibrate_parser.add_argument("--files", nargs="+", required=True, help="Workbooks with French comments")
+
+    rescore_parser = subparsers.add_parser("rescore", help="Score against a new category taxonomy from stored embeddings")
+    rescore_parser.add_argument("--files", nargs="+", required=True, help="Feedback workbooks (.xlsx) or CSV exports")
+    rescore_parser.add_argument("--keywords", help="JSON file of {category: [keywords]} (default: the current taxonomy)")
+    rescore_parser.add_argument("--out", required=True, help="Write the results table to this .csv or .parquet file")
+
+    similar_parser = subparsers.add_parser("similar", help="Find stored comments similar to a text")
+    similar_parser.add_argument("text", help="Comment to compare against")
+    similar_parser.add_argument("--files", nargs="+", help="Search only these workbooks (default: every embedded file)")
+    similar_parser.add_argument("--top", type=int, default=10, help="Number of comments to show")
+
+    serve_parser = subparsers.add_parser("serve", help="Run a local analysis service that keeps the models loaded")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    serve_parser.add_argument("--port", type=int, default=8765, help="TCP port to listen on")
+    serve_parser.add_argument("--socket", help="Listen on this Unix socket instead of TCP")
+    serve_parser.add_argument("--data-root", default=".", help="Only feedback files under this directory are read (default: the current one)")
+    serve_parser.add_argument("--max-requests", type=int, default=8, help="Analyses run at once; more are answered 503")
+    serve_parser.add_argument("--max-batch-texts", type=int, default=512, help="Texts scored together in one batch")
+    serve_parser.add_argument("--max-wait-ms", type=float, default=20, help="Time to wait for a batch to fill")
+    serve_parser.add_argument("--model-mode", choices=MODEL_MODES, help=model_help)
+
+    warm_parser = subparsers.add_parser("warm-cache", help="Translate the workbooks' text into the cache ahead of time")
+    warm_parser.add_argument("--files", nargs="+", required=True, help="Feedback workbooks")
+
+    args = parser.parse_args(argv)
+    if getattr(args, "french", None):
+        set_french_mode(args.french)
+    if getattr(args, "model_mode", None):
+        set_model_mode(args.model_mode)
+
+    if args.command in (None, "gui"):
+        import gui
+        gui.main()
+        return 0
+
+    if args.command == "rescore":
+        start_time = time.time()
+        taxonomy = load_category_keywords(args.keywords) if args.keywords else None
+        results = rescore_files(args.files, taxonomy)
+        write_results(results, args.out)
+        print(f"Results for {len(results)} ID(s) saved to {args.out} | Processing Time: {time.time() - start_time:.2f} sec")
+        return 0
+
+    if args.command == "similar":
+        for match in similar_comments(args.text, args.files, args.top):
+            print(f"{match['similarity']:.3f}  [{', '.join(match['ids'])}]  {match['text']}")
+        return 0
+
+    if args.command == "serve":
+        from service import serve
+        serve(args.host, args.port, args.socket, args.max_requests, args.data_root,
+              max_batch_texts=args.max_batch_texts, max_wait=args.max_wait_ms / 1000)
+        return 0
+
+    if args.command == "calibrate-french":
+        try:
+            used = calibrate_french_scoring(args.files)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Calibrated French scoring on {used} text(s) | Saved to {FRENCH_CALIBRATION_FILE}")
+        return 0
+
+    if args.command == "warm-cache":
+        translated = warm_translation_cache(args.files)
+        print(f"Translated {translated} new text(s) | {translation_cache.stats()['entries']} cached in total")
+        return 0
+
+    if args.command == "charts":
+        start_time = time.time()
+        try:
+            written = export_chart_pack(args.files, args.out_dir, args.ids, args.format, args.workers)
+        except MissingColumnsError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"Wrote {written} chart(s) to {args.out_dir} | Processing Time: {time.time() - start_time:.2f} sec")
+        return 0
+
+    if args.profile or args.profile_out:
+        profiler.enabled = True
+        profiler.reset()
+
+    start_time = time.time()
+    try:
+        if args.out:
+            results = analyze_files(args.files, args.ids, args.workers, stream=args.stream)
+            write_results(results, args.out)
+            print(f"Results for {len(results)} ID(s) saved to {args.out}")
+        else:
+            if args.stream:
+                if not args.ids:
+                    parser.error("--stream needs --ids or --out")
+                df, comment_col, response_col = stream_requester_rows(args.files, args.ids)
+                index = RequesterIndex([("streamed rows", build_id_index(df))])
+            else:
+                df, comment_col, response_col = load_feedback_data(args.files)
+                if not comment_col or not response_col:
+                    raise MissingColumnsError("Required columns not found in Excel file(s)")
+                index = load_id_index(args.files)
+            for feedback_id in args.ids or index.ids:
+                result = select_requester_rows(df, index, [feedback_id])
+                if result.empty:
+                    print(f"No feedback found for ID: {feedback_id}\n")
+                    continue
+                main_text, _, _, _, _ = process_feedback(
+                    feedback_id,
+                    result[comment_col].tolist(),
+                    result[response_col].tolist(),
+                    result['Feedback Dimensions & Questions'].tolist(),
+                    result['Rank feedback provider'].tolist(),
+                )
+                print(f"ID: {feedback_id}\n{main_text}")
+    except MissingColumnsError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    print(f"Processing Time: {time.time() - start_time:.2f} sec | Files Processed: {len(args.files)}")
+    if args.profile:
+        print(profiler.format_breakdown())
+    if args.profile_out:
+        with open(args.profile_out, "w", encoding="utf-8") as f:
+            f.write(profiler.to_prometheus() if args.profile_out.endswith(".prom") else profiler.to_json())
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import numpy as np
+
+# Entries formatted per page of the detailed view
+DETAIL_PAGE_SIZE = 100
+
+
+class FeedbackDetails:
+    """Row-by-row breakdown of one requester's feedback, formatted a page at a time.
+
+    Only the row positions matching the current filter are kept; an entry's
+    text is formatted when its page is shown, so the whole breakdown is
+    never built as one string.
+    """
+
+    def __init__(self, feedback_id, comments, responses, questions, ranks):
+        import pandas as pd
+        self.feedback_id = feedback_id
+        self.comments = pd.Series(comments, dtype=object).fillna('').astype(str)
+        self.responses = pd.Series(responses, dtype=object).fillna('').astype(str)
+        self.questions = np.asarray(questions, dtype=object)
+        self.ranks = np.asarray(ranks, dtype=object)
+        self._comment_present = (self.comments.str.strip() != '').to_numpy()
+        self._response_present = (self.responses.str.strip() != '').to_numpy()
+        # Rows with neither a comment nor a response are not listed
+        self.entries = np.flatnonzero(self._comment_present | self._response_present)
+        self.rows = self.entries
+
+    def __len__(self):
+        return len(self.rows)
+
+    def header(self):
+        return f"Detailed Breakdown for ID: {self.feedback_id}\n"
+
+    @staticmethod
+    def _choices(values):
+        import pandas as pd
+        return sorted({str(value) for value in pd.unique(values) if not pd.isna(value)})
+
+    def rank_choices(self):
+        """Distinct ranks of the listed rows, for a filter menu."""
+        return self._choices(self.ranks[self.entries])
+
+    def question_choices(self):
+        """Distinct questions of the listed rows, for a filter menu."""
+        return self._choices(self.questions[self.entries])
+
+    def filter(self, rank=None, question=None, search=None):
+        """Keep the entries matching every given filter; returns how many match.
+
+        rank and question compare against the menu values from rank_choices and
+        question_choices; search is a case-insensitive substring of the
+        comment or response.
+        """
+        import pandas as pd
+        rows = self.entries
+        if rank is not None:
+            rows = rows[(pd.Series(self.ranks[rows]).astype(str) == rank).to_numpy()]
+        if question is not None:
+            rows = rows[(pd.Series(self.questions[rows]).astype(str) == question).to_numpy()]
+        if search:
+            in_comment = self.comments.iloc[rows].str.contains(search, case=False, regex=False).to_numpy()
+            in_response = self.responses.iloc[rows].str.contains(search, case=False, regex=False).to_numpy()
+            rows = rows[in_comment | in_response]
+        self.rows = rows
+        return len(rows)
+
+    def entry(self, row):
+        """Text of one listed row."""
+        text = f"[Rank: {self.ranks[row]}]\n"
+        if self._comment_present[row]:
+            text += f"Comment: {self.comments.iat[row]}\n"
+        if self._response_present[row]:
+            text += f"Response: {self.responses.iat[row]}\n"
+        return text + "---\n"
+
+    def page(self, start, size=DETAIL_PAGE_SIZE):
+        """Text of the filtered entries start to start + size."""
+        return "".join(self.entry(row) for row in self.rows[start:start + size])
@@ -0,0 +1,208 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """Document vectors of analyzed texts in a memory-mapped file, with a row table per source file.
+
+    Each distinct text is embedded once: its vector is appended to
+    vectors.f32 and its sentiment, word count and tokens (lowercase form,
+    lemma, whether it counts as a word) go to SQLite, so category scores can
+    be recomputed for a new taxonomy without running spaCy again. The rows
+    table maps every row of an indexed file to its requester ID and text
+    position (-1 for rows without text). Stores are per spaCy model, since
+    vectors of different models are not comparable.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._vectors = None
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(self.directory, exist_ok=True)
+            self._conn = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), check_same_thread=False)
+            self._pid = os.getpid()
+            self._vectors = None
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS texts ("
+                "key TEXT PRIMARY KEY, position INTEGER NOT NULL UNIQUE, text TEXT NOT NULL, "
+                "sentiment REAL NOT NULL, words INTEGER NOT NULL, tokens TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "file_hash TEXT PRIMARY KEY, path TEXT NOT NULL, rows INTEGER NOT NULL, added_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS rows ("
+                "file_hash TEXT NOT NULL, row INTEGER NOT NULL, requester_id TEXT, position INTEGER NOT NULL, "
+                "PRIMARY KEY (file_hash, row))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS rows_position ON rows(position)")
+        return self._conn
+
+    def __len__(self):
+        with self._lock:
+            (count,) = self._connection().execute("SELECT COUNT(*) FROM texts").fetchone()
+        return count
+
+    def dim(self):
+        with self._lock:
+            row = self._connection().execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+        return int(row[0]) if row else None
+
+    def positions(self, keys):
+        """{key: position} of the stored text keys."""
+        found = {}
+        keys = list(dict.fromkeys(keys))
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT key, position FROM texts WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                )
+                found.update(rows)
+        return found
+
+    def add_texts(self, items):
+        """Append (key, text, vector, sentiment, words, tokens) items; returns {key: position}.
+
+        The vectors are written before the rows that point at them, so an
+        interrupted write leaves at most unused bytes at the end of the file.
+        """
+        items = list(items)
+        if not items:
+            return {}
+        vectors = np.asarray([item[2] for item in items], dtype=np.float32)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute("SELECT value FROM meta WHERE name = 'dim'").fetchone()
+            if row is not None and int(row[0]) != vectors.shape[1]:
+                raise ValueError(f"Vectors have {vectors.shape[1]} dimensions, the store has {row[0]}")
+            (count,) = conn.execute("SELECT COUNT(*) FROM texts").fetchone()
+
+            with open(self.vectors_path, "ab") as f:
+                f.truncate(count * vectors.shape[1] * 4)
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            positions = {}
+            rows = []
+            for offset, (key, text, _, sentiment, words, tokens) in enumerate(items):
+                positions[key] = count + offset
+                rows.append((key, count + offset, text, float(sentiment), int(words), json.dumps(tokens, ensure_ascii=False)))
+            with conn:
+                conn.execute("INSERT OR IGNORE INTO meta VALUES ('dim', ?)", (str(vectors.shape[1]),))
+                conn.executemany("INSERT INTO texts VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._vectors = None
+        return positions
+
+    def has_file(self, file_hash):
+        with self._lock:
+            row = self._connection().execute("SELECT 1 FROM files WHERE file_hash = ?", (file_hash,)).fetchone()
+        return row is not None
+
+    def add_file(self, file_hash, path, requester_ids, positions):
+        """Record the requester ID and text position of every row of a file."""
+        rows = [
+            (file_hash, row, None if requester_id is None else str(requester_id), int(position))
+            for row, (requester_id, position) in enumerate(zip(requester_ids, positions))
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM rows WHERE file_hash = ?", (file_hash,))
+                conn.executemany("INSERT INTO rows VALUES (?, ?, ?, ?)", rows)
+                conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)", (file_hash, path, len(rows), time.time()))
+
+    def file_rows(self, file_hash):
+        """(requester_ids, positions) of a file's rows, in row order."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT requester_id, position FROM rows WHERE file_hash = ? ORDER BY row", (file_hash,)
+            ).fetchall()
+        requester_ids = np.array([requester_id for requester_id, _ in rows], dtype=object)
+        return requester_ids, np.array([position for _, position in rows], dtype=np.int64)
+
+    def vectors(self):
+        """Read-only memory map of all stored vectors (texts x dimensions)."""
+        count = len(self)
+        dim = self.dim()
+        with self._lock:
+            if self._vectors is None or len(self._vectors) != count:
+                if count == 0:
+                    self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+                else:
+                    self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, dim))
+            return self._vectors
+
+    def _column(self, column, positions):
+        positions = [int(position) for position in positions]
+        values = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(positions), 500):
+                chunk = positions[start:start + 500]
+                values.update(conn.execute(
+                    f"SELECT position, {column} FROM texts WHERE position IN ({','.join('?' * len(chunk))})", chunk
+                ))
+        return [values[position] for position in positions]
+
+    def texts(self, positions):
+        return self._column("text", positions)
+
+    def sentiments(self, positions):
+        return np.array(self._column("sentiment", positions), dtype=np.float64)
+
+    def tokens(self, positions):
+        """[(lowercase form, lemma, is word), ...] of each position's text."""
+        return [json.loads(tokens) for tokens in self._column("tokens", positions)]
+
+    def requester_ids(self, positions):
+        """{position: sorted requester IDs whose rows have that text}."""
+        positions = [int(position) for position in positions]
+        found = {position: set() for position in positions}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(positions), 500):
+                chunk = positions[start:start + 500]
+                for position, requester_id in conn.execute(
+                    f"SELECT position, requester_id FROM rows WHERE position IN ({','.join('?' * len(chunk))})", chunk
+                ):
+                    if requester_id is not None:
+                        found[position].add(requester_id)
+        return {position: sorted(ids) for position, ids in found.items()}
+
+    def nearest(self, vector, k=10, positions=None):
+        """[(position, cosine similarity)] of the k stored texts most similar to vector.
+
+        positions restricts the search, e.g. to the texts of some files.
+        """
+        vectors = self.vectors()
+        if positions is None:
+            positions = np.arange(len(vectors))
+        positions = np.asarray(positions, dtype=np.int64)
+        vector = np.asarray(vector, dtype=np.float32)
+        query_norm = np.linalg.norm(vector)
+        if len(positions) == 0 or query_norm == 0:
+            return []
+        candidates = vectors[positions]
+        norms = np.linalg.norm(candidates, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            similarities = (candidates @ vector) / (norms * query_norm)
+        similarities = np.where(norms > 0, similarities, 0.0)
+        top = np.argsort(-similarities, kind="stable")[:k]
+        return [(int(positions[i]), float(similarities[i])) for i in top]
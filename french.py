@@ -0,0 +1,124 @@
+import json
+import os
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+from similarity import cosine_similarity_matrix
+
+# spaCy model for scoring French texts without translating them
+FRENCH_SPACY_MODEL = "fr_core_news_md"
+
+# TextBlob's factor for a negated word, reused so both paths treat negation alike
+NEGATION_FACTOR = -0.5
+
+# Tokens before a lexicon word searched for a negation
+NEGATION_WINDOW = 3
+
+
+def load_lexicon(path):
+    """{'words', 'negations', 'intensifiers'} of a French sentiment lexicon JSON file."""
+    with open(path, encoding="utf-8") as f:
+        lexicon = json.load(f)
+    return {
+        "words": {word.lower(): float(polarity) for word, polarity in lexicon["words"].items()},
+        "negations": frozenset(word.lower() for word in lexicon.get("negations", [])),
+        "intensifiers": {word.lower(): float(factor) for word, factor in lexicon.get("intensifiers", {}).items()},
+    }
+
+
+def load_calibration(path, categories):
+    """Linear maps from French scores to the English path's scale, identity if path does not exist.
+
+    Returns {'sentiment': (slope, intercept), 'categories': {category: (slope, intercept)}}.
+    """
+    calibration = {"sentiment": (1.0, 0.0), "categories": {category: (1.0, 0.0) for category in categories}}
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            stored = json.load(f)
+        calibration["sentiment"] = tuple(stored["sentiment"])
+        for category, line in stored.get("categories", {}).items():
+            if category in calibration["categories"]:
+                calibration["categories"][category] = tuple(line)
+    return calibration
+
+
+def fit_line(x, y):
+    """(slope, intercept) of the least-squares line mapping x to y.
+
+    When x does not vary, or the fit would flatten or invert the scores,
+    only the mean offset is corrected.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(x) == 0:
+        return 1.0, 0.0
+    if len(x) >= 2 and np.ptp(x) > 0:
+        slope, intercept = np.polyfit(x, y, 1)
+        if slope > 0:
+            return float(slope), float(intercept)
+    return 1.0, float(np.mean(y - x))
+
+
+class FrenchScorer:
+    """Sentiment and category scores of French texts in French, with no translation.
+
+    Mirrors the English path: the category score is half the cosine
+    similarity of the text's vector with the category label's vector, both
+    from the French model, and half the share of words matching the French
+    keywords. Sentiment averages lexicon polarities TextBlob-style, with
+    intensifiers and negation. A calibration fitted on translated texts
+    (see Code.calibrate_french_scoring) maps both onto the English scale.
+    """
+
+    # Part of the analysis version: bump when the scoring changes
+    VERSION = 2
+
+    def __init__(self, nlp, category_labels, category_keywords, lexicon, calibration=None):
+        self.nlp = nlp
+        self.categories = list(category_labels)
+        self.lexicon = lexicon
+        self.calibration = calibration or load_calibration(None, self.categories)
+        self.label_vectors = np.array([nlp(label).vector for label in category_labels.values()], dtype=np.float32)
+        self.matcher = KeywordMatcher(nlp, {category: category_keywords.get(category, []) for category in self.categories})
+
+    def sentiment(self, doc):
+        """Mean polarity of the doc's lexicon words in [-1, 1]; 0 when it has none."""
+        words = self.lexicon["words"]
+        intensifiers = self.lexicon["intensifiers"]
+        polarities = []
+        for token in doc:
+            polarity = words.get(token.lemma_.lower(), words.get(token.lower_))
+            if polarity is None:
+                continue
+            if token.i > 0 and doc[token.i - 1].lower_ in intensifiers:
+                polarity = max(-1.0, min(1.0, polarity * intensifiers[doc[token.i - 1].lower_]))
+            window = doc[max(token.i - NEGATION_WINDOW, 0):token.i]
+            if any(previous.lower_ in self.lexicon["negations"] for previous in window):
+                polarity *= NEGATION_FACTOR
+            polarities.append(polarity)
+        return sum(polarities) / len(polarities) if polarities else 0.0
+
+    def raw_scores(self, texts, batch_size=256):
+        """Uncalibrated (sentiment, [category scores]) of every text."""
+        docs = list(self.nlp.pipe(texts, batch_size=batch_size))
+        vectors = np.array([doc.vector for doc in docs], dtype=np.float32).reshape(len(docs), -1)
+        similarities = cosine_similarity_matrix(vectors, self.label_vectors)
+        results = []
+        for row, doc in enumerate(docs):
+            counts, words = self.matcher.counts(doc)
+            shares = counts / words if words > 0 else np.zeros(len(self.categories))
+            results.append((self.sentiment(doc), (0.5 * similarities[row] + 0.5 * shares).tolist()))
+        return results
+
+    def score_texts(self, texts):
+        """Calibrated (sentiment, {category: score}) of every text."""
+        slope, intercept = self.calibration["sentiment"]
+        lines = [self.calibration["categories"][category] for category in self.categories]
+        results = []
+        for sentiment, scores in self.raw_scores(texts):
+            results.append((
+                max(-1.0, min(1.0, slope * sentiment + intercept)),
+                {category: a * score + b for category, score, (a, b) in zip(self.categories, scores, lines)},
+            ))
+        return results
@@ -0,0 +1,671 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import os
+import time
+import queue
+import threading
+import charts
+from charts import COLORS
+from details import DETAIL_PAGE_SIZE, FeedbackDetails
+from Code import (
+    FRENCH_MODE,
+    AnalysisCancelled,
+    MissingColumnsError,
+    analyze_all_ids,
+    analyze_all_ids_streaming,
+    categories,
+    improvement_series,
+    load_feedback_data,
+    load_id_index,
+    process_feedback,
+    profiler,
+    select_requester_rows,
+    set_french_mode,
+    stream_requester_rows,
+    write_results,
+)
+
+# FEEDBACK_SERVICE (http://host:port or unix:/path) sends analyses to a shared `Code.py serve` process
+analysis_client = None
+if os.environ.get("FEEDBACK_SERVICE"):
+    from service import AnalysisClient
+    analysis_client = AnalysisClient(os.environ["FEEDBACK_SERVICE"])
+
+# Workbooks and CSV exports are both accepted
+FEEDBACK_FILETYPES = [("Feedback Files", "*.xlsx *.csv"), ("Excel Files", "*.xlsx"), ("CSV Files", "*.csv")]
+
+
+def save_chart_image(render, default_name):
+    """Ask for a PNG or SVG path and write the chart rendered off-screen by render(fmt)."""
+    path = filedialog.asksaveasfilename(
+        defaultextension=".png", initialfile=default_name,
+        filetypes=[("PNG Image", "*.png"), ("SVG Image", "*.svg")]
+    )
+    if not path:
+        return
+    fmt = "svg" if path.lower().endswith(".svg") else "png"
+    try:
+        with open(path, "wb") as f:
+            f.write(render(fmt))
+    except Exception as e:
+        messagebox.showerror("Error", f"Failed to save chart: {str(e)}")
+
+def embed_figure(window, frame, fig):
+    """Draw a charts.py figure in a Tk frame; the figure is released with the window."""
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    canvas = FigureCanvasTkAgg(fig, master=frame)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill='both', expand=True)
+    window.bind('<Destroy>', lambda event: event.widget is window and fig.clear(), add='+')
+
+def show_chart_window(similarity_scores, feedback_id=None):
+    chart_window = tk.Toplevel()
+    chart_window.title("Feedback Analysis Charts")
+    chart_window.geometry("1000x600")
+    chart_window.configure(bg=COLORS['background'])
+
+    chart_frame = tk.Frame(chart_window, bg=COLORS['card'], bd=2, relief='groove')
+    chart_frame.pack(fill='both', expand=True, padx=20, pady=20)
+
+    if similarity_scores:
+        ModernButton(
+            chart_window, text="Save Chart...",
+            command=lambda: save_chart_image(
+                lambda fmt: charts.category_chart(similarity_scores, categories, fmt),
+                f"{feedback_id or 'feedback'}_categories.png"
+            )
+        ).pack(pady=(0, 10))
+        embed_figure(chart_window, chart_frame, charts.category_figure(similarity_scores, categories))
+    else:
+        tk.Label(chart_frame, text="No data available to display chart.",
+                 bg=COLORS['card'], fg=COLORS['text'], font=('Segoe UI', 10)).pack(pady=20)
+
+def show_improvement_chart(file_paths, feedback_id):
+    """Show a chart comparing skill improvement across multiple files.
+
+    Each file's aggregates come from the period store, so only files that
+    were never analyzed before are read and scored.
+    """
+    if len(file_paths) < 2:
+        messagebox.showwarning("Improvement Analysis", "Please select at least 2 files to compare improvement.")
+        return
+    if current_task is not None:
+        messagebox.showinfo("Improvement Analysis", "Wait for the running analysis to finish or cancel it first.")
+        return
+
+    processing_time_label.config(text="Building improvement series... Please wait.")
+
+    def task(progress):
+        if analysis_client is not None:
+            return analysis_client.improvement_series(file_paths, feedback_id, progress=progress)
+        return improvement_series(file_paths, feedback_id, progress=progress)
+
+    def show_chart(all_results):
+        processing_time_label.config(text="Ready")
+        if len(all_results) < 2:
+            messagebox.showwarning(
+                "Improvement Analysis",
+                "Not enough data points to show improvement.\n(Files with identical contents count as one period.)"
+            )
+            return
+
+        try:
+            # Create improvement chart
+            chart_window = tk.Toplevel()
+            chart_window.title(f"Skill Improvement Analysis for ID: {feedback_id}")
+            chart_window.geometry("1200x700")
+            chart_window.configure(bg=COLORS['background'])
+
+            chart_frame = tk.Frame(chart_window, bg=COLORS['card'], bd=2, relief='groove')
+            chart_frame.pack(fill='both', expand=True, padx=20, pady=20)
+            embed_figure(chart_window, chart_frame, charts.improvement_figure(all_results, categories, feedback_id))
+
+            # Add improvement percentages
+            info_frame = tk.Frame(chart_window, bg=COLORS['background'])
+            info_frame.pack(fill='x', padx=20, pady=(0, 20))
+            tk.Label(info_frame, text=charts.improvement_text(all_results, categories), bg=COLORS['background'],
+                    fg=COLORS['text'], font=('Segoe UI', 10), justify='left').pack(side='left')
+            ModernButton(
+                info_frame, text="Save Chart...",
+                command=lambda: save_chart_image(
+                    lambda fmt: charts.improvement_chart(all_results, categories, feedback_id, fmt),
+                    f"{feedback_id}_improvement.png"
+                )
+            ).pack(side='right')
+
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to create improvement chart: {str(e)}")
+
+    run_in_background(task, show_chart)
+
+# The running background task: its message queue and cancel event, or None when idle
+current_task = None
+
+def run_in_background(task, on_success):
+    """Run task(progress) on a worker thread and call on_success(result) on the Tk thread.
+
+    One task runs at a time; each has its own message queue and cancel event.
+    """
+    global current_task
+    if current_task is not None:
+        return
+    messages = queue.Queue()
+    cancel_event = threading.Event()
+    current_task = (messages, cancel_event)
+
+    def progress(done, total, stage="rows"):
+        if cancel_event.is_set():
+            raise AnalysisCancelled()
+        messages.put(("progress", done, total, stage))
+
+    def worker():
+        try:
+            result = task(progress)
+        except AnalysisCancelled:
+            messages.put(("cancelled",))
+        except Exception as e:
+            messages.put(("error", e))
+        else:
+            messages.put(("done", result))
+
+    set_busy(True)
+    threading.Thread(target=worker, daemon=True).start()
+    root.after(100, poll_background_task, messages, on_success, {})
+
+def poll_background_task(messages, on_success, stage_started):
+    """Apply queued progress messages; reschedules itself until the task ends."""
+    global current_task
+    while True:
+        try:
+            message = messages.get_nowait()
+        except queue.Empty:
+            break
+
+        kind = message[0]
+        if kind == "progress":
+            done, total, stage = message[1:]
+            progress_bar.config(maximum=max(total, 1), value=done)
+            if stage == "reading":
+                processing_time_label.config(text=f"Reading files: {done}/{total}")
+                continue
+            # Rates and ETAs count from the start of the stage
+            elapsed = max(time.time() - stage_started.setdefault(stage, time.time()), 1e-6)
+            rate = done / elapsed
+            eta = (total - done) / rate if rate > 0 else 0
+            unit = "texts" if stage == "translating" else "rows"
+            label = "Translating" if stage == "translating" else "Analyzing"
+            processing_time_label.config(
+                text=f"{label}: {done}/{total} {unit} | {rate:.0f} {unit}/sec | ETA: {eta:.0f} sec"
+            )
+            continue
+
+        current_task = None
+        set_busy(False)
+        if kind == "done":
+            on_success(message[1])
+        elif kind == "cancelled":
+            processing_time_label.config(text="Analysis cancelled | Ready")
+        elif isinstance(message[1], MissingColumnsError):
+            messagebox.showwarning("Column Error", str(message[1]))
+            processing_time_label.config(text="Ready")
+        else:
+            messagebox.showerror("Error", f"An error occurred: {str(message[1])}")
+            processing_time_label.config(text="Ready")
+        return
+
+    root.after(100, poll_background_task, messages, on_success, stage_started)
+
+def set_busy(busy):
+    """Toggle the buttons and progress bar while a background analysis runs."""
+    analyze_btn.config(state='disabled' if busy else 'normal')
+    analyze_all_btn.config(state='disabled' if busy else 'normal')
+    cancel_btn.config(state='normal' if busy else 'disabled')
+    progress_bar.config(value=0)
+
+def cancel_analysis():
+    if current_task is None:
+        return
+    current_task[1].set()
+    processing_time_label.config(text="Cancelling...")
+
+def load_required_feedback_data(file_paths, progress=None):
+    df_combined, comment_col, response_col = load_feedback_data(file_paths, progress)
+    if not comment_col or not response_col:
+        raise MissingColumnsError("Required columns not found in the selected file(s)")
+    return df_combined, comment_col, response_col
+
+def analyze_feedback():
+    # Ask user to select one or more files
+    file_paths = filedialog.askopenfilenames(
+        title="Select Feedback File(s)",
+        filetypes=FEEDBACK_FILETYPES
+    )
+
+    if not file_paths:
+        messagebox.showwarning("File Error", "No file(s) selected.")
+        return
+
+    run_feedback_analysis(tuple(file_paths))
+
+def analyze_loaded_feedback(event=None):
+    """Analyze the typed ID in the workbooks already loaded, without asking for files again."""
+    if loaded_dataset is None:
+        analyze_feedback()
+    elif str(analyze_btn['state']) != 'disabled':
+        run_feedback_analysis(loaded_dataset['file_paths'], reuse_loaded=True)
+
+def run_feedback_analysis(file_paths, reuse_loaded=False):
+    feedback_id = id_entry.get().strip()
+    if not feedback_id:
+        messagebox.showwarning("Input Error", "Please provide a Feedback ID.")
+        return
+
+    if not feedback_id.isdigit():
+        messagebox.showwarning("Input Error", "Feedback ID must be a number.")
+        return
+
+    feedback_id = int(feedback_id)
+    low_memory = low_memory_var.get()
+    set_french_mode("native" if french_native_var.get() else "translate")
+    start_time = time.time()
+
+    # Show loading status
+    processing_time_label.config(text="Processing feedback... Please wait.")
+
+    def task(progress):
+        profiler.reset()
+        if analysis_client is not None:
+            # The service holds the models and workbooks; only this ID's results come back
+            dataset = {'file_paths': file_paths, 'index': None}
+            result = analysis_client.analyze(file_paths, [feedback_id], details=True, progress=progress)[0]
+            if not result['rows']:
+                return dataset, f"No feedback found for ID: {feedback_id}", None, None
+            details = FeedbackDetails(feedback_id, **result['details']) if result['scores'] else None
+            return dataset, result['main_text'], details, result['scores']
+
+        if low_memory:
+            # Stream only this ID's rows; the files are never held in memory
+            result, comment_col, response_col = stream_requester_rows(file_paths, [feedback_id], progress=progress)
+            dataset = {'file_paths': file_paths, 'index': None}
+        else:
+            dataset = loaded_dataset if reuse_loaded and loaded_dataset['index'] is not None else None
+            if dataset is None:
+                df_combined, comment_col, response_col = load_required_feedback_data(file_paths, progress)
+                dataset = {
+                    'file_paths': file_paths,
+                    'df': df_combined,
+                    'comment_col': comment_col,
+                    'response_col': response_col,
+                    'index': load_id_index(file_paths),
+                }
+
+            # Rows of this ID from the requester index
+            result = select_requester_rows(dataset['df'], dataset['index'], [feedback_id])
+            comment_col, response_col = dataset['comment_col'], dataset['response_col']
+
+        if result.empty:
+            return dataset, f"No feedback found for ID: {feedback_id}", None, None
+
+        comments = result[comment_col].tolist()
+        responses = result[response_col].tolist()
+        questions = result['Feedback Dimensions & Questions'].tolist()
+        ranks = result['Rank feedback provider'].tolist()
+
+        main_text, details, similarity_scores, _, _ = process_feedback(
+            feedback_id, comments, responses, questions, ranks, progress=progress
+        )
+        return dataset, main_text, details, similarity_scores
+
+    def show_results(result):
+        global loaded_dataset
+        loaded_dataset, main_text, details, similarity_scores = result
+        update_id_lookup()
+        elapsed_time = time.time() - start_time
+        main_text += f"\nProcessing Time: {elapsed_time:.2f} sec"
+        main_text += f"\nFiles Processed: {len(file_paths)}"
+        if profiler.enabled:
+            main_text += "\n\n" + profiler.format_breakdown()
+
+        # Update GUI
+        main_score_text_widget.delete(1.0, tk.END)
+        main_score_text_widget.insert(tk.END, main_text)
+        show_details(details)
+
+        # Update charts
+        for widget in chart_card.winfo_children():
+            widget.destroy()
+
+        if similarity_scores:
+            chart_button = ModernButton(chart_card, text="View Full-Screen Chart", command=lambda: show_chart_window(similarity_scores, feedback_id))
+            chart_button.pack(pady=10)
+
+            # Add improvement analysis button if multiple files selected
+            if len(file_paths) >= 2:
+                improvement_btn = ModernButton(
+                    chart_card,
+                    text="View Skill Improvement Over Time",
+                    command=lambda: show_improvement_chart(file_paths, feedback_id)
+                )
+                improvement_btn.pack(pady=10)
+        else:
+            tk.Label(chart_card, text="No chart data available.", bg=COLORS['card'], fg=COLORS['text']).pack()
+
+        processing_time_label.config(text=f"Processed {len(file_paths)} file(s) | Processing Time: {elapsed_time:.2f} sec | Ready")
+
+    run_in_background(task, show_results)
+
+# Workbooks, combined data and requester index of the last ID analysis
+loaded_dataset = None
+
+def update_id_lookup(event=None):
+    """Suggest loaded IDs starting with the typed text and list the files containing it."""
+    if loaded_dataset is None or loaded_dataset['index'] is None:
+        return
+    index = loaded_dataset['index']
+    typed = id_entry.get().strip()
+    id_entry.config(values=index.complete(typed) if typed else [])
+    periods = index.periods(typed) if typed in index else []
+    if periods:
+        periods_label.config(text="In: " + ", ".join(
+            f"{os.path.basename(path)} ({count} rows)" for path, count in periods
+        ))
+    else:
+        periods_label.config(text="Not in loaded files" if typed else "")
+
+# Filter menu entry that matches every rank or question
+ALL_FILTER = "All"
+
+# Breakdown in the detailed view, and how many of its filtered entries are in the widget
+current_details = None
+details_shown = 0
+detail_page_pending = False
+search_after_id = None
+
+def show_details(details):
+    """Show a FeedbackDetails breakdown, or clear the view when there is none."""
+    global current_details
+    current_details = details
+    rank_filter.config(values=[ALL_FILTER] + (details.rank_choices() if details else []))
+    question_filter.config(values=[ALL_FILTER] + (details.question_choices() if details else []))
+    rank_filter.set(ALL_FILTER)
+    question_filter.set(ALL_FILTER)
+    search_var.set("")
+    apply_detail_filter()
+
+def apply_detail_filter(event=None):
+    """Filter the breakdown by the selected rank, question and search text and show its first page."""
+    global details_shown
+    detailed_text_widget.delete(1.0, tk.END)
+    details_shown = 0
+    if current_details is None:
+        detail_count_label.config(text="")
+        return
+
+    rank = rank_filter.get()
+    question = question_filter.get()
+    count = current_details.filter(
+        rank=None if rank == ALL_FILTER else rank,
+        question=None if question == ALL_FILTER else question,
+        search=search_var.get().strip() or None,
+    )
+    detail_count_label.config(text=f"{count} of {len(current_details.entries)} entries")
+    detailed_text_widget.insert(tk.END, current_details.header())
+    load_detail_page()
+
+def schedule_detail_search(event=None):
+    """Filter by the search text once typing pauses."""
+    global search_after_id
+    if search_after_id is not None:
+        root.after_cancel(search_after_id)
+    search_after_id = root.after(300, run_detail_search)
+
+def run_detail_search():
+    global search_after_id
+    search_after_id = None
+    apply_detail_filter()
+
+def load_detail_page():
+    """Append the next page of filtered entries and highlight the search text in it."""
+    global details_shown, detail_page_pending
+    detail_page_pending = False
+    if current_details is None or details_shown >= len(current_details):
+        return
+    start = detailed_text_widget.index('end-1c')
+    detailed_text_widget.insert(tk.END, current_details.page(details_shown, DETAIL_PAGE_SIZE))
+    details_shown += DETAIL_PAGE_SIZE
+
+    search = search_var.get().strip()
+    if search:
+        length = tk.IntVar()
+        index = detailed_text_widget.search(search, start, stopindex=tk.END, nocase=True, count=length)
+        while index and length.get():
+            end = f"{index}+{length.get()}c"
+            detailed_text_widget.tag_add('match', index, end)
+            index = detailed_text_widget.search(search, end, stopindex=tk.END, nocase=True, count=length)
+
+def on_detail_scroll(first, last):
+    """Scrollbar callback of the detailed view; loads another page near the bottom."""
+    global detail_page_pending
+    detail_scrollbar.set(first, last)
+    if float(last) > 0.9 and not detail_page_pending and current_details is not None \
+            and details_shown < len(current_details):
+        detail_page_pending = True
+        detailed_text_widget.after_idle(load_detail_page)
+
+def analyze_all_feedback():
+    """Batch mode: analyze every Feedback Requester User ID and save one results table."""
+    file_paths = filedialog.askopenfilenames(
+        title="Select Feedback File(s)",
+        filetypes=FEEDBACK_FILETYPES
+    )
+    if not file_paths:
+        messagebox.showwarning("File Error", "No file(s) selected.")
+        return
+
+    out_path = filedialog.asksaveasfilename(
+        title="Save Results As",
+        defaultextension=".csv",
+        filetypes=[("CSV Files", "*.csv"), ("Parquet Files", "*.parquet")]
+    )
+    if not out_path:
+        return
+
+    low_memory = low_memory_var.get()
+    set_french_mode("native" if french_native_var.get() else "translate")
+    start_time = time.time()
+    processing_time_label.config(text="Processing all feedback IDs... Please wait.")
+
+    def task(progress):
+        profiler.reset()
+        if analysis_client is not None:
+            # The service only reads files; the table is written here
+            results = analysis_client.analyze_batch(file_paths, progress=progress)
+            write_results(results, out_path)
+            return len(results)
+        if low_memory:
+            results = analyze_all_ids_streaming(file_paths, progress=progress)
+        else:
+            df_combined, comment_col, response_col = load_required_feedback_data(file_paths, progress)
+            results = analyze_all_ids(df_combined, comment_col, response_col, progress=progress)
+        write_results(results, out_path)
+        return len(results)
+
+    def show_results(id_count):
+        elapsed_time = time.time() - start_time
+        processing_time_label.config(
+            text=f"Analyzed {id_count} ID(s) from {len(file_paths)} file(s) | Processing Time: {elapsed_time:.2f} sec | Ready"
+        )
+        messagebox.showinfo("Batch Analysis", f"Results for {id_count} ID(s) saved to:\n{out_path}")
+
+    run_in_background(task, show_results)
+
+def create_modern_gui():
+    global root
+    root = tk.Tk()
+    root.title("Feedback Analysis Dashboard")
+    root.geometry("1400x800")
+    root.configure(bg=COLORS['background'])
+
+    global id_entry, periods_label, main_score_text_widget, detailed_text_widget, chart_card, processing_time_label
+    global rank_filter, question_filter, search_var, detail_count_label, detail_scrollbar
+    global analyze_btn, analyze_all_btn, cancel_btn, progress_bar, low_memory_var, french_native_var
+
+    # Header
+    header = tk.Frame(root, bg=COLORS['primary'], height=60)
+    header.pack(fill='x')
+    title_font = ("Segoe UI", 16, "bold")
+    tk.Label(header, text="Feedback Analysis Dashboard", bg=COLORS['primary'], fg='white', font=title_font).pack(side='left', padx=20)
+
+    # Input panel
+    input_card = tk.Frame(root, bg=COLORS['card'], padx=20, pady=15, highlightbackground=COLORS['border'], highlightthickness=1)
+    input_card.pack(fill='x', padx=20, pady=20)
+
+    id_frame = tk.Frame(input_card, bg=COLORS['card'])
+    id_frame.pack(side='left', padx=10, fill='x', expand=True)
+    tk.Label(id_frame, text="Feedback ID:", bg=COLORS['card'], fg=COLORS['text']).pack(side='left', padx=5)
+    # Suggests IDs from the loaded workbooks; Enter analyzes them again without a file dialog
+    id_entry = ttk.Combobox(id_frame, width=20, font=('Segoe UI', 10))
+    id_entry.pack(side='left', padx=5, fill='x', expand=True)
+    id_entry.bind('<KeyRelease>', update_id_lookup)
+    id_entry.bind('<<ComboboxSelected>>', update_id_lookup)
+    id_entry.bind('<Return>', analyze_loaded_feedback)
+    periods_label = tk.Label(id_frame, text="", bg=COLORS['card'], fg=COLORS['text'], font=('Segoe UI', 9))
+    periods_label.pack(side='left', padx=5)
+
+    analyze_btn = ModernButton(input_card, text="Select Files and Analyze", command=analyze_feedback)
+    analyze_btn.pack(side='right', padx=10)
+
+    analyze_all_btn = ModernButton(input_card, text="Analyze All IDs", command=analyze_all_feedback)
+    analyze_all_btn.pack(side='right', padx=10)
+
+    cancel_btn = ModernButton(input_card, text="Cancel", command=cancel_analysis)
+    cancel_btn.config(state='disabled')
+    cancel_btn.pack(side='right', padx=10)
+
+    # Reads the files in chunks instead of loading them whole, for very large exports
+    low_memory_var = tk.BooleanVar(value=False)
+    # Scores French comments with the French model instead of translating them (no network)
+    french_native_var = tk.BooleanVar(value=FRENCH_MODE == "native")
+    tk.Checkbutton(input_card, text="Score French offline", variable=french_native_var,
+                   bg=COLORS['card'], fg=COLORS['text'], activebackground=COLORS['card']).pack(side='right', padx=10)
+    tk.Checkbutton(input_card, text="Low-memory mode", variable=low_memory_var,
+                   bg=COLORS['card'], fg=COLORS['text'], activebackground=COLORS['card']).pack(side='right', padx=10)
+
+    results_card = tk.Frame(root, bg=COLORS['background'])
+    results_card.pack(fill='both', expand=True, padx=20, pady=(0, 20))
+
+    summary_card = tk.Frame(results_card, bg=COLORS['card'], padx=10, pady=10, highlightbackground=COLORS['border'], highlightthickness=1)
+    summary_card.pack(side='left', fill='both', expand=True, padx=(0, 10))
+    tk.Label(summary_card, text="Summary", bg=COLORS['card'], fg=COLORS['primary'], font=("Segoe UI", 12, "bold")).pack(anchor='w')
+    main_score_text_widget = tk.Text(summary_card, wrap='word', bg=COLORS['card'], fg=COLORS['text'], font=("Segoe UI", 10))
+    main_score_text_widget.pack(fill='both', expand=True)
+
+    detailed_card = tk.Frame(results_card, bg=COLORS['card'], padx=10, pady=10, highlightbackground=COLORS['border'], highlightthickness=1)
+    detailed_card.pack(side='right', fill='both', expand=True, padx=(10, 0))
+    tk.Label(detailed_card, text="Detailed Feedback", bg=COLORS['card'], fg=COLORS['primary'], font=("Segoe UI", 12, "bold")).pack(anchor='w')
+
+    # Filters over the breakdown; entries are loaded into the text a page at a time while scrolling
+    filter_frame = tk.Frame(detailed_card, bg=COLORS['card'])
+    filter_frame.pack(fill='x', pady=(5, 5))
+    tk.Label(filter_frame, text="Rank:", bg=COLORS['card'], fg=COLORS['text']).pack(side='left')
+    rank_filter = ttk.Combobox(filter_frame, width=12, state='readonly', values=[ALL_FILTER])
+    rank_filter.set(ALL_FILTER)
+    rank_filter.pack(side='left', padx=5)
+    rank_filter.bind('<<ComboboxSelected>>', apply_detail_filter)
+    tk.Label(filter_frame, text="Question:", bg=COLORS['card'], fg=COLORS['text']).pack(side='left')
+    question_filter = ttk.Combobox(filter_frame, width=25, state='readonly', values=[ALL_FILTER])
+    question_filter.set(ALL_FILTER)
+    question_filter.pack(side='left', padx=5)
+    question_filter.bind('<<ComboboxSelected>>', apply_detail_filter)
+    tk.Label(filter_frame, text="Search:", bg=COLORS['card'], fg=COLORS['text']).pack(side='left')
+    search_var = tk.StringVar()
+    search_entry = tk.Entry(filter_frame, textvariable=search_var, width=15)
+    search_entry.pack(side='left', padx=5, fill='x', expand=True)
+    search_entry.bind('<KeyRelease>', schedule_detail_search)
+    detail_count_label = tk.Label(filter_frame, text="", bg=COLORS['card'], fg=COLORS['text'], font=('Segoe UI', 9))
+    detail_count_label.pack(side='left', padx=5)
+
+    detail_scrollbar = ttk.Scrollbar(detailed_card, orient='vertical')
+    detail_scrollbar.pack(side='right', fill='y')
+    detailed_text_widget = tk.Text(detailed_card, wrap='word', bg=COLORS['card'], fg=COLORS['text'], font=("Segoe UI", 10),
+                                   yscrollcommand=on_detail_scroll)
+    detailed_text_widget.pack(fill='both', expand=True)
+    detail_scrollbar.config(command=detailed_text_widget.yview)
+    detailed_text_widget.tag_configure('match', background='#fff59d')
+
+    chart_card = tk.Frame(root, bg=COLORS['card'], padx=10, pady=10, highlightbackground=COLORS['border'], highlightthickness=1)
+    chart_card.pack(fill='x', padx=20, pady=(0, 20))
+
+    status_bar = tk.Frame(root, bg=COLORS['primary'], height=30)
+    status_bar.pack(side='bottom', fill='x')
+    processing_time_label = tk.Label(status_bar, text="Ready", bg=COLORS['primary'], fg='white', font=("Segoe UI", 9))
+    processing_time_label.pack(side='left', padx=10)
+    progress_bar = ttk.Progressbar(status_bar, length=200, mode='determinate')
+    progress_bar.pack(side='right', padx=10, pady=5)
+
+    return root
+
+class ModernText(tk.Text):
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.config(
+            bg=COLORS['card'],
+            fg=COLORS['text'],
+            insertbackground=COLORS['primary'],
+            selectbackground=COLORS['primary_light'],
+            relief='flat',
+            padx=10,
+            pady=10,
+            wrap=tk.WORD,
+            font=('Segoe UI', 10)
+        )
+
+class ModernButton(tk.Button):
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.config(
+            bg=COLORS['primary'],
+            fg='white',
+            activebackground=COLORS['primary_light'],
+            activeforeground='white',
+            relief='flat',
+            padx=20,
+            pady=8,
+            font=('Segoe UI', 10, 'bold'),
+            cursor='hand2'
+        )
+        self.bind("<Enter>", lambda e: self.config(bg=COLORS['primary_light']))
+        self.bind("<Leave>", lambda e: self.config(bg=COLORS['primary']))
+
+class ModernEntry(tk.Entry):
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.config(
+            bg='white',
+            fg=COLORS['text'],
+            relief='flat',
+            highlightthickness=1,
+            highlightcolor=COLORS['primary'],
+            highlightbackground=COLORS['border'],
+            insertbackground=COLORS['primary'],
+            font=('Segoe UI', 10),
+            selectbackground=COLORS['primary_light']
+        )
+
+class ModernLabel(tk.Label):
+    def __init__(self, master=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.config(
+            bg=COLORS['background'],
+            fg=COLORS['text'],
+            font=('Segoe UI', 10)
+        )
+
+def main():
+    # The summary panel shows a per-stage timing breakdown
+    profiler.enabled = True
+    root = create_modern_gui()
+    root.mainloop()
+
+if __name__ == "__main__":
+    main()
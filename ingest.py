@@ -0,0 +1,270 @@
+import hashlib
+import os
+
+import numpy as np
+
+from translation import cache_dir_from_env
+
+# Columns the analysis needs, under their canonical names
+FEEDBACK_COLUMNS = [
+    "Comments",
+    "Feedback Responses",
+    "Feedback Dimensions & Questions",
+    "Rank feedback provider",
+    "Feedback Requester User ID",
+    "Form Completed On Date",
+]
+TEXT_COLUMNS = FEEDBACK_COLUMNS[:4]
+
+# Header variants found in exports, mapped to canonical names
+COLUMN_ALIASES = {
+    "Comments": "Comments",
+    "Feedback Responses": "Feedback Responses",
+    "Feedback Response": "Feedback Responses",
+    "Feedback Dimensions & Questions": "Feedback Dimensions & Questions",
+    "Rank feedback provider": "Rank feedback provider",
+    "Feedback Requester User ID": "Feedback Requester User ID",
+    "Form Completed On Date": "Form Completed On Date",
+}
+
+# Cell strings read_excel and read_csv treat as missing by default
+NA_STRINGS = frozenset([
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+])
+
+# Bump when the cached columns change so older cache entries are not reused
+SCHEMA_VERSION = 2
+
+
+def canonical_column(name):
+    return COLUMN_ALIASES.get(str(name).strip())
+
+
+def _normalize_columns(df):
+    """Rename to canonical names and give every column a single type."""
+    import pandas as pd
+    df = df.rename(columns=canonical_column)
+    df = df.loc[:, ~df.columns.duplicated()]
+    # Parquet needs one type per column: keep missing values, stringify the rest
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    # Workbooks may store IDs as text; read_excel parses them as numbers, so match it
+    id_col = "Feedback Requester User ID"
+    if id_col in df.columns and not pd.api.types.is_numeric_dtype(df[id_col]):
+        ids = pd.to_numeric(df[id_col], errors="coerce")
+        if ids.notna().sum() == df[id_col].notna().sum():
+            df[id_col] = ids
+    if "Form Completed On Date" in df.columns:
+        df["Form Completed On Date"] = pd.to_datetime(df["Form Completed On Date"], errors="coerce")
+    return df
+
+
+def read_excel_columns(path):
+    """Parse only the needed columns of a workbook, renamed to canonical names."""
+    import pandas as pd
+    return _normalize_columns(pd.read_excel(path, usecols=lambda name: canonical_column(name) is not None))
+
+
+def read_csv_columns(path, chunksize=None):
+    """Parse only the needed columns of a CSV export; an iterator of chunks when chunksize is set."""
+    import pandas as pd
+    reader = pd.read_csv(path, usecols=lambda name: canonical_column(name) is not None, chunksize=chunksize)
+    if chunksize is None:
+        return _normalize_columns(reader)
+    return (_normalize_columns(chunk) for chunk in reader)
+
+
+def read_columns(path):
+    """Feedback columns of a workbook or, for .csv paths, a CSV export."""
+    if path.lower().endswith(".csv"):
+        return read_csv_columns(path)
+    return read_excel_columns(path)
+
+
+def iter_feedback_chunks(path, chunk_rows=5000):
+    """Yield the feedback columns of a workbook or CSV export, chunk_rows rows at a time.
+
+    Only one chunk is held in memory: workbooks are read row by row with
+    openpyxl in read-only mode, CSV files with pandas' chunked reader.
+    """
+    import pandas as pd
+    if path.lower().endswith(".csv"):
+        yield from read_csv_columns(path, chunksize=chunk_rows)
+        return
+
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        # First column of each canonical name, like the usecols path
+        positions = {}
+        for i, name in enumerate(header):
+            if canonical_column(name) is not None and canonical_column(name) not in positions.values():
+                positions[i] = canonical_column(name)
+        names = list(positions.values())
+
+        chunk = []
+        for row in rows:
+            values = [row[i] if i < len(row) else None for i in positions]
+            chunk.append([None if isinstance(value, str) and value in NA_STRINGS else value for value in values])
+            if len(chunk) == chunk_rows:
+                yield _normalize_columns(pd.DataFrame(chunk, columns=names))
+                chunk = []
+        if chunk:
+            yield _normalize_columns(pd.DataFrame(chunk, columns=names))
+    finally:
+        workbook.close()
+
+
+def _cache_paths(path, cache_dir):
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    path_hash = hashlib.sha1(path.encode("utf-8")).hexdigest()[:16]
+    version = hashlib.sha1(f"{SCHEMA_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+    directory = os.path.join(cache_dir, "ingest")
+    return directory, path_hash, os.path.join(directory, f"{path_hash}-{version}.parquet")
+
+
+def _remove_stale_entries(directory, path_hash, cache_path, suffixes):
+    """Remove a file's cache entries of other versions; other processes' .tmp files are left alone."""
+    current = os.path.basename(cache_path)[:-len(".parquet")]
+    for name in os.listdir(directory):
+        if not name.startswith(path_hash + "-"):
+            continue
+        for suffix in suffixes:
+            if name.endswith(suffix) and name[:-len(suffix)] != current:
+                try:
+                    os.remove(os.path.join(directory, name))
+                except FileNotFoundError:  # Removed by another process first
+                    pass
+
+
+def read_feedback_file(path, cache_dir=None):
+    """Read the feedback columns of a workbook or CSV export through a Parquet cache.
+
+    The cache entry is keyed by the file's path, size and modification time,
+    so an edited workbook is parsed again and its stale entry removed.
+    """
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:  # Without pyarrow every load parses the workbook
+        return read_columns(path)
+
+    directory, path_hash, cache_path = _cache_paths(path, cache_dir or cache_dir_from_env())
+    if os.path.exists(cache_path):
+        return pq.read_table(cache_path, memory_map=True).to_pandas()
+
+    df = read_columns(path)
+    os.makedirs(directory, exist_ok=True)
+    _remove_stale_entries(directory, path_hash, cache_path, (".parquet", ".ids.npz"))
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, cache_path)
+    return df
+
+
+def requester_id_string(value):
+    """Canonical string form of a requester ID; 3515976, 3515976.0 and "3515976" all match."""
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def build_id_index(df):
+    """(ids, starts, positions, rows) of a workbook's Feedback Requester User IDs.
+
+    ids is sorted; the rows of ids[i] are positions[starts[i]:starts[i + 1]],
+    in ascending order.
+    """
+    import pandas as pd
+    keys = df["Feedback Requester User ID"].map(
+        lambda value: None if pd.isna(value) else requester_id_string(value)
+    )
+    codes, ids = pd.factorize(keys, sort=True)
+    order = np.argsort(codes, kind="stable")
+    order = order[codes[order] >= 0]
+    counts = np.bincount(codes[codes >= 0], minlength=len(ids))
+    starts = np.concatenate([[0], np.cumsum(counts)])
+    return np.asarray(ids, dtype=str), starts.astype(np.int64), order.astype(np.int64), len(df)
+
+
+def read_id_index(path, cache_dir=None):
+    """build_id_index of a workbook, persisted next to its Parquet cache entry."""
+    directory, path_hash, cache_path = _cache_paths(path, cache_dir or cache_dir_from_env())
+    index_path = cache_path[:-len(".parquet")] + ".ids.npz"
+    if os.path.exists(index_path):
+        with np.load(index_path) as data:
+            return data["ids"], data["starts"], data["positions"], int(data["rows"])
+
+    ids, starts, positions, rows = build_id_index(read_feedback_file(path, cache_dir))
+    os.makedirs(directory, exist_ok=True)
+    _remove_stale_entries(directory, path_hash, cache_path, (".ids.npz",))
+    tmp_path = f"{index_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, ids=ids, starts=starts, positions=positions, rows=rows)
+    os.replace(tmp_path, index_path)
+    return ids, starts, positions, rows
+
+
+class RequesterIndex:
+    """Row positions of each requester ID across workbooks loaded together.
+
+    Positions follow the row order of the workbooks concatenated in the
+    given order, so a lookup costs a binary search per file plus the rows
+    for that ID, without scanning or copying the ID column.
+    """
+
+    def __init__(self, file_indexes):
+        self.files = []
+        offset = 0
+        for path, (ids, starts, positions, rows) in file_indexes:
+            self.files.append((path, ids, starts, positions, offset))
+            offset += rows
+        all_ids = [ids for _, ids, _, _, _ in self.files]
+        self.ids = np.unique(np.concatenate(all_ids)) if all_ids else np.array([], dtype=str)
+
+    @staticmethod
+    def _file_rows(ids, starts, positions, key):
+        i = np.searchsorted(ids, key)
+        if i < len(ids) and ids[i] == key:
+            return positions[starts[i]:starts[i + 1]]
+        return positions[:0]
+
+    def rows(self, feedback_id):
+        """Ascending row positions of one requester ID."""
+        key = requester_id_string(feedback_id)
+        parts = [self._file_rows(ids, starts, positions, key) + offset
+                 for _, ids, starts, positions, offset in self.files]
+        return np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+
+    def periods(self, feedback_id):
+        """[(path, row count)] of the workbooks containing a requester ID."""
+        key = requester_id_string(feedback_id)
+        found = []
+        for path, ids, starts, positions, _ in self.files:
+            count = len(self._file_rows(ids, starts, positions, key))
+            if count:
+                found.append((path, count))
+        return found
+
+    def complete(self, prefix, limit=20):
+        """Up to limit known IDs starting with prefix, in sorted order."""
+        prefix = str(prefix).strip()
+        start = np.searchsorted(self.ids, prefix)
+        matches = []
+        for feedback_id in self.ids[start:start + limit]:
+            if not feedback_id.startswith(prefix):
+                break
+            matches.append(str(feedback_id))
+        return matches
+
+    def __contains__(self, feedback_id):
+        key = requester_id_string(feedback_id)
+        i = np.searchsorted(self.ids, key)
+        return bool(i < len(self.ids) and self.ids[i] == key)
+
+    def __len__(self):
+        return len(self.ids)
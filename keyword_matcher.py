@@ -0,0 +1,136 @@
+import json
+
+import numpy as np
+
+
+def load_category_keywords(path):
+    """{category: [keyword or phrase, ...]} from a JSON file."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class KeywordMatcher:
+    """Category keyword counts of spaCy docs, in one pass over their tokens.
+
+    Single-word keywords are stored as hashes of their lowercase form and
+    lemma, and match a token when either its lowercase form or its lemma
+    matches, so "Team," and "leading" count for "team" and "lead".
+    Multi-word keywords ("go-to-market") go through a PhraseMatcher on the
+    lowercase form. Docs are the ones already made for the similarity scores;
+    nothing is tokenized twice.
+    """
+
+    # Part of the analysis version: bump when the matching rules change
+    VERSION = 1
+
+    def __init__(self, nlp, category_keywords):
+        from spacy.matcher import PhraseMatcher
+
+        self.categories = list(category_keywords)
+        self._terms = {}
+        self._phrase_categories = {}
+        # The same keywords by string, for tokens stored without their doc (see token_counts)
+        self._term_forms = {}
+        self._phrase_forms = {}
+        self._phrases = PhraseMatcher(nlp.vocab, attr="LOWER")
+        strings = nlp.vocab.strings
+
+        for j, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                keyword = keyword.strip().lower()
+                doc = nlp(keyword)
+                if len(doc) == 1:
+                    for form in {keyword, doc[0].lemma_.lower()} - {""}:
+                        self._add(self._terms, strings.add(form), j)
+                        self._add(self._term_forms, form, j)
+                elif len(doc) > 1:
+                    match_id = strings.add(keyword)
+                    pattern = nlp.make_doc(keyword)
+                    self._phrases.add(keyword, [pattern])
+                    self._add(self._phrase_categories, match_id, j)
+                    self._add(self._phrase_forms, tuple(token.lower_ for token in pattern), j)
+
+    @classmethod
+    def for_tokens(cls, category_keywords, doc_tokens):
+        """Matcher for token_counts only, splitting keywords with doc_tokens(text) instead of a spaCy model."""
+        matcher = cls.__new__(cls)
+        matcher.categories = list(category_keywords)
+        matcher._terms = {}
+        matcher._phrase_categories = {}
+        matcher._phrases = None
+        matcher._term_forms = {}
+        matcher._phrase_forms = {}
+        for j, keywords in enumerate(category_keywords.values()):
+            for keyword in keywords:
+                tokens = doc_tokens(keyword.strip().lower())
+                if len(tokens) == 1:
+                    for form in {tokens[0][0], tokens[0][1].lower()} - {""}:
+                        cls._add(matcher._term_forms, form, j)
+                elif len(tokens) > 1:
+                    cls._add(matcher._phrase_forms, tuple(lower for lower, _, _ in tokens), j)
+        return matcher
+
+    @staticmethod
+    def _add(table, key, category_index):
+        if category_index not in table.get(key, ()):
+            table[key] = table.get(key, ()) + (category_index,)
+
+    def counts(self, doc):
+        """(matches per category, word count) of a doc; punctuation is not a word.
+
+        A phrase match counts once, and the words inside it are not counted again.
+        """
+        counts = np.zeros(len(self.categories), dtype=np.int64)
+        in_phrase = set()
+        if self._phrase_categories:
+            for match_id, start, end in self._phrases(doc):
+                for j in self._phrase_categories[match_id]:
+                    counts[j] += 1
+                in_phrase.update(range(start, end))
+
+        words = 0
+        terms = self._terms
+        for token in doc:
+            if token.is_punct or token.is_space:
+                continue
+            words += 1
+            if token.i in in_phrase:
+                continue
+            matched = terms.get(token.lower, ())
+            if token.lemma != token.lower and token.lemma in terms:
+                matched = set(matched) | set(terms[token.lemma])
+            for j in matched:
+                counts[j] += 1
+        return counts, words
+
+    @staticmethod
+    def doc_tokens(doc):
+        """[lowercase form, lemma, is word] of every token, the input of token_counts."""
+        return [[token.lower_, token.lemma_, not (token.is_punct or token.is_space)] for token in doc]
+
+    def token_counts(self, tokens):
+        """counts() of a doc from its doc_tokens, without the doc or the spaCy model."""
+        counts = np.zeros(len(self.categories), dtype=np.int64)
+        lowers = [lower for lower, _, _ in tokens]
+        in_phrase = set()
+        for phrase, phrase_categories in self._phrase_forms.items():
+            for start in range(len(lowers) - len(phrase) + 1):
+                if tuple(lowers[start:start + len(phrase)]) == phrase:
+                    for j in phrase_categories:
+                        counts[j] += 1
+                    in_phrase.update(range(start, start + len(phrase)))
+
+        words = 0
+        terms = self._term_forms
+        for i, (lower, lemma, is_word) in enumerate(tokens):
+            if not is_word:
+                continue
+            words += 1
+            if i in in_phrase:
+                continue
+            matched = terms.get(lower, ())
+            if lemma != lower and lemma in terms:
+                matched = set(matched) | set(terms[lemma])
+            for j in matched:
+                counts[j] += 1
+        return counts, words
@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def file_content_hash(path, chunk_size=1 << 20):
+    """SHA-256 of a file's bytes; identical exports share a hash whatever their name."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PeriodStore:
+    """SQLite store of per-period aggregates, keyed by the source file's content hash.
+
+    For every analyzed file it keeps, per requester ID, the sentiment sum,
+    row count and category score sums overall ("all"), per question and per
+    rank. Results are also keyed by the analysis version, so changing the
+    model or keywords makes the stored periods stale.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS periods ("
+                "file_hash TEXT NOT NULL, version TEXT NOT NULL, path TEXT NOT NULL, "
+                "period_date TEXT, processed_at REAL NOT NULL, PRIMARY KEY (file_hash, version))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS aggregates ("
+                "file_hash TEXT NOT NULL, version TEXT NOT NULL, requester_id TEXT NOT NULL, "
+                "kind TEXT NOT NULL, group_key TEXT NOT NULL, sentiment_sum REAL NOT NULL, "
+                "count INTEGER NOT NULL, category_sums TEXT NOT NULL, "
+                "PRIMARY KEY (file_hash, version, requester_id, kind, group_key))"
+            )
+        return self._conn
+
+    def period(self, file_hash, version):
+        """{'path', 'period_date'} of a stored period, or None if it was never analyzed."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT path, period_date FROM periods WHERE file_hash = ? AND version = ?",
+                (file_hash, version),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"path": row[0], "period_date": row[1]}
+
+    def save_period(self, file_hash, version, path, period_date, aggregates):
+        """Store a period's aggregates, replacing any earlier copy.
+
+        aggregates yields (requester_id, kind, group_key, sentiment_sum, count, category_sums).
+        """
+        rows = [
+            (file_hash, version, str(requester_id), kind, str(group_key), sentiment_sum, count, json.dumps(sums))
+            for requester_id, kind, group_key, sentiment_sum, count, sums in aggregates
+        ]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM aggregates WHERE file_hash = ? AND version = ?", (file_hash, version))
+                conn.executemany("INSERT INTO aggregates VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.execute(
+                    "INSERT OR REPLACE INTO periods VALUES (?, ?, ?, ?, ?)",
+                    (file_hash, version, path, period_date, time.time()),
+                )
+
+    def requester_aggregates(self, file_hash, version, requester_id, kind="all"):
+        """{group_key: (sentiment_sum, count, category_sums)} of one requester in one period."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT group_key, sentiment_sum, count, category_sums FROM aggregates "
+                "WHERE file_hash = ? AND version = ? AND requester_id = ? AND kind = ?",
+                (file_hash, version, str(requester_id), kind),
+            ).fetchall()
+        return {key: (sentiment_sum, count, json.loads(sums)) for key, sentiment_sum, count, sums in rows}
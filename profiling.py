@@ -0,0 +1,154 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+_DISABLED = nullcontext()
+
+
+class Profiler:
+    """Stage timers, event counters and cache hit rates for one analysis.
+
+    When disabled, stage() returns a shared no-op context manager and
+    count() returns immediately, so instrumented code pays almost nothing.
+    Stage times are exclusive: time spent in a stage nested inside another
+    counts for the inner stage only, so the stage times add up to the time
+    measured.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+        self._caches = {}
+        self._cache_base = {}
+        # Per thread, the time spent in nested stages of each open stage
+        self._local = threading.local()
+
+    def stage(self, name):
+        """Context manager adding the time spent inside it to a stage."""
+        if not self.enabled:
+            return _DISABLED
+        return self._timed_stage(name)
+
+    @contextmanager
+    def _timed_stage(self, name):
+        nested = self._local.__dict__.setdefault("nested", [])
+        nested.append(0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            inner = nested.pop()
+            if nested:
+                nested[-1] += elapsed
+            with self._lock:
+                calls, seconds = self._stages.get(name, (0, 0.0))
+                self._stages[name] = (calls + 1, seconds + elapsed - inner)
+
+    def timed(self, name=None):
+        """Decorator timing every call of a function as a stage."""
+        def decorator(func):
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._timed_stage(stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def count(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def register_cache(self, name, stats):
+        """Track a cache whose stats() returns a dict with hits and misses."""
+        self._caches[name] = stats
+        self._cache_base[name] = (0, 0)
+
+    @staticmethod
+    def _hits_misses(stats):
+        values = stats()
+        return values["hits"], values["misses"]
+
+    def reset(self):
+        """Start a new measurement; cache hit rates are reported from here on."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+        for name, stats in self._caches.items():
+            self._cache_base[name] = self._hits_misses(stats)
+
+    def snapshot(self):
+        with self._lock:
+            stages = {name: {"calls": calls, "seconds": seconds} for name, (calls, seconds) in self._stages.items()}
+            counters = dict(self._counters)
+        caches = {}
+        for name, stats in self._caches.items():
+            hits, misses = self._hits_misses(stats)
+            base_hits, base_misses = self._cache_base[name]
+            hits, misses = hits - base_hits, misses - base_misses
+            caches[name] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            }
+        return {"stages": stages, "counters": counters, "caches": caches}
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix="feedback_analysis"):
+        """Snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {prefix}_stage_seconds_total Time spent in each pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        for name, stage in snapshot["stages"].items():
+            lines.append(f'{prefix}_stage_seconds_total{{stage="{name}"}} {stage["seconds"]:.6f}')
+        lines += [
+            f"# HELP {prefix}_stage_calls_total Number of times each pipeline stage ran.",
+            f"# TYPE {prefix}_stage_calls_total counter",
+        ]
+        for name, stage in snapshot["stages"].items():
+            lines.append(f'{prefix}_stage_calls_total{{stage="{name}"}} {stage["calls"]}')
+        lines += [
+            f"# HELP {prefix}_events_total Pipeline event counters.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        for name, value in snapshot["counters"].items():
+            lines.append(f'{prefix}_events_total{{counter="{name}"}} {value}')
+        for kind in ("hits", "misses"):
+            lines += [
+                f"# HELP {prefix}_cache_{kind}_total Cache {kind}.",
+                f"# TYPE {prefix}_cache_{kind}_total counter",
+            ]
+            for name, cache in snapshot["caches"].items():
+                lines.append(f'{prefix}_cache_{kind}_total{{cache="{name}"}} {cache[kind]}')
+        return "\n".join(lines) + "\n"
+
+    def format_breakdown(self):
+        """Human-readable stage breakdown for the summary panel."""
+        snapshot = self.snapshot()
+        text = "Stage Breakdown:\n"
+        for name, stage in sorted(snapshot["stages"].items(), key=lambda item: -item[1]["seconds"]):
+            text += f"  {name}: {stage['seconds']:.2f} sec ({stage['calls']} call(s))\n"
+        if snapshot["counters"]:
+            text += "Counters:\n"
+            for name, value in snapshot["counters"].items():
+                text += f"  {name}: {value}\n"
+        if snapshot["caches"]:
+            text += "Cache Hit Rates:\n"
+            for name, cache in snapshot["caches"].items():
+                lookups = cache["hits"] + cache["misses"]
+                text += f"  {name}: {cache['hit_rate']:.1%} ({cache['hits']}/{lookups})\n"
+        return text
@@ -0,0 +1,110 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+
+def result_key(version, kind, *parts):
+    """Content address of a result: the analysis version plus the hashed input text."""
+    digest = hashlib.sha1(version.encode("utf-8"))
+    for part in (kind, *parts):
+        digest.update(b"\x1f")
+        digest.update(str(part).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ResultStore:
+    """Memo of per-text analysis results with an in-memory LRU bound.
+
+    Values must be JSON-serializable. When spill_dir is set, entries evicted
+    from memory are written to a SQLite file there and read back on a miss.
+    """
+
+    def __init__(self, max_items=100_000, spill_dir=None):
+        self.max_items = max_items
+        self.spill_path = os.path.join(spill_dir, "results.sqlite3") if spill_dir else None
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _spill_connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+            self._conn = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        return self._conn
+
+    def get(self, key, default=None):
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys):
+        """Return {key: value} for every stored key."""
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._items:
+                    self._items.move_to_end(key)
+                    found[key] = self._items[key]
+
+            missing = [key for key in dict.fromkeys(keys) if key not in found]
+            if missing and self.spill_path:
+                conn = self._spill_connection()
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    placeholders = ",".join("?" * len(chunk))
+                    rows = conn.execute(f"SELECT key, value FROM results WHERE key IN ({placeholders})", chunk)
+                    for key, value in rows.fetchall():
+                        found[key] = json.loads(value)
+                        self._insert(key, found[key])
+
+            self.hits += sum(1 for key in keys if key in found)
+            self.misses += sum(1 for key in keys if key not in found)
+        return found
+
+    def put(self, key, value):
+        self.put_many([(key, value)])
+
+    def put_many(self, items):
+        with self._lock:
+            for key, value in items:
+                self._insert(key, value)
+
+    def _insert(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        evicted = []
+        while len(self._items) > self.max_items:
+            evicted.append(self._items.popitem(last=False))
+        if evicted and self.spill_path:
+            conn = self._spill_connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in evicted],
+            )
+            conn.commit()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            if self.spill_path:
+                conn = self._spill_connection()
+                conn.execute("DELETE FROM results")
+                conn.commit()
+        self.hits = 0
+        self.misses = 0
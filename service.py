@@ -0,0 +1,544 @@
+import asyncio
+import hmac
+import http.client
+import json
+import os
+import secrets
+import socket
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import Code
+from translation import cache_dir_from_env
+
+# Defaults of the serve subcommand
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Texts scored together in one nlp.pipe call, and how long to wait for more to arrive
+MAX_BATCH_TEXTS = 512
+MAX_BATCH_WAIT = 0.02
+
+# Batches waiting for the scorer before request threads block, and analyses run at once
+MAX_PENDING_BATCHES = 64
+MAX_ACTIVE_REQUESTS = 8
+
+# Loaded workbooks kept between requests
+DATASET_CACHE_SIZE = 4
+
+# Finished jobs kept for clients that have not fetched their outcome yet
+MAX_FINISHED_JOBS = 64
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+# Only these files under the data root are read
+FEEDBACK_EXTENSIONS = (".xlsx", ".xls", ".csv")
+
+# Clients send "Authorization: Bearer <token>". FEEDBACK_SERVICE_TOKEN sets the token;
+# otherwise one is generated into this file of the cache directory, readable by its owner only
+TOKEN_FILE = "service_token"
+
+
+class ServiceError(Exception):
+    """A request to the analysis service failed."""
+
+
+def service_token(create=False):
+    """FEEDBACK_SERVICE_TOKEN, else the token in the cache directory, generated there if create is set.
+
+    Returns None when there is no token and create is not set.
+    """
+    token = os.environ.get("FEEDBACK_SERVICE_TOKEN")
+    if token:
+        return token
+    path = os.path.join(cache_dir_from_env(), TOKEN_FILE)
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return f.read().strip()
+    if not create:
+        return None
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    token = secrets.token_urlsafe(32)
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        # Another service generated it first
+        return service_token()
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(token)
+    return token
+
+
+class MicroBatcher:
+    """Merges texts from concurrent requests into shared scoring calls.
+
+    Requests put their texts on a bounded queue; one loop takes whatever is
+    queued, waiting up to max_wait for a batch of max_batch_texts, and scores
+    it with score_batch in a single thread that owns the warm models. A full
+    queue blocks the submitting request thread, which slows requests down
+    instead of letting the backlog grow.
+    """
+
+    def __init__(self, score_batch, max_batch_texts=MAX_BATCH_TEXTS, max_wait=MAX_BATCH_WAIT,
+                 max_pending=MAX_PENDING_BATCHES):
+        self.score_batch = score_batch
+        self.max_batch_texts = max_batch_texts
+        self.max_wait = max_wait
+        self.queue = asyncio.Queue(max_pending)
+        self.batches = 0
+        self.texts_scored = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scorer")
+
+    async def score(self, texts):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((texts, future))
+        return await future
+
+    def score_from_thread(self, texts, loop):
+        """Blocking score() for analysis code running outside the event loop."""
+        results = []
+        for start in range(0, len(texts), self.max_batch_texts):
+            chunk = texts[start:start + self.max_batch_texts]
+            results.extend(asyncio.run_coroutine_threadsafe(self.score(chunk), loop).result())
+        return results
+
+    async def warm_up(self, load):
+        await asyncio.get_running_loop().run_in_executor(self._executor, load)
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            count = len(batch[0][0])
+            deadline = loop.time() + self.max_wait
+            while count < self.max_batch_texts:
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                count += len(item[0])
+
+            texts = [text for item_texts, _ in batch for text in item_texts]
+            try:
+                results = await loop.run_in_executor(self._executor, self.score_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            self.batches += 1
+            self.texts_scored += len(texts)
+            position = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(results[position:position + len(item_texts)])
+                position += len(item_texts)
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "pending_batches": self.queue.qsize(),
+            "batches": self.batches,
+            "texts_scored": self.texts_scored,
+            "avg_batch_texts": self.texts_scored / self.batches if self.batches else 0.0,
+        }
+
+
+class AnalysisJob:
+    """Progress, cancel flag and outcome of an analysis run as a service job."""
+
+    def __init__(self):
+        self.status = "running"
+        self.done = 0
+        self.total = 0
+        self.stage = "rows"
+        self.result = None
+        self.error = None
+        self.cancelled = threading.Event()
+
+    def progress(self, done, total, stage="rows"):
+        """Progress callback of the analysis; raises AnalysisCancelled once the job is cancelled."""
+        if self.cancelled.is_set():
+            raise Code.AnalysisCancelled()
+        self.done, self.total, self.stage = done, total, stage
+
+    def state(self):
+        state = {"status": self.status, "done": self.done, "total": self.total, "stage": self.stage}
+        if self.status == "done":
+            state["result"] = self.result
+        elif self.status == "error":
+            state["error"] = self.error
+        return state
+
+
+class AnalysisService:
+    """Local HTTP service keeping the NLP models warm for several clients.
+
+    Endpoints (JSON bodies):
+      GET    /health         model and queue statistics
+      POST   /analyze        {"files": [...], "ids": [...], "details": false}: summaries per ID
+      POST   /analyze-batch  {"files": [...], "ids": null}: results table rows
+      POST   /improvement    {"files": [...], "id": ...}: the requester's scores per period
+      POST   /jobs/<name>    the same analyses run in the background: {"id": job ID}
+      GET    /jobs/<id>      {"status", "done", "total", "stage"}, with "result" or "error"
+                             once finished; a finished job is forgotten once fetched
+      DELETE /jobs/<id>      cancel a job
+
+    Every request needs the token as "Authorization: Bearer <token>" (401
+    otherwise). Files are paths relative to data_root, or absolute paths
+    inside it; other files are refused with 403 and nothing is ever written.
+    Analyses run in a thread pool; their texts are scored through a shared
+    MicroBatcher. Beyond max_requests concurrent analyses the service answers
+    503 so clients retry later.
+    """
+
+    def __init__(self, max_requests=MAX_ACTIVE_REQUESTS, data_root=".", token=None, **batcher_options):
+        self.max_requests = max_requests
+        self.data_root = os.path.realpath(data_root)
+        self.token = token or service_token(create=True)
+        self.batcher_options = batcher_options
+        self.batcher = None
+        self.active_requests = 0
+        self.started = time.time()
+        self._datasets = OrderedDict()
+        self._datasets_lock = threading.Lock()
+        self._jobs = OrderedDict()
+        self._executor = ThreadPoolExecutor(max_workers=max_requests, thread_name_prefix="analysis")
+
+    def dataset(self, file_paths, progress=None):
+        """(df, comment_col, response_col, index) of workbooks, reused while they are unchanged."""
+        key = tuple((os.path.abspath(path), os.stat(path).st_mtime_ns) for path in file_paths)
+        # One load at a time: concurrent requests for the same files wait and share it
+        with self._datasets_lock:
+            if key in self._datasets:
+                self._datasets.move_to_end(key)
+                return self._datasets[key]
+            df, comment_col, response_col = Code.load_feedback_data(file_paths, progress)
+            if not comment_col or not response_col:
+                raise Code.MissingColumnsError("Required columns not found in Excel file(s)")
+            dataset = (df, comment_col, response_col, Code.load_id_index(file_paths))
+            self._datasets[key] = dataset
+            while len(self._datasets) > DATASET_CACHE_SIZE:
+                self._datasets.popitem(last=False)
+        return dataset
+
+    def analyze(self, request, progress=None):
+        df, comment_col, response_col, index = self.dataset(request["files"], progress)
+        results = []
+        for feedback_id in request["ids"]:
+            rows = Code.select_requester_rows(df, index, [feedback_id])
+            if rows.empty:
+                results.append({"id": feedback_id, "rows": 0})
+                continue
+            columns = {
+                "comments": rows[comment_col].tolist(),
+                "responses": rows[response_col].tolist(),
+                "questions": rows['Feedback Dimensions & Questions'].tolist(),
+                "ranks": rows['Rank feedback provider'].tolist(),
+            }
+            main_text, _, similarity_scores, _, _ = Code.process_feedback(
+                feedback_id, columns["comments"], columns["responses"], columns["questions"], columns["ranks"],
+                progress=progress,
+            )
+            result = {"id": feedback_id, "rows": len(rows), "main_text": main_text, "scores": similarity_scores}
+            if request.get("details"):
+                result["details"] = columns
+            results.append(result)
+        return {"results": results}
+
+    def analyze_batch(self, request, progress=None):
+        if request.get("ids") is None:
+            df, comment_col, response_col, _ = self.dataset(request["files"], progress)
+        else:
+            df, comment_col, response_col, index = self.dataset(request["files"], progress)
+            df = Code.select_requester_rows(df, index, request["ids"])
+        results = Code.analyze_all_ids(df, comment_col, response_col, workers=1, progress=progress)
+        # NaN is not valid JSON
+        return {"ids": len(results), "results": json.loads(results.to_json(orient="records"))}
+
+    def improvement(self, request, progress=None):
+        series = Code.improvement_series(request["files"], request["id"], workers=1, progress=progress)
+        return {"series": [dict(point, date=point["date"].isoformat()) for point in series]}
+
+    def run_job(self, job, route, request):
+        try:
+            job.result = route(request, job.progress)
+            job.status = "done"
+        except Code.AnalysisCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            job.error = str(e) if isinstance(e, (Code.MissingColumnsError, OSError)) else f"{type(e).__name__}: {e}"
+            job.status = "error"
+
+    def start_job(self, route, request):
+        """Run route(request, progress) in the background; returns the job ID."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status != "running"]
+        for job_id in finished[:max(len(finished) - MAX_FINISHED_JOBS + 1, 0)]:
+            del self._jobs[job_id]
+        job_id = secrets.token_hex(8)
+        job = self._jobs[job_id] = AnalysisJob()
+        self.active_requests += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, self.run_job, job, route, request)
+        future.add_done_callback(lambda _: self._job_finished())
+        return job_id
+
+    def _job_finished(self):
+        self.active_requests -= 1
+
+    def job_request(self, method, job_id):
+        """(status, payload) of GET or DELETE /jobs/<id>."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return 404, {"error": f"No such job: {job_id}"}
+        if method == "DELETE":
+            job.cancelled.set()
+            return 200, {"status": job.status}
+        if method != "GET":
+            return 404, {"error": f"No such endpoint: {method} /jobs/{job_id}"}
+        if job.status != "running":
+            del self._jobs[job_id]
+        return 200, job.state()
+
+    def health(self):
+        return {
+            "status": "ok",
+            "uptime": time.time() - self.started,
+            "active_requests": self.active_requests,
+            "max_requests": self.max_requests,
+            **self.batcher.stats(),
+        }
+
+    def resolve_files(self, files):
+        """Real paths of the requested files; PermissionError unless all are feedback files under data_root."""
+        paths = []
+        for path in files:
+            real = os.path.realpath(os.path.join(self.data_root, path))
+            if os.path.commonpath([self.data_root, real]) != self.data_root or not real.lower().endswith(FEEDBACK_EXTENSIONS):
+                raise PermissionError(f"{path} is not a feedback file under the service's data root")
+            paths.append(real)
+        return paths
+
+    def authorized(self, headers):
+        scheme, _, token = headers.get("authorization", "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token.strip().encode(), self.token.encode())
+
+    async def handle_request(self, method, path, headers, body):
+        """(status, payload) of one HTTP request; headers are keyed by lowercase name."""
+        if not self.authorized(headers):
+            return 401, {"error": "Missing or wrong service token"}
+        if method == "GET" and path == "/health":
+            return 200, self.health()
+        routes = {"/analyze": self.analyze, "/analyze-batch": self.analyze_batch, "/improvement": self.improvement}
+        job = path.startswith("/jobs/")
+        if job and path[len("/jobs"):] not in routes:
+            return self.job_request(method, path[len("/jobs/"):])
+        route = path[len("/jobs"):] if job else path
+        if method != "POST" or route not in routes:
+            return 404, {"error": f"No such endpoint: {method} {path}"}
+        try:
+            request = json.loads(body or b"{}")
+            if not request.get("files") or (route == "/analyze" and not request.get("ids")) or (
+                    route == "/improvement" and request.get("id") is None):
+                raise ValueError("files are required, and ids for /analyze or id for /improvement")
+            request["files"] = self.resolve_files(request["files"])
+        except PermissionError as e:
+            return 403, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+
+        if self.active_requests >= self.max_requests:
+            return 503, {"error": "Service busy, retry later"}
+        if job:
+            return 200, {"id": self.start_job(routes[route], request)}
+        self.active_requests += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, routes[route], request)
+        except (Code.MissingColumnsError, OSError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": f"{type(e).__name__}: {e}"}
+        finally:
+            self.active_requests -= 1
+        return 200, result
+
+    async def handle_connection(self, reader, writer):
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1")
+                if line in ("\r\n", "\n", ""):
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                return
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY_BYTES:
+                status, payload = 413, {"error": "Request body too large"}
+            else:
+                body = await reader.readexactly(length) if length else b""
+                status, payload = await self.handle_request(request_line[0], urlparse(request_line[1]).path, headers, body)
+
+            data = json.dumps(payload).encode("utf-8")
+            head = (
+                f"HTTP/1.1 {status} {http.client.responses.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                + ("Retry-After: 1\r\n" if status == 503 else "")
+                + "Connection: close\r\n\r\n"
+            )
+            writer.write(head.encode("latin-1") + data)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None, ready=None):
+        """Load the models, then answer requests until cancelled."""
+        loop = asyncio.get_running_loop()
+        self.batcher = MicroBatcher(Code.score_texts, **self.batcher_options)
+        await self.batcher.warm_up(Code._init_worker)
+        Code.set_text_scorer(lambda texts: self.batcher.score_from_thread(texts, loop))
+        batch_task = asyncio.create_task(self.batcher.run())
+        if unix_socket:
+            server = await asyncio.start_unix_server(self.handle_connection, path=unix_socket)
+        else:
+            server = await asyncio.start_server(self.handle_connection, host, port)
+        if ready:
+            ready(server)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            Code.set_text_scorer(None)
+            batch_task.cancel()
+            self.batcher.close()
+            self._executor.shutdown(wait=False)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class AnalysisClient:
+    """Client of an AnalysisService at http://host:port or unix:/path/to/socket.
+
+    Busy responses (503) are retried up to retries times. The token defaults
+    to service_token(), which a service on the same machine and cache
+    directory shares.
+    """
+
+    def __init__(self, address, timeout=3600, retries=30, token=None):
+        self.address = address
+        self.timeout = timeout
+        self.retries = retries
+        self.token = token or service_token()
+
+    def _connection(self):
+        if self.address.startswith("unix:"):
+            return _UnixHTTPConnection(self.address[len("unix:"):], self.timeout)
+        url = urlparse(self.address if "://" in self.address else f"http://{self.address}")
+        return http.client.HTTPConnection(url.hostname, url.port or DEFAULT_PORT, timeout=self.timeout)
+
+    def _request(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload).encode("utf-8")
+        for attempt in range(self.retries + 1):
+            conn = self._connection()
+            try:
+                headers = {"Content-Type": "application/json"}
+                if self.token:
+                    headers["Authorization"] = f"Bearer {self.token}"
+                conn.request(method, path, body, headers)
+                response = conn.getresponse()
+                status = response.status
+                retry_after = float(response.getheader("Retry-After") or 1)
+                result = json.loads(response.read() or b"{}")
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                raise ServiceError(f"Analysis service at {self.address} is unreachable: {e}") from e
+            finally:
+                conn.close()
+            if status == 503 and attempt < self.retries:
+                time.sleep(retry_after)
+                continue
+            if status != 200:
+                raise ServiceError(result.get("error", f"HTTP {status}"))
+            return result
+
+    def health(self):
+        return self._request("GET", "/health")
+
+    def run(self, endpoint, payload, progress=None, poll_interval=0.5):
+        """Result of an analysis endpoint run as a service job, polled until it finishes.
+
+        progress(done, total, stage) is called on every poll; if it raises
+        (e.g. AnalysisCancelled) the job is cancelled and the exception propagates.
+        """
+        job_id = self._request("POST", f"/jobs{endpoint}", payload)["id"]
+        try:
+            while True:
+                state = self._request("GET", f"/jobs/{job_id}")
+                if state["status"] == "done":
+                    return state["result"]
+                if state["status"] == "error":
+                    raise ServiceError(state["error"])
+                if state["status"] == "cancelled":
+                    raise ServiceError("The analysis was cancelled")
+                if progress:
+                    progress(state["done"], state["total"], state["stage"])
+                time.sleep(poll_interval)
+        except BaseException:
+            try:
+                self._request("DELETE", f"/jobs/{job_id}")
+            except ServiceError:  # Already finished and forgotten
+                pass
+            raise
+
+    def _files(self, file_paths):
+        return [os.path.abspath(path) for path in file_paths]
+
+    def analyze(self, file_paths, ids, details=False, progress=None):
+        """[{'id', 'rows', 'main_text', 'scores'(, 'details')}] of each requester ID."""
+        payload = {"files": self._files(file_paths), "ids": list(ids), "details": details}
+        return self.run("/analyze", payload, progress)["results"]
+
+    def analyze_batch(self, file_paths, ids=None, progress=None):
+        """Results table of the requester IDs (all IDs by default), as analyze_files returns it."""
+        import pandas as pd
+        payload = {"files": self._files(file_paths), "ids": None if ids is None else list(ids)}
+        return pd.DataFrame(self.run("/analyze-batch", payload, progress)["results"])
+
+    def improvement_series(self, file_paths, feedback_id, progress=None):
+        """Code.improvement_series of a requester, computed by the service."""
+        payload = {"files": self._files(file_paths), "id": feedback_id}
+        series = self.run("/improvement", payload, progress)["series"]
+        return [dict(point, date=date.fromisoformat(point["date"])) for point in series]
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_socket=None, max_requests=MAX_ACTIVE_REQUESTS, data_root=".",
+          **batcher_options):
+    """Run an AnalysisService until interrupted."""
+    service = AnalysisService(max_requests, data_root, **batcher_options)
+
+    def ready(server):
+        where = unix_socket or f"http://{host}:{port}"
+        print(f"Analysis service ready at {where} | Serving files under {service.data_root} | "
+              f"Models loaded in {time.time() - service.started:.2f} sec")
+
+    try:
+        asyncio.run(service.serve(host, port, unix_socket, ready))
+    except KeyboardInterrupt:
+        pass
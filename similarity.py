@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def cosine_similarity_matrix(vectors, reference_vectors):
+    """Cosine similarity of every row in vectors against every reference row.
+
+    Rows with an empty (all-zero) vector score 0, like spaCy's Doc.similarity.
+    Each row is computed on its own in float64: a BLAS matrix product rounds
+    differently depending on the batch shape, and a text's score must not
+    depend on which texts it was scored with.
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    reference_vectors = np.asarray(reference_vectors, dtype=np.float64)
+    norms = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+    reference_norms = np.sqrt(np.einsum('ij,ij->i', reference_vectors, reference_vectors))
+    denominators = np.outer(norms, reference_norms)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        similarities = np.einsum('ij,kj->ik', vectors, reference_vectors) / denominators
+    return np.where(denominators > 0, similarities, 0.0)
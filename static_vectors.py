@@ -0,0 +1,179 @@
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+
+import numpy as np
+
+# English tokens close to spaCy's: "don't" -> "do", "n't"; "she's" -> "she", "'s";
+# "team-lead!" -> "team", "-", "lead", "!"; numbers, "n'a" and "..." stay whole
+TOKEN_PATTERN = re.compile(
+    r"\w+(?=n['’]t\b)|n['’]t\b|['’](?:s|re|ve|ll|m|d)\b|\d+(?:[.,]\d+)+"
+    r"|\w+(?:['’](?!(?:s|re|ve|ll|m|d|t)\b)\w+)*|\.{2,}|[^\w\s]",
+    re.IGNORECASE,
+)
+# Whitespace runs other than single spaces between tokens
+_ODD_SPACE_PATTERN = re.compile(r"(^\s+|(?<!\s)(?:\s{2,}|[^\S ]))")
+_WORD_PATTERN = re.compile(r"\w")
+
+# Word caches start over when they outgrow this; feedback vocabularies stay well below it
+MAX_CACHED_WORDS = 200_000
+
+# (lowercase form, lemma, is word) of the token texts seen since the cache was last cleared
+_token_forms = {}
+
+
+def tokenize(text):
+    """Tokens of a text, punctuation split off.
+
+    As in spaCy, one space after a token belongs to it and any other
+    whitespace is a token of its own.
+    """
+    pieces = _ODD_SPACE_PATTERN.split(text)
+    tokens = TOKEN_PATTERN.findall(pieces[0])
+    for i in range(1, len(pieces), 2):
+        space = pieces[i]
+        if i > 1 or pieces[0]:
+            # The first space belongs to the token before
+            space = space[1:] if space.startswith(" ") else space
+        if space:
+            tokens.append(space)
+        tokens.extend(TOKEN_PATTERN.findall(pieces[i + 1]))
+    return tokens
+
+
+def _doc_tokens(words):
+    global _token_forms
+    if len(_token_forms) > MAX_CACHED_WORDS:
+        _token_forms = {}
+    cache = _token_forms
+    forms = []
+    for word in words:
+        form = cache.get(word)
+        if form is None:
+            lower = word.lower()
+            form = cache[word] = (lower, lower, _WORD_PATTERN.search(word) is not None)
+        forms.append(form)
+    return forms
+
+
+def export_static_vectors(nlp, directory):
+    """Write a spaCy model's static vector table to directory for StaticVectors.
+
+    vectors.npy holds the table (rows x dimensions) and words.sqlite3 maps
+    every word with a vector to its row. The files are written to a staging
+    directory and moved into place, so a concurrent export or an interrupted
+    one never leaves a partial table. Returns the number of words.
+    """
+    vectors = nlp.vocab.vectors
+    if getattr(vectors, "mode", "default") != "default":
+        raise ValueError(f"{vectors.mode} vectors have no static table to export")
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(dir=parent)
+    try:
+        np.save(os.path.join(staging, "vectors.npy"), np.asarray(vectors.data, dtype=np.float32))
+        strings = nlp.vocab.strings
+        words = [(strings[key], int(row)) for key, row in vectors.key2row.items() if key in strings]
+        conn = sqlite3.connect(os.path.join(staging, "words.sqlite3"))
+        with conn:
+            conn.execute("CREATE TABLE words (word TEXT PRIMARY KEY, row INTEGER NOT NULL) WITHOUT ROWID")
+            conn.executemany("INSERT OR IGNORE INTO words VALUES (?, ?)", words)
+        conn.close()
+        try:
+            os.replace(staging, directory)
+        except OSError:
+            if not StaticVectors.exists(directory):
+                raise
+            # Another process exported the same table first
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return len(words)
+
+
+class StaticVectors:
+    """A spaCy model's word vectors, memory-mapped, with a tokenizer of its own.
+
+    Only the vector table is read, so neither spaCy nor the model's
+    pipeline is loaded, and worker processes share the table's pages.
+    Words are looked up by their exact text, as spaCy does, and a document
+    vector is the mean of its token vectors with tokens lacking a vector
+    counting as zeros, like Doc.vector. Tokens have no lemmas: keywords
+    match a token's lowercase form only.
+    """
+
+    # Part of the analysis version: bump when tokenization or averaging changes
+    VERSION = 1
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode="r")
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        # Vector row of the words looked up since the cache was last cleared (-1 without a vector)
+        self._rows = {}
+
+    @staticmethod
+    def exists(directory):
+        return os.path.exists(os.path.join(directory, "vectors.npy")) and os.path.exists(
+            os.path.join(directory, "words.sqlite3")
+        )
+
+    @property
+    def dim(self):
+        return self.vectors.shape[1]
+
+    def _connection(self):
+        if self._conn is None or self._pid != os.getpid():
+            path = os.path.join(self.directory, "words.sqlite3")
+            self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+            self._pid = os.getpid()
+        return self._conn
+
+    def rows(self, words):
+        """Vector row of every word, -1 for words without a vector."""
+        cache = self._rows
+        missing = [word for word in dict.fromkeys(words) if word not in cache]
+        looked_up = {}
+        if missing:
+            with self._lock:
+                conn = self._connection()
+                found = {}
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start:start + 500]
+                    found.update(conn.execute(
+                        f"SELECT word, row FROM words WHERE word IN ({','.join('?' * len(chunk))})", chunk
+                    ))
+                looked_up = {word: found.get(word, -1) for word in missing}
+                if len(self._rows) + len(looked_up) > MAX_CACHED_WORDS:
+                    self._rows = {}
+                self._rows.update(looked_up)
+        return np.array([looked_up[word] if word in looked_up else cache[word] for word in words], dtype=np.int64)
+
+    @staticmethod
+    def doc_tokens(text):
+        """(lowercase form, lemma, is word) of every token, as KeywordMatcher.token_counts takes them.
+
+        The lemma is the lowercase form.
+        """
+        return _doc_tokens(tokenize(text))
+
+    def embed(self, texts):
+        """(document vectors, doc_tokens of every text) of texts."""
+        tokens = [tokenize(text) for text in texts]
+        lengths = np.array([len(words) for words in tokens], dtype=np.int64)
+        rows = self.rows([word for words in tokens for word in words])
+        token_vectors = np.zeros((len(rows), self.dim), dtype=np.float32)
+        known = rows >= 0
+        token_vectors[known] = self.vectors[rows[known]]
+        # Sum each text's run of token vectors; texts without tokens stay zero
+        sums = np.zeros((len(texts), self.dim), dtype=np.float32)
+        nonempty = lengths > 0
+        if nonempty.any():
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+            sums[nonempty] = np.add.reduceat(token_vectors, starts[nonempty], axis=0)
+        vectors = sums / np.maximum(lengths, 1)[:, None].astype(np.float32)
+        return vectors, [_doc_tokens(words) for words in tokens]
@@ -0,0 +1,12 @@
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Must be set before Code creates its caches and translation backend
+os.environ["FEEDBACK_CACHE_DIR"] = tempfile.mkdtemp(prefix="feedback-tests-")
+os.environ["FEEDBACK_TRANSLATION_BACKEND"] = "offline"
+os.environ.pop("FEEDBACK_FRENCH_MODE", None)
+os.environ.pop("FEEDBACK_MODEL_MODE", None)
@@ -0,0 +1,33 @@
+import numpy as np
+
+from accumulators import GroupSums
+
+
+def test_sums_and_counts_match_a_row_loop():
+    rng = np.random.default_rng(0)
+    keys = rng.choice(["a", "b", "c", None], size=200).tolist()
+    values = rng.random((200, 3))
+    groups = GroupSums(3, capacity=1)
+    groups.add(keys[:120], values[:120])
+    groups.add(keys[120:], values[120:])
+
+    for key in ("a", "b", "c"):
+        rows = [i for i, k in enumerate(keys) if k == key]
+        expected = np.zeros(3)
+        for i in rows:
+            expected += values[i]
+        sums, count = groups.get(key)
+        assert count == len(rows)
+        assert np.array_equal(sums, expected)
+    assert groups.get(None) is None
+    assert [key for key, _, _ in groups.items()] == list(dict.fromkeys(k for k in keys if k is not None))
+
+
+def test_tuple_keys_and_kept_rows():
+    groups = GroupSums(1, keep_rows=True)
+    groups.add((["x", "x", "y"], [1, 2, 1]), [[1.0], [2.0], [3.0]])
+    groups.add((["x"], [1]), [[4.0]], row_ids=[10])
+    assert groups.get(("x", 1))[1] == 2
+    assert groups.get(("x", 1))[0][0] == 5.0
+    assert groups.rows(("x", 1)).tolist() == [0, 10]
+    assert groups.rows(("y", 1)).tolist() == [2]
@@ -0,0 +1,136 @@
+import os
+
+import pytest
+
+import Code
+from ingest import read_feedback_file
+
+pytest.importorskip("spacy")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def feedback_csv(tmp_path_factory):
+    """The first rows of a real export, with enough distinct comments for several shards."""
+    try:
+        Code.get_nlp()
+    except OSError:
+        pytest.skip("en_core_web_md is not installed")
+    path = tmp_path_factory.mktemp("data") / "feedback.csv"
+    read_feedback_file(os.path.join(ROOT, "Data_Ey1.xlsx")).head(3000).to_csv(path, index=False)
+    return str(path)
+
+
+def analyze(path, **kwargs):
+    Code.result_store.clear()
+    return Code.analyze_files([path], **kwargs)
+
+
+def test_sharded_scoring_equals_serial(feedback_csv, monkeypatch):
+    monkeypatch.setattr(Code, "PARALLEL_MIN_ROWS", 100)
+    serial = analyze(feedback_csv, workers=1)
+    sharded = analyze(feedback_csv, workers=3)
+    assert serial.equals(sharded)
+
+
+def test_a_text_scores_the_same_in_any_batch(feedback_csv):
+    df, comment_col, response_col = Code.load_feedback_data([feedback_csv])
+    texts = [text for text in Code.row_texts(df[comment_col].tolist(), df[response_col].tolist()) if text.strip()]
+    texts = list(dict.fromkeys(texts))[:300]
+
+    Code.result_store.clear()
+    batched = Code.classify_texts(texts)
+    Code.result_store.clear()
+    single = [Code.classify_texts([text])[0] for text in texts]
+    Code.result_store.clear()
+    # Memoized halves, then the whole list: half of it comes from the store
+    Code.classify_texts(texts[::2])
+    mixed = Code.classify_texts(texts)
+    assert batched == single == mixed
+
+
+def test_progress_chunks_do_not_change_results(feedback_csv):
+    df, comment_col, response_col = Code.load_feedback_data([feedback_csv])
+    comments, responses = df[comment_col].tolist(), df[response_col].tolist()
+    Code.result_store.clear()
+    _, whole = Code.analyze_rows(comments, responses)
+    Code.result_store.clear()
+    _, chunked = Code.analyze_rows(comments, responses, progress=lambda done, total, stage=None: None)
+    assert whole == chunked
+
+
+@pytest.fixture(scope="module")
+def mixed_id_csv(feedback_csv, tmp_path_factory):
+    """A few rows whose IDs are numbers in one chunk and text in the next."""
+    import pandas as pd
+    df = pd.read_csv(feedback_csv).head(8)
+    df['Feedback Requester User ID'] = [1, 2, 'abc', 1, 2, 'abc', 3, 1]
+    path = tmp_path_factory.mktemp("mixed") / "mixed.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("data, chunk_rows", [("feedback_csv", 700), ("mixed_id_csv", 2)])
+def test_streaming_equals_in_memory(data, chunk_rows, request):
+    path = request.getfixturevalue(data)
+    in_memory = analyze(path)
+    Code.result_store.clear()
+    streamed = Code.analyze_all_ids_streaming([path], chunk_rows=chunk_rows)
+    assert in_memory.equals(streamed)
+
+
+def test_rescoring_the_current_taxonomy_equals_analysis(feedback_csv):
+    analyzed = analyze(feedback_csv)
+    rescored = Code.rescore_files([feedback_csv])
+    # rescore_files has every column but Average Feedback Score
+    assert analyzed.drop(columns='Average Feedback Score').equals(rescored)
+
+
+class RecordingFrenchScorer:
+    """Stands in for the French model: scores every text 1.0 and records what it was given."""
+
+    def __init__(self):
+        self.texts = []
+
+    def score_texts(self, texts):
+        self.texts.extend(texts)
+        return [(1.0, dict.fromkeys(Code.categories, 1.0)) for _ in texts]
+
+
+def test_native_mode_scores_each_field_in_its_language(feedback_csv, monkeypatch):
+    scorer = RecordingFrenchScorer()
+    monkeypatch.setattr(Code, "FRENCH_MODE", "native")
+    monkeypatch.setattr(Code, "get_french_scorer", lambda: scorer)
+    comment = "Il a très bien géré l'équipe pendant le projet"
+    response = "The team delivered the project on time and he was a great mentor"
+    texts = Code.row_texts([comment, comment], [response, "Très bien, merci pour tout"], native=True)
+    Code.result_store.clear()
+    mixed, french = Code.score_texts(texts)
+
+    # The French comment alone went to the French scorer, and the second row whole
+    assert scorer.texts == [comment, comment + " Très bien, merci pour tout"]
+    assert french == (1.0, dict.fromkeys(Code.categories, 1.0))
+    english_sentiment, english_scores = Code.score_english_texts([response])[0]
+    comment_words, response_words = len(comment.split()), len(response.split())
+    total = comment_words + response_words
+    assert mixed[0] == pytest.approx((comment_words + response_words * english_sentiment) / total)
+    for category in Code.categories:
+        assert mixed[1][category] == pytest.approx((comment_words + response_words * english_scores[category]) / total)
+
+
+def test_native_mode_detects_each_field_once(monkeypatch):
+    monkeypatch.setattr(Code, "FRENCH_MODE", "native")
+    monkeypatch.setattr(Code, "get_french_scorer", RecordingFrenchScorer)
+    comment = "Elle a très bien préparé les présentations pour le client"
+    texts = Code.row_texts([comment], [None], native=True)
+    detected = []
+    detect_many = Code.language_detector.detect_many
+    monkeypatch.setattr(Code.language_detector, "detect_many", lambda texts: detected.extend(texts) or detect_many(texts))
+
+    Code.score_texts(texts)
+    Code.score_texts(texts)
+    assert detected == [comment]
+    # Translate mode still translates a text first detected for native scoring
+    assert Code.translation_cache.get(comment) == ('fr', None)
+    Code.translate_text(comment)
+    assert Code.translation_cache.get(comment) == ('fr', comment)
@@ -0,0 +1,115 @@
+import os
+
+import pandas as pd
+import pytest
+
+import ingest
+from ingest import RequesterIndex, build_id_index, read_feedback_file, read_id_index
+
+
+@pytest.fixture
+def feedback_csv(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "feedback.csv"
+    path.write_text(
+        "Comments,Feedback Responses,Feedback Dimensions & Questions,Rank feedback provider,Feedback Requester User ID\n"
+        "Great work,Agree,Q1,Peer,3515976\n"
+        "Solid,Agree,Q2,Manager,42\n"
+        "Très bien,Neutral,Q1,Peer,3515976\n",
+        encoding="utf-8",
+    )
+    return str(path)
+
+
+def cache_files(cache_dir):
+    return sorted(os.listdir(os.path.join(cache_dir, "ingest")))
+
+
+def test_a_miss_keeps_current_entries_and_temporary_files(feedback_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    directory, path_hash, cache_path = ingest._cache_paths(feedback_csv, cache_dir)
+    os.makedirs(directory)
+    stale = os.path.join(directory, f"{path_hash}-0000000000000000.parquet")
+    in_flight = f"{cache_path}.99999.tmp"
+    current_index = cache_path[:-len(".parquet")] + ".ids.npz"
+    for name in (stale, in_flight, current_index):
+        open(name, "wb").close()
+
+    read_feedback_file(feedback_csv, cache_dir)
+    assert not os.path.exists(stale)
+    assert os.path.exists(in_flight)
+    assert os.path.exists(current_index)
+    assert os.path.exists(cache_path)
+
+
+def test_an_index_miss_keeps_the_parquet_entry(feedback_csv, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    read_feedback_file(feedback_csv, cache_dir)
+    _, path_hash, cache_path = ingest._cache_paths(feedback_csv, cache_dir)
+    stale_index = os.path.join(os.path.dirname(cache_path), f"{path_hash}-0000000000000000.ids.npz")
+    open(stale_index, "wb").close()
+
+    read_id_index(feedback_csv, cache_dir)
+    assert cache_files(cache_dir) == sorted(
+        os.path.basename(name) for name in (cache_path, cache_path[:-len(".parquet")] + ".ids.npz")
+    )
+
+
+def count_parses(monkeypatch):
+    parses = []
+    read_columns = ingest.read_columns
+    monkeypatch.setattr(ingest, "read_columns", lambda path: parses.append(path) or read_columns(path))
+    return parses
+
+
+def test_a_schema_version_bump_parses_the_file_again(feedback_csv, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    parses = count_parses(monkeypatch)
+    read_feedback_file(feedback_csv, cache_dir)
+    read_feedback_file(feedback_csv, cache_dir)
+    assert len(parses) == 1
+
+    monkeypatch.setattr(ingest, "SCHEMA_VERSION", ingest.SCHEMA_VERSION + 1)
+    read_feedback_file(feedback_csv, cache_dir)
+    assert len(parses) == 2
+    assert cache_files(cache_dir) == [os.path.basename(ingest._cache_paths(feedback_csv, cache_dir)[2])]
+
+
+def test_an_edited_file_is_parsed_again(feedback_csv, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    parses = count_parses(monkeypatch)
+    assert len(read_feedback_file(feedback_csv, cache_dir)) == 3
+
+    with open(feedback_csv, "a", encoding="utf-8") as f:
+        f.write("Needs focus,Disagree,Q3,Peer,7\n")
+    stat = os.stat(feedback_csv)
+    os.utime(feedback_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    df = read_feedback_file(feedback_csv, cache_dir)
+    assert len(parses) == 2
+    assert len(df) == 4
+    assert len(cache_files(cache_dir)) == 1
+
+
+def id_index(ids):
+    return build_id_index(pd.DataFrame({"Feedback Requester User ID": ids}))
+
+
+def test_requester_index_across_files():
+    index = RequesterIndex([
+        ("march.xlsx", id_index([3515976, 42, 3515976])),
+        ("june.xlsx", id_index([7.0, 3515976.0, float("nan"), 351.0])),
+    ])
+    for feedback_id in (3515976, 3515976.0, "3515976", " 3515976 "):
+        assert feedback_id in index
+        assert index.rows(feedback_id).tolist() == [0, 2, 4]
+        assert index.periods(feedback_id) == [("march.xlsx", 2), ("june.xlsx", 1)]
+    assert index.rows(7).tolist() == [3]
+    assert index.periods(42) == [("march.xlsx", 1)]
+    assert 351597 not in index
+    assert index.rows("351597").tolist() == []
+    assert index.periods("351597") == []
+    assert len(index) == 4
+
+    assert index.complete("351") == ["351", "3515976"]
+    assert index.complete(3515976) == ["3515976"]
+    assert index.complete("", limit=2) == ["351", "3515976"]
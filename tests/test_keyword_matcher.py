@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from keyword_matcher import KeywordMatcher
+from static_vectors import StaticVectors
+
+spacy = pytest.importorskip("spacy")
+
+KEYWORDS = {
+    "Business Skills": ["sales", "go-to-market", "client"],
+    "Leadership": ["team", "lead", "team lead"],
+}
+TEXTS = [
+    "Great team lead, strong on go-to-market and client work.",
+    "Sales, sales and more sales!",
+    "Leads the team well; clients love her.",
+    "",
+    "  Nothing relevant here...",
+]
+
+
+@pytest.fixture(scope="module")
+def nlp():
+    try:
+        return spacy.load("en_core_web_md", exclude=["parser", "ner"])
+    except OSError:
+        pytest.skip("en_core_web_md is not installed")
+
+
+def test_token_counts_match_counts(nlp):
+    matcher = KeywordMatcher(nlp, KEYWORDS)
+    for doc in nlp.pipe(TEXTS):
+        counts, words = matcher.counts(doc)
+        token_counts, token_words = matcher.token_counts(KeywordMatcher.doc_tokens(doc))
+        assert np.array_equal(counts, token_counts)
+        assert words == token_words
+
+
+def test_phrases_count_once():
+    matcher = KeywordMatcher.for_tokens(KEYWORDS, StaticVectors.doc_tokens)
+    counts, words = matcher.token_counts(StaticVectors.doc_tokens("A team lead with go-to-market sense"))
+    # "team lead" and "go-to-market" match as phrases; their words are not counted again
+    assert counts.tolist() == [1, 1]
+    assert words == 8
@@ -0,0 +1,38 @@
+import pytest
+
+from language import ENGLISH_STOPWORDS, FRENCH_STOPWORDS, LanguageDetector
+
+
+@pytest.fixture
+def detector():
+    return LanguageDetector()
+
+
+@pytest.mark.parametrize("text", [
+    "Très bien fait",
+    "Il a très bien géré l'équipe",
+    "Excellent travail sur le dossier, bravo à toute l'équipe",
+])
+def test_french(detector, text):
+    assert detector.rule_language(text) == 'fr'
+
+
+@pytest.mark.parametrize("text", [
+    "Great job José",
+    "Thanks to Zoé and André",
+])
+def test_accented_names_are_not_french(detector, text):
+    assert detector.rule_language(text) != 'fr'
+
+
+@pytest.mark.parametrize("text", [
+    "La comunicación con el equipo fue excelente",
+    "Ótimo trabalho em equipe, parabéns",
+    "Buen trabajo, José",
+])
+def test_spanish_and_portuguese_are_left_to_langdetect(detector, text):
+    assert detector.rule_language(text) is None
+
+
+def test_stopword_lists_do_not_overlap():
+    assert not FRENCH_STOPWORDS & ENGLISH_STOPWORDS
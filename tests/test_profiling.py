@@ -0,0 +1,29 @@
+import time
+
+import pytest
+
+from profiling import Profiler
+
+
+def test_nested_stages_are_not_counted_twice():
+    profiler = Profiler(enabled=True)
+    start = time.perf_counter()
+    with profiler.stage("outer"):
+        time.sleep(0.02)
+        for _ in range(2):
+            with profiler.stage("inner"):
+                time.sleep(0.02)
+    total = time.perf_counter() - start
+
+    stages = profiler.snapshot()["stages"]
+    assert stages["inner"]["calls"] == 2
+    assert stages["inner"]["seconds"] == pytest.approx(0.04, abs=0.015)
+    assert stages["outer"]["seconds"] == pytest.approx(0.02, abs=0.015)
+    assert stages["outer"]["seconds"] + stages["inner"]["seconds"] <= total
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    with profiler.stage("outer"):
+        profiler.count("events")
+    assert profiler.snapshot()["stages"] == {} and profiler.snapshot()["counters"] == {}
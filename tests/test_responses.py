@@ -0,0 +1,50 @@
+import re
+
+import numpy as np
+
+import Code
+
+
+def score_with_a_row_loop(responses):
+    """Score every response by trying each key longest first."""
+    keys = sorted(Code.feedback_response_scores, key=len, reverse=True)
+    counts = dict.fromkeys(Code.feedback_response_scores, 0)
+    scores = []
+    for response in responses:
+        if not isinstance(response, str):
+            continue
+        for key in keys:
+            if re.search(re.escape(key), response, re.IGNORECASE):
+                counts[key] += 1
+                scores.append(Code.feedback_response_scores[key])
+                break
+    return counts, float(np.mean(scores)) if scores else 0
+
+
+def test_counts_and_scores_match_a_row_loop():
+    rng = np.random.default_rng(0)
+    values = list(Code.feedback_response_scores) + [
+        "partially MET expectations", "Rating: Exceeded expectations!", "No rating", "", None, float("nan"),
+    ]
+    responses = [values[i] for i in rng.integers(len(values), size=500)]
+    counts, avg_score = Code.count_and_score_feedback_responses(responses)
+    expected_counts, expected_score = score_with_a_row_loop(responses)
+    assert counts == expected_counts
+    assert avg_score == expected_score
+
+
+def test_longer_keys_win():
+    assert Code.count_and_score_feedback_responses(["Partially met expectations"]) == (
+        dict(dict.fromkeys(Code.feedback_response_scores, 0), **{"Partially met expectations": 1}), 2.0
+    )
+    scores = Code.response_score_column(
+        ["Significantly exceeded expectations", "Partially met expectations", "No rating", None]
+    )
+    assert scores[:2].tolist() == [5.0, 2.0]
+    assert np.isnan(scores[2:]).all()
+
+
+def test_no_responses_score_zero():
+    counts, avg_score = Code.count_and_score_feedback_responses([None, "No rating"])
+    assert set(counts.values()) == {0}
+    assert avg_score == 0
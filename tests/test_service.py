@@ -0,0 +1,84 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from service import AnalysisService, service_token
+
+
+@pytest.fixture
+def service(tmp_path):
+    (tmp_path / "feedback.csv").write_text("a,b\n", encoding="utf-8")
+    return AnalysisService(data_root=tmp_path, token="secret")
+
+
+def request(service, path, payload, token="secret"):
+    headers = {"authorization": f"Bearer {token}"} if token else {}
+    return asyncio.run(service.handle_request("POST", path, headers, json.dumps(payload).encode()))
+
+
+@pytest.mark.parametrize("token", [None, "wrong"])
+def test_requests_need_the_token(service, token):
+    status, _ = request(service, "/analyze-batch", {"files": ["feedback.csv"]}, token)
+    assert status == 401
+
+
+@pytest.mark.parametrize("path", ["../outside.csv", "/etc/passwd", "notes.txt"])
+def test_files_outside_the_data_root_are_refused(service, path):
+    status, _ = request(service, "/analyze-batch", {"files": [path]})
+    assert status == 403
+
+
+def test_files_inside_the_data_root_resolve(service, tmp_path):
+    assert service.resolve_files(["feedback.csv", str(tmp_path / "feedback.csv")]) == [
+        str((tmp_path / "feedback.csv").resolve())
+    ] * 2
+
+
+def test_generated_token_is_reused(monkeypatch):
+    monkeypatch.delenv("FEEDBACK_SERVICE_TOKEN", raising=False)
+    token = service_token(create=True)
+    assert token and service_token() == token
+
+
+def run_job(service, route, cancel_after=None):
+    """Start a job on route, optionally cancel it after cancel_after polls; its final state."""
+    async def scenario():
+        headers = {"authorization": "Bearer secret"}
+        body = json.dumps({"files": ["feedback.csv"]}).encode()
+        status, started = await service.handle_request("POST", f"/jobs{route}", headers, body)
+        assert status == 200
+        polls = 0
+        while True:
+            status, state = await service.handle_request("GET", f"/jobs/{started['id']}", headers, b"")
+            assert status == 200
+            if state["status"] != "running":
+                return state, started["id"], headers
+            polls += 1
+            if polls == cancel_after:
+                await service.handle_request("DELETE", f"/jobs/{started['id']}", headers, b"")
+            await asyncio.sleep(0.01)
+
+    return asyncio.run(scenario())
+
+
+def slow_batch(request, progress=None):
+    for done in range(1, 1000):
+        progress(done, 1000)
+        time.sleep(0.005)
+    return {"ids": 0, "results": []}
+
+
+def test_jobs_report_their_result(service, monkeypatch):
+    monkeypatch.setattr(service, "analyze_batch", lambda request, progress=None: progress(1, 1) or {"ids": 0})
+    state, _, _ = run_job(service, "/analyze-batch")
+    assert state["status"] == "done" and state["result"] == {"ids": 0}
+
+
+def test_cancelled_jobs_stop(service, monkeypatch):
+    monkeypatch.setattr(service, "analyze_batch", slow_batch)
+    state, job_id, headers = run_job(service, "/analyze-batch", cancel_after=3)
+    assert state["status"] == "cancelled" and state["done"] < 999
+    # A finished job is forgotten once its outcome was fetched
+    assert asyncio.run(service.handle_request("GET", f"/jobs/{job_id}", headers, b""))[0] == 404
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+import static_vectors
+from static_vectors import StaticVectors
+
+
+@pytest.fixture
+def vectors(tmp_path):
+    spacy = pytest.importorskip("spacy")
+    try:
+        nlp = spacy.load("en_core_web_md")
+    except OSError:
+        pytest.skip("en_core_web_md is not installed")
+    static_vectors.export_static_vectors(nlp, str(tmp_path / "vectors"))
+    return StaticVectors(str(tmp_path / "vectors"))
+
+
+def test_word_caches_stay_bounded(vectors, monkeypatch):
+    monkeypatch.setattr(static_vectors, "MAX_CACHED_WORDS", 10)
+    words = [f"word{i}" for i in range(25)] + ["team", "the"]
+    expected = StaticVectors(vectors.directory).rows(words)
+    for start in range(0, len(words), 4):
+        batch = words[start:start + 4]
+        assert np.array_equal(vectors.rows(batch), expected[start:start + 4])
+        StaticVectors.doc_tokens(" ".join(batch))
+        assert len(vectors._rows) <= 10 + 4
+        assert len(static_vectors._token_forms) <= 10 + 4
+    assert vectors.rows(["team"])[0] >= 0
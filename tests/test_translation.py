@@ -0,0 +1,71 @@
+import threading
+
+import pytest
+
+from translation import OfflineBackend, TranslationBackend, TranslationCache, translate_many
+
+
+class FlakyBackend(TranslationBackend):
+    """Fails the first `failures` calls for each text, then translates it."""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def translate(self, text, src="fr", dest="en"):
+        with self._lock:
+            self.calls[text] = self.calls.get(text, 0) + 1
+            attempt = self.calls[text]
+        if attempt <= self.failures:
+            raise ConnectionError(f"attempt {attempt} failed")
+        return f"en:{text}"
+
+
+def test_translations_are_matched_to_their_texts():
+    glossary = {f"bonjour {i}": f"hello {i}" for i in range(50)}
+    results = translate_many(list(glossary) * 2, OfflineBackend(glossary, delay=0.001), max_workers=8)
+    assert results == glossary
+
+
+def test_failed_requests_are_retried():
+    backend = FlakyBackend(failures=2)
+    results = translate_many(["un", "deux"], backend, retries=2, backoff=0)
+    assert results == {"un": "en:un", "deux": "en:deux"}
+    assert backend.calls == {"un": 3, "deux": 3}
+
+
+def test_texts_failing_every_retry_are_left_out():
+    backend = FlakyBackend(failures=5)
+    assert translate_many(["un"], backend, retries=2, backoff=0) == {}
+    assert backend.calls == {"un": 3}
+
+
+def test_progress_counts_every_text():
+    reports = []
+    translate_many(["un", "deux", "trois"], OfflineBackend(), max_workers=2, progress=lambda *report: reports.append(report))
+    assert reports == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_raising_progress_stops_translation():
+    class Stop(Exception):
+        pass
+
+    def progress(done, total):
+        raise Stop()
+
+    backend = FlakyBackend(failures=0)
+    texts = [f"texte {i}" for i in range(100)]
+    with pytest.raises(Stop):
+        translate_many(texts, backend, max_workers=2, progress=progress)
+    assert len(backend.calls) < len(texts)
+
+
+def test_no_texts():
+    assert translate_many([], OfflineBackend()) == {}
+
+
+def test_cache_entries_of_other_detector_versions_are_ignored(tmp_path):
+    TranslationCache(str(tmp_path), version=1).put("Great job José", "fr", "Great job José")
+    assert TranslationCache(str(tmp_path), version=1).get("Great job José") == ("fr", "Great job José")
+    assert TranslationCache(str(tmp_path), version=2).get("Great job José") is None
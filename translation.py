@@ -0,0 +1,261 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Default location of the on-disk caches, overridable with FEEDBACK_CACHE_DIR
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "feedback-analysis")
+
+
+def cache_dir_from_env():
+    return os.environ.get("FEEDBACK_CACHE_DIR", DEFAULT_CACHE_DIR)
+
+
+def normalize_cache_text(text):
+    """Collapse whitespace so trivially different copies share one entry."""
+    return " ".join(text.split())
+
+
+def text_key(text):
+    return hashlib.sha1(normalize_cache_text(text).encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """SQLite-backed cache of detected languages and English translations.
+
+    Entries are keyed by a hash of the normalized text and version, the
+    version of the language detection rules, so a rule change leaves older
+    languages and translations unused until they are evicted. Entries older
+    than max_age_days are dropped, and when more than max_entries are stored
+    the oldest ones are evicted first.
+    """
+
+    EVICT_EVERY = 1000
+
+    def __init__(self, cache_dir=None, max_entries=200_000, max_age_days=180, version=None):
+        self.cache_dir = cache_dir or cache_dir_from_env()
+        self.version = version
+        self.path = os.path.join(self.cache_dir, "translations.sqlite3")
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._puts_since_evict = 0
+
+    def _connection(self):
+        # Connections must not be shared with forked worker processes
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, lang TEXT NOT NULL, translation TEXT, created REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS translations_created ON translations(created)")
+            self._evict()
+        return self._conn
+
+    def _key(self, text):
+        return text_key(text if self.version is None else f"{self.version} {text}")
+
+    def _min_created(self):
+        return time.time() - self.max_age_days * 86400
+
+    def get(self, text):
+        """Return (lang, translation) for a cached text, or None."""
+        return self.get_many([text]).get(text)
+
+    def get_many(self, texts):
+        """Return {text: (lang, translation)} for every cached text."""
+        keys = {}
+        for text in texts:
+            keys.setdefault(self._key(text), []).append(text)
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            key_list = list(keys)
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, lang, translation FROM translations "
+                    f"WHERE key IN ({placeholders}) AND created >= ?",
+                    (*chunk, self._min_created()),
+                )
+                for key, lang, translation in rows:
+                    for text in keys[key]:
+                        found[text] = (lang, translation)
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+        return found
+
+    def put(self, text, lang, translation=None):
+        self.put_many([(text, lang, translation)])
+
+    def put_many(self, items):
+        """Store (text, lang, translation) tuples; translation is None if not translated."""
+        now = time.time()
+        rows = [(self._key(text), lang, translation, now) for text, lang, translation in items]
+        if not rows:
+            return
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)", rows)
+            conn.commit()
+            self._puts_since_evict += len(rows)
+            if self._puts_since_evict >= self.EVICT_EVERY:
+                self._evict()
+
+    def _evict(self):
+        self._puts_since_evict = 0
+        conn = self._conn
+        conn.execute("DELETE FROM translations WHERE created < ?", (self._min_created(),))
+        (count,) = conn.execute("SELECT COUNT(*) FROM translations").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                "DELETE FROM translations WHERE key IN "
+                "(SELECT key FROM translations ORDER BY created LIMIT ?)",
+                (count - self.max_entries,),
+            )
+        conn.commit()
+
+    def stats(self):
+        with self._lock:
+            (entries,) = self._connection().execute("SELECT COUNT(*) FROM translations").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM translations")
+            conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+
+class TranslationBackend:
+    """Interface for services translating text to English."""
+
+    def translate(self, text, src="fr", dest="en"):
+        raise NotImplementedError
+
+
+class GoogleTranslateBackend(TranslationBackend):
+    """Online googletrans client, one Translator per worker thread."""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def translate(self, text, src="fr", dest="en"):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            from googletrans import Translator
+            translator = self._local.translator = Translator()
+        return translator.translate(text, src=src, dest=dest).text
+
+
+class OfflineBackend(TranslationBackend):
+    """Local stand-in that needs no network, for tests and offline runs.
+
+    Texts found in the glossary get its translation; anything else is
+    returned unchanged. An optional delay simulates service latency.
+    """
+
+    def __init__(self, glossary=None, delay=0.0):
+        self.glossary = glossary or {}
+        self.delay = delay
+
+    def translate(self, text, src="fr", dest="en"):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.glossary.get(text, text)
+
+
+BACKENDS = {
+    "google": GoogleTranslateBackend,
+    "offline": OfflineBackend,
+}
+
+
+def make_backend(name):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown translation backend: {name}") from None
+
+
+class RateLimiter:
+    """Spaces calls from all threads at least 1/rate seconds apart."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def translate_many(texts, backend, max_workers=8, retries=3, backoff=0.5, rate_limit=None, progress=None):
+    """Translate unique texts concurrently through the backend.
+
+    At most max_workers requests are in flight at once. Failed requests are
+    retried with exponential backoff; texts that still fail are left out of
+    the returned {text: translation} dict. progress(done, total) is called
+    as each text finishes; if it raises, queued requests are dropped and the
+    exception propagates once the requests in flight return.
+    """
+    unique = list(dict.fromkeys(texts))
+    if not unique:
+        return {}
+    limiter = RateLimiter(rate_limit)
+
+    def translate_one(text):
+        for attempt in range(retries + 1):
+            limiter.wait()
+            try:
+                return backend.translate(text)
+            except Exception:
+                if attempt == retries:
+                    raise
+                time.sleep(backoff * 2 ** attempt)
+
+    results = {}
+    futures = {}
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(unique)))
+    try:
+        futures = {pool.submit(translate_one, text): text for text in unique}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                print(f"Translation error: {e}")
+            if progress:
+                progress(done, len(unique))
+    finally:
+        for future in futures:
+            future.cancel()
+        pool.shutdown()
+    return results